@@ -2,22 +2,34 @@
 Session-scoped path manager for IDSE artifacts.
 
 - Creates sessions and records metadata in .idse_active_session.json
+- Records session history in an append-only log (see session_history.py)
 - Builds per-session paths: projects/<project>/sessions/<session-id>/<stage>/<filename>
 - Drops a .owner marker in the session metadata directory
+- Supports request-scoped sessions (SessionManager.scoped_session) that
+  override the active session in memory for the current context only
+- Caches the parsed active session (re-read only when the file's inode,
+  mtime or size changes) and remembers which session directories have been
+  scaffolded, so repeated build_path calls do no redundant filesystem work
 """
 
 from __future__ import annotations
 
 import json
+import os
 import time
 import getpass
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Set, Tuple
+
+from session_history import SessionHistory
 
 ROOT = Path(__file__).resolve().parent
 ACTIVE_FILE = ROOT / ".idse_active_session.json"
-HISTORY_FILE = ROOT / ".idse_sessions_history.json"
+HISTORY_FILE = ROOT / ".idse_sessions_history.jsonl"
+LEGACY_HISTORY_FILE = ROOT / ".idse_sessions_history.json"
 
 
 @dataclass
@@ -29,7 +41,72 @@ class SessionMeta:
     project: str
 
 
+# Per-request session overlay; asyncio tasks and to_thread calls inherit it
+_scoped_session: ContextVar[Optional[SessionMeta]] = ContextVar("idse_scoped_session", default=None)
+
+# (active file path, (inode, mtime_ns, size)) -> parsed meta
+_active_cache: Optional[Tuple[Path, Tuple[int, int, int], SessionMeta]] = None
+# Directories already created/populated by build_path in this process
+_scaffolded: Set[Path] = set()
+_history_store: Optional[SessionHistory] = None
+
+
+def _file_key(path: Path) -> Tuple[int, int, int]:
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 class SessionManager:
+    @staticmethod
+    @contextmanager
+    def scoped_session(
+        project: str, session_id: str, name: Optional[str] = None, owner: Optional[str] = None
+    ) -> Iterator[SessionMeta]:
+        """
+        Make a session active for the current context only.
+
+        Code running inside the block resolves paths against this session in
+        memory; .idse_active_session.json is neither read nor written, so
+        concurrent requests for different projects do not interfere.
+        """
+        meta = SessionMeta(
+            session_id=session_id,
+            name=name or session_id,
+            created_at=time.time(),
+            owner=owner or getpass.getuser(),
+            project=project or "default",
+        )
+        token = _scoped_session.set(meta)
+        try:
+            yield meta
+        finally:
+            _scoped_session.reset(token)
+
+    @staticmethod
+    def _activate(meta: SessionMeta) -> None:
+        """Record meta as active: in the current scope if one is open, else on disk."""
+        global _active_cache
+        if _scoped_session.get() is not None:
+            _scoped_session.set(meta)
+            return
+        ACTIVE_FILE.write_text(json.dumps(asdict(meta), separators=(",", ":")), encoding="utf-8")
+        _active_cache = (ACTIVE_FILE, _file_key(ACTIVE_FILE), meta)
+
+    @staticmethod
+    def history() -> SessionHistory:
+        """Return the shared session history store."""
+        global _history_store
+        if _history_store is None or _history_store.path != HISTORY_FILE:
+            _history_store = SessionHistory(HISTORY_FILE, legacy_path=LEGACY_HISTORY_FILE)
+        return _history_store
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget the cached active session and scaffolded directories."""
+        global _active_cache
+        _active_cache = None
+        _scaffolded.clear()
+
     @staticmethod
     def create_session(name: Optional[str] = None, project: str = "default") -> str:
         """
@@ -46,27 +123,41 @@ class SessionManager:
             owner=owner,
             project=project or "default",
         )
-        ACTIVE_FILE.write_text(json.dumps(asdict(meta), indent=2), encoding="utf-8")
+        SessionManager._activate(meta)
         # Track latest session per project
-        history = {}
-        if HISTORY_FILE.exists():
-            try:
-                history = json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
-            except Exception:
-                history = {}
-        history[meta.project] = asdict(meta)
-        HISTORY_FILE.write_text(json.dumps(history, indent=2), encoding="utf-8")
+        SessionManager.history().record(
+            meta.project,
+            meta.session_id,
+            latest=True,
+            name=meta.name,
+            created_at=meta.created_at,
+            owner=meta.owner,
+        )
         return session_id
 
     @staticmethod
     def get_active_session() -> SessionMeta:
         """
         Return the active session metadata or raise if none is set.
+
+        A request-scoped session (see scoped_session) takes precedence.
+        The file is only re-parsed when its inode, mtime or size changes.
         """
-        if not ACTIVE_FILE.exists():
+        global _active_cache
+        scoped = _scoped_session.get()
+        if scoped is not None:
+            return scoped
+        try:
+            key = _file_key(ACTIVE_FILE)
+        except FileNotFoundError:
+            _active_cache = None
             raise RuntimeError("No active session. Call SessionManager.create_session(...) first.")
+        if _active_cache is not None and _active_cache[:2] == (ACTIVE_FILE, key):
+            return _active_cache[2]
         data = json.loads(ACTIVE_FILE.read_text(encoding="utf-8"))
-        return SessionMeta(**data)
+        meta = SessionMeta(**data)
+        _active_cache = (ACTIVE_FILE, key, meta)
+        return meta
 
     @staticmethod
     def resume_last_session(project: str = "default") -> Optional[SessionMeta]:
@@ -74,17 +165,21 @@ class SessionManager:
         Resume the last session for the given project, if present in history.
         Returns the session meta or None if not found.
         """
-        if not HISTORY_FILE.exists():
-            return None
         try:
-            history = json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
-            if project in history:
-                meta = SessionMeta(**history[project])
-                ACTIVE_FILE.write_text(json.dumps(history[project], indent=2), encoding="utf-8")
-                return meta
+            record = SessionManager.history().latest(project)
+            if record is None:
+                return None
+            meta = SessionMeta(
+                session_id=record["session_id"],
+                name=record.get("name", record["session_id"]),
+                created_at=record["created_at"],
+                owner=record["owner"],
+                project=project,
+            )
+            SessionManager._activate(meta)
+            return meta
         except Exception:
             return None
-        return None
 
     @staticmethod
     def switch_project(project: str) -> SessionMeta:
@@ -103,23 +198,29 @@ class SessionManager:
         Build a per-session, per-project path:
             projects/<project>/sessions/<session-id>/<stage>/<filename>
         Ensures the session directory exists and .owner files are present.
+        Directories are scaffolded once per process; call clear_cache() if
+        they may have been removed externally.
         """
         meta = SessionManager.get_active_session()
         session_dir = ROOT / "projects" / meta.project / "sessions" / meta.session_id
         stage_dir = session_dir / stage
-        stage_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create .owner at session root for Milkdown service compatibility
-        root_owner_file = session_dir / ".owner"
-        if not root_owner_file.exists():
-            root_owner_file.write_text(meta.owner, encoding="utf-8")
-
-        # Also create in metadata/ for legacy compatibility
-        metadata_dir = session_dir / "metadata"
-        metadata_dir.mkdir(parents=True, exist_ok=True)
-        owner_file = metadata_dir / ".owner"
-        if not owner_file.exists():
-            owner_file.write_text(meta.owner, encoding="utf-8")
+        if stage_dir not in _scaffolded:
+            stage_dir.mkdir(parents=True, exist_ok=True)
+            _scaffolded.add(stage_dir)
+
+        if session_dir not in _scaffolded:
+            # Create .owner at session root for Milkdown service compatibility
+            root_owner_file = session_dir / ".owner"
+            if not root_owner_file.exists():
+                root_owner_file.write_text(meta.owner, encoding="utf-8")
+
+            # Also create in metadata/ for legacy compatibility
+            metadata_dir = session_dir / "metadata"
+            metadata_dir.mkdir(parents=True, exist_ok=True)
+            owner_file = metadata_dir / ".owner"
+            if not owner_file.exists():
+                owner_file.write_text(meta.owner, encoding="utf-8")
+            _scaffolded.add(session_dir)
 
         return stage_dir / filename
 
@@ -6,18 +6,27 @@ Enables embeddable chat widgets to communicate with IDSE Developer Agent.
 """
 
 from fastapi import WebSocket, WebSocketDisconnect
-from agency_swarm import Agency
 from typing import Dict, Any, AsyncGenerator
 import json
 import logging
 import asyncio
-from typing import Optional
+from contextlib import aclosing
+from typing import Optional, Tuple
+
+from backend.services.agency_pool import (
+    AgencyPool,
+    LeaseTimeout,
+    get_response_text,
+    guard_stream,
+    new_thread_id,
+    stream_response_text,
+)
 
 logger = logging.getLogger(__name__)
 
 MAX_RESPONSE_CHARS = 1200  # hard cap to avoid runaway rambles
-STREAM_CHUNK_SIZE = 80     # characters per streamed chunk
 RESPONSE_TIMEOUT_SEC = 60  # safety timeout per request
+BUSY_MESSAGE = "⏳ Still answering your previous message. Please try again in a moment."
 
 
 class CopilotAdapter:
@@ -28,17 +37,17 @@ class CopilotAdapter:
     - WebSocket connections for real-time chat
     - Message format conversion
     - Streaming responses
-    - Session management
+    - Session management (one pooled agency per project/thread)
     """
 
-    def __init__(self, agency: Agency):
+    def __init__(self, pool: AgencyPool):
         """
         Initialize CopilotKit adapter
 
         Args:
-            agency: Agency Swarm agency instance
+            pool: Agency pool providing one agency per conversation
         """
-        self.agency = agency
+        self.pool = pool
         self.active_connections: Dict[str, WebSocket] = {}
         logger.info("CopilotAdapter initialized")
 
@@ -63,7 +72,9 @@ class CopilotAdapter:
                 data = await websocket.receive_json()
                 logger.debug(f"Received: {data}")
 
-                # Process message and stream response
+                # Process message and stream response (connection id is the default thread)
+                if isinstance(data, dict) and client_id:
+                    data.setdefault("threadId", client_id)
                 async for response_chunk in self.process_message_stream(data):
                     await websocket.send_json(response_chunk)
 
@@ -90,11 +101,12 @@ class CopilotAdapter:
         """
         try:
             user_message = self.extract_user_message(message_data)
+            project, thread_id = self.extract_conversation(message_data)
 
-            response = await self._get_response_with_timeout(user_message)
+            response = await self._get_response_with_timeout(user_message, project, thread_id)
 
-            # Convert to CopilotKit format
-            return self.format_copilot_response(response, message_data)
+            # Convert to CopilotKit format (threadId lets the client continue the conversation)
+            return self.format_copilot_response(response, message_data, thread_id=thread_id)
 
         except Exception as e:
             logger.error(f"Message handling error: {e}")
@@ -114,20 +126,57 @@ class CopilotAdapter:
         """
         try:
             user_message = self.extract_user_message(message_data)
+            project, thread_id = self.extract_conversation(message_data)
 
-            # Send typing indicator
-            yield self.format_typing_indicator(True)
+            # Send typing indicator until the model produces its first token;
+            # it carries the threadId for the client to echo back
+            yield self.format_typing_indicator(True, thread_id=thread_id)
+            typing = True
+            sent = 0
 
-            response = await self._get_response_with_timeout(user_message)
+            # Output guardrail runs on the stream itself; only scanned text is sent
+            from idse_developer_agent.guardrails.instruction_protection import BLOCK_MESSAGES, leakage_stream
 
-            # Send response in chunks for streaming effect
-            yield self.format_typing_indicator(False)
+            leakage = leakage_stream()
 
-            # Split response into chunks for streaming
-            for i in range(0, len(response), STREAM_CHUNK_SIZE):
-                chunk = response[i:i + STREAM_CHUNK_SIZE]
-                yield self.format_response_chunk(chunk, is_final=(i + STREAM_CHUNK_SIZE >= len(response)))
-                await asyncio.sleep(0.05)  # Small delay for smooth streaming
+            try:
+                async with self.pool.lease(project, thread_id) as agency:
+                    async with aclosing(
+                        stream_response_text(agency, user_message, timeout=RESPONSE_TIMEOUT_SEC)
+                    ) as deltas, aclosing(guard_stream(deltas, leakage)) as released:
+                        async for delta in released:
+                            if typing:
+                                yield self.format_typing_indicator(False)
+                                typing = False
+                            if sent + len(delta) > MAX_RESPONSE_CHARS:
+                                # Truncate and stop the upstream generation
+                                yield self.format_response_chunk(delta[:MAX_RESPONSE_CHARS - sent] + "…")
+                                break
+                            sent += len(delta)
+                            yield self.format_response_chunk(delta)
+            except LeaseTimeout:
+                logger.warning("Conversation %s busy; request rejected", thread_id)
+                if typing:
+                    yield self.format_typing_indicator(False)
+                yield self.format_error_response(BUSY_MESSAGE)
+                return
+            except asyncio.TimeoutError:
+                logger.error("Agency response timed out")
+                if typing:
+                    yield self.format_typing_indicator(False)
+                yield self.format_error_response("⏱️ Response timed out. Please try again with a shorter request.")
+                return
+
+            if leakage.match is not None:
+                logger.warning("Streamed response blocked by guardrail rule %s", leakage.match.rule_id)
+                if typing:
+                    yield self.format_typing_indicator(False)
+                yield self.format_error_response(BLOCK_MESSAGES[leakage.match.category])
+                return
+
+            if typing:
+                yield self.format_typing_indicator(False)
+            yield self.format_response_chunk("", is_final=True)
 
         except Exception as e:
             logger.error(f"Stream processing error: {e}")
@@ -160,19 +209,45 @@ class CopilotAdapter:
         logger.warning(f"Could not extract message from: {message_data}")
         return ""
 
-    async def _get_response_with_timeout(self, user_message: str) -> str:
+    def extract_conversation(self, message_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract the (project, thread id) that selects the pooled agency
+
+        Args:
+            message_data: Raw message data from CopilotKit
+
+        Returns:
+            Tuple of project (may be None) and thread id; requests without
+            one get a new thread id, so anonymous clients never share an agency
+        """
+        project = message_data.get("project")
+        thread_id = (
+            message_data.get("threadId")
+            or message_data.get("thread_id")
+            or message_data.get("session")
+            or new_thread_id()
+        )
+        return project, thread_id
+
+    async def _get_response_with_timeout(
+        self,
+        user_message: str,
+        project: Optional[str] = None,
+        thread_id: Optional[str] = None,
+    ) -> str:
         """
-        Fetch response from agency with timeout and truncation to avoid runaway output.
+        Fetch response from the conversation's agency with timeout and truncation to avoid runaway output.
         """
         try:
-            raw = await asyncio.wait_for(
-                asyncio.to_thread(self.agency.get_response_sync, user_message),
-                timeout=RESPONSE_TIMEOUT_SEC,
-            )
-            text = str(raw) if raw is not None else ""
+            async with self.pool.lease(project, thread_id) as agency:
+                # Native async call; the timeout cancels the upstream request
+                text = await get_response_text(agency, user_message, timeout=RESPONSE_TIMEOUT_SEC)
             if len(text) > MAX_RESPONSE_CHARS:
                 text = text[:MAX_RESPONSE_CHARS] + "…"
             return text
+        except LeaseTimeout:
+            logger.warning("Conversation %s busy; request rejected", thread_id)
+            return BUSY_MESSAGE
         except asyncio.TimeoutError:
             logger.error("Agency response timed out")
             return "⏱️ Response timed out. Please try again with a shorter request."
@@ -181,7 +256,7 @@ class CopilotAdapter:
             return f"⚠️ Error: {exc}"
 
     def format_copilot_response(
-        self, response: str, original_message: Dict[str, Any]
+        self, response: str, original_message: Dict[str, Any], thread_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Format Agency Swarm response for CopilotKit
@@ -189,6 +264,7 @@ class CopilotAdapter:
         Args:
             response: Response from Agency Swarm
             original_message: Original message data for context
+            thread_id: Conversation id for the client to send back
 
         Returns:
             Response in CopilotKit format
@@ -197,6 +273,7 @@ class CopilotAdapter:
             "type": "message",
             "role": "assistant",
             "content": response,
+            "threadId": thread_id,
             "timestamp": self._get_timestamp(),
             "metadata": {
                 "agent": "IDSE Developer Agent",
@@ -222,21 +299,25 @@ class CopilotAdapter:
             "timestamp": self._get_timestamp(),
         }
 
-    def format_typing_indicator(self, is_typing: bool) -> Dict[str, Any]:
+    def format_typing_indicator(self, is_typing: bool, thread_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Format typing indicator event
 
         Args:
             is_typing: Whether agent is typing
+            thread_id: Conversation id for the client to send back (omitted if None)
 
         Returns:
             Typing indicator in CopilotKit format
         """
-        return {
+        indicator = {
             "type": "typing",
             "is_typing": is_typing,
             "timestamp": self._get_timestamp(),
         }
+        if thread_id is not None:
+            indicator["threadId"] = thread_id
+        return indicator
 
     def format_error_response(self, error_message: str) -> Dict[str, Any]:
         """
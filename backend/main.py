@@ -11,7 +11,9 @@ Designed for deployment on Agencii Cloud with widget embedding on external sites
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+import asyncio
 import logging
+import os
 
 # Load environment variables
 load_dotenv()
@@ -67,7 +69,6 @@ async def health_check():
 def register_routes():
     """Register all API route modules."""
     try:
-        import os
         from backend.routes import (
             agui_realtime,
             agui_routes,
@@ -175,6 +176,14 @@ async def startup_event():
     """Application startup event handler"""
     logger.info("🚀 Starting IDSE Developer Agency Backend...")
     register_routes()
+    # Load (or rebuild) the page index off the event loop before serving
+    from backend.services.page_storage import page_storage
+
+    await asyncio.to_thread(page_storage.summaries)
+    if os.environ.get("STATUS_BROWSER_ENABLED", "true").lower() == "true":
+        from backend.services.status_service import status_service
+
+        await status_service.start_watching()
     logger.info("✅ Backend ready for requests")
 
 
@@ -182,6 +191,9 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown event handler"""
     logger.info("🛑 Shutting down IDSE Developer Agency Backend...")
+    from backend.services.status_service import status_service
+
+    await status_service.stop_watching()
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@ Lightweight AG-UI compatible realtime endpoints for the widget shell.
 
 Endpoints:
 - GET /stream    : Server-Sent Events (SSE) stream of AG-UI events
-- POST /inbound  : Accepts user messages and emits assistant replies
+- POST /inbound  : Accepts user messages and streams assistant replies
 
 Notes:
 - Open CORS is already enabled in backend/main.py (allow_origins=["*"]).
@@ -13,14 +13,17 @@ Notes:
 import asyncio
 import json
 import logging
+import uuid
+from contextlib import aclosing, nullcontext
 from typing import Any, Dict, Set
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
-from agency_swarm import Agency
 from agency_swarm.ui.core.agui_adapter import AguiAdapter
-from idse_developer_agent import idse_developer_agent
+
+from backend.services.agency_pool import agency_pool, guard_stream, new_thread_id, stream_response_text
+from SessionManager import SessionManager
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +32,8 @@ router = APIRouter()
 # Simple pub-sub for SSE events (one queue per subscriber)
 subscribers: Set[asyncio.Queue[Dict[str, Any]]] = set()
 
-# Initialize Agency + adapter for synchronous replies
+# AG-UI adapter; agencies come from the per-conversation pool
 adapter = AguiAdapter()
-agency = Agency(
-    idse_developer_agent,
-    communication_flows=[],
-    name="IDSEDeveloperAgency",
-    shared_instructions="shared_instructions.md",
-)
 
 
 async def enqueue_event(event: Dict[str, Any]) -> None:
@@ -83,58 +80,60 @@ async def stream_events():
 @router.post("/inbound")
 async def inbound(payload: Dict[str, Any]):
     """
-    Accept user messages and emit assistant replies to the SSE stream.
+    Accept user messages and stream assistant replies to the SSE stream.
 
     Expected payload: { "type": "USER_MESSAGE", "content": "<text>", "project": "...", "session": "..." }
+    An optional "thread_id" selects the conversation within the session (defaults to the session).
+    Without either, a new thread id is generated; it is returned as "thread_id"
+    for the client to send back with its next message.
     """
     message_type = payload.get("type")
     content = payload.get("content")
     project = payload.get("project")
     session = payload.get("session")
+    thread_id = payload.get("thread_id") or session or new_thread_id()
 
     if message_type != "USER_MESSAGE" or not content:
         raise HTTPException(status_code=400, detail="Payload must include type=USER_MESSAGE and content.")
 
-    # If project/session provided, temporarily update the active session
-    original_session = None
-    if project and session:
-        from SessionManager import SessionManager
-        try:
-            original_session = SessionManager.get_active_session()
-            # Create a temporary session entry for this request
-            import json
-            from pathlib import Path
-            active_file = Path(__file__).resolve().parent.parent.parent / ".idse_active_session.json"
-            temp_session = {
-                "session_id": session,
-                "name": session,
-                "created_at": original_session.created_at,
-                "owner": original_session.owner,
-                "project": project,
-            }
-            active_file.write_text(json.dumps(temp_session, indent=2), encoding="utf-8")
-        except Exception as e:
-            logger.warning(f"Failed to update session context: {e}")
+    # If project/session provided, scope the agent's session to this request
+    # (in memory; the shared active-session file is left untouched)
+    session_scope = (
+        SessionManager.scoped_session(project, session) if project and session else nullcontext()
+    )
 
     try:
-        # Run the sync Agency call off the event loop to avoid asyncio.run() conflicts
         await enqueue_event({"type": "SYSTEM_MESSAGE", "content": "Agent is thinking…"})
-        # Small delay to ensure the "thinking" message is delivered before blocking
-        await asyncio.sleep(0.1)
-        response_text = await asyncio.to_thread(agency.get_response_sync, content)
-        # Ensure the response is serializable
-        response_str = response_text if isinstance(response_text, str) else str(response_text)
-
-        # Strip debug/guardrail footers (e.g., RunResult / guardrail summaries)
-        cleaned_lines = []
-        stop_markers = ("runresult", "raw response", "new item(s)", "guardrail result")
-        for line in response_str.splitlines():
-            if any(marker in line.lower() for marker in stop_markers):
-                break
-            cleaned_lines.append(line)
-        response_str = "\n".join(cleaned_lines).strip() or response_str
-
-        await enqueue_event({"type": "TEXT_MESSAGE_CONTENT", "content": response_str, "from": "assistant"})
+        # Forward model deltas as they arrive: TEXT_MESSAGE_START, one
+        # TEXT_MESSAGE_CONTENT per delta, then TEXT_MESSAGE_END. The output
+        # guardrail runs on the stream itself; only scanned text is sent.
+        from idse_developer_agent.guardrails.instruction_protection import BLOCK_MESSAGES, leakage_stream
+
+        leakage = leakage_stream()
+        message_id = uuid.uuid4().hex
+        started = False
+        with session_scope:
+            async with agency_pool.lease(project, thread_id) as agency:
+                async with aclosing(stream_response_text(agency, content)) as deltas, aclosing(
+                    guard_stream(deltas, leakage)
+                ) as released:
+                    async for delta in released:
+                        if not started:
+                            await enqueue_event({"type": "TEXT_MESSAGE_START", "messageId": message_id, "role": "assistant"})
+                            started = True
+                        await enqueue_event({"type": "TEXT_MESSAGE_CONTENT", "messageId": message_id, "delta": delta})
+        if leakage.match is not None:
+            # Upstream generation is already closed; the block message replaces the rest
+            logger.warning("Streamed AG-UI response blocked by guardrail rule %s", leakage.match.rule_id)
+            notice = BLOCK_MESSAGES[leakage.match.category]
+            if not started:
+                await enqueue_event({"type": "TEXT_MESSAGE_START", "messageId": message_id, "role": "assistant"})
+                started = True
+            else:
+                notice = "\n\n" + notice
+            await enqueue_event({"type": "TEXT_MESSAGE_CONTENT", "messageId": message_id, "delta": notice})
+        if started:
+            await enqueue_event({"type": "TEXT_MESSAGE_END", "messageId": message_id})
         # Small delay to ensure the response is delivered before the "finished" message
         await asyncio.sleep(0.1)
         await enqueue_event({"type": "SYSTEM_MESSAGE", "content": "Agent finished."})
@@ -142,16 +141,5 @@ async def inbound(payload: Dict[str, Any]):
         logger.exception("AG-UI inbound processing failed")
         await enqueue_event({"type": "SYSTEM_MESSAGE", "content": f"Agent error: {e}"})
         raise HTTPException(status_code=500, detail="Agent processing failed") from e
-    finally:
-        # Restore original session if we changed it
-        if original_session:
-            try:
-                from pathlib import Path
-                import json
-                from dataclasses import asdict
-                active_file = Path(__file__).resolve().parent.parent.parent / ".idse_active_session.json"
-                active_file.write_text(json.dumps(asdict(original_session), indent=2), encoding="utf-8")
-            except Exception as e:
-                logger.warning(f"Failed to restore original session: {e}")
-
-    return {"status": "ok"}
+
+    return {"status": "ok", "thread_id": thread_id}
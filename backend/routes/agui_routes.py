@@ -17,8 +17,7 @@ except ImportError:
         "ag-ui-protocol not installed. Run: pip install ag-ui-protocol"
     )
 
-from agency_swarm import Agency
-from idse_developer_agent import idse_developer_agent
+from backend.services.agency_pool import agency_pool, get_response_text, new_thread_id
 
 logger = logging.getLogger(__name__)
 
@@ -28,14 +27,6 @@ router = APIRouter()
 # Initialize AG-UI adapter
 adapter = AguiAdapter()
 
-# Create agency instance for AG-UI interactions
-agency = Agency(
-    idse_developer_agent,
-    communication_flows=[],
-    name="IDSEDeveloperAgency",
-    shared_instructions="shared_instructions.md",
-)
-
 
 @router.get("/")
 async def agui_info():
@@ -114,19 +105,27 @@ async def agui_chat(payload: Dict[str, Any]):
 
     Accepts chat messages, processes them through the IDSE Developer Agent,
     and returns responses in AG-UI format.
+
+    Optional "project" and "thread_id" (or "session") fields select the
+    conversation; each conversation gets its own pooled agency. Without them
+    a new thread id is generated and returned as "thread_id".
     """
     try:
         user_message = payload.get("message")
         if not user_message:
             raise HTTPException(status_code=400, detail="Missing message in payload")
 
-        # Get response from agency
-        response = agency.get_response_sync(user_message)
+        # Get response from this conversation's agency
+        project = payload.get("project")
+        thread_id = payload.get("thread_id") or payload.get("session") or new_thread_id()
+        async with agency_pool.lease(project, thread_id) as agency:
+            response = await get_response_text(agency, user_message)
 
         return {
             "status": "success",
             "message": user_message,
             "response": response,
+            "thread_id": thread_id,
         }
 
     except Exception as e:
@@ -142,4 +141,5 @@ async def agui_status():
         "status": "operational",
         "adapter": "AguiAdapter (built-in)",
         "agent": "IDSE Developer Agent",
+        "agency_pool": agency_pool.stats(),
     }
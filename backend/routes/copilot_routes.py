@@ -6,29 +6,22 @@ Supports both HTTP and WebSocket connections.
 """
 
 from fastapi import APIRouter, WebSocket, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
+import json
 import logging
 import uuid
 
-from agency_swarm import Agency
-from idse_developer_agent import idse_developer_agent
 from backend.adapters.copilot_adapter import CopilotAdapter
+from backend.services.agency_pool import agency_pool
 
 logger = logging.getLogger(__name__)
 
 # Create router
 router = APIRouter()
 
-# Create agency instance for CopilotKit interactions
-agency = Agency(
-    idse_developer_agent,
-    communication_flows=[],
-    name="IDSEDeveloperAgency",
-    shared_instructions="shared_instructions.md",
-)
-
-# Initialize CopilotKit adapter
-adapter = CopilotAdapter(agency=agency)
+# Initialize CopilotKit adapter (one pooled agency per conversation)
+adapter = CopilotAdapter(pool=agency_pool)
 
 
 def _runtime_manifest():
@@ -146,27 +139,19 @@ async def copilot_stream(payload: Dict[str, Any]):
     """
     HTTP streaming endpoint for progressive responses
 
-    Similar to /chat but returns responses in chunks for
-    better UX with loading indicators.
-
-    This is a simplified streaming endpoint. For full streaming,
-    use the WebSocket endpoint at /ws
+    Same payload as /chat. The response is chunked NDJSON: one
+    CopilotKit event per line (typing, chunk, error), flushed as the
+    model produces tokens, followed by a final line of
+    {"type": "stream_complete", "total_chunks": n}.
     """
-    try:
-        chunks = []
+    async def ndjson():
+        total = 0
         async for chunk in adapter.process_message_stream(payload):
-            chunks.append(chunk)
-
-        # Return all chunks (simplified streaming)
-        return {
-            "type": "stream_complete",
-            "chunks": chunks,
-            "total_chunks": len(chunks),
-        }
+            total += 1
+            yield json.dumps(chunk) + "\n"
+        yield json.dumps({"type": "stream_complete", "total_chunks": total}) + "\n"
 
-    except Exception as e:
-        logger.error(f"CopilotKit stream error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @router.get("/status")
@@ -179,6 +164,7 @@ async def copilot_status():
         "agent": "IDSE Developer Agent",
         "active_connections": len(adapter.active_connections),
         "connection_ids": list(adapter.active_connections.keys()),
+        "agency_pool": agency_pool.stats(),
     }
 
 
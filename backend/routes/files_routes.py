@@ -1,11 +1,28 @@
 """
 File tree listing endpoint for MD Editor file browser.
 Provides recursive directory listing with smart exclusions.
+
+Listing uses os.scandir, so file/folder checks come from the cached
+DirEntry type instead of extra stat calls. Pass ``lazy=true`` (or a
+``path``) to get a single level with per-folder child counts and expand
+subtrees on demand.
+
+With ``stream=true`` the (sub)tree is streamed as NDJSON: one flat node
+per line (name, path, type, depth) in display order, as it is walked.
+
+Per-directory listings are cached in ``backend.services.dir_cache`` (keyed
+by path and mtime, revalidated with one stat); ``GET /files/tree/cache``
+reports its hit/miss counters.
 """
 
-from fastapi import APIRouter
+import asyncio
+import os
+from fastapi import APIRouter, HTTPException, Query
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional
+
+from backend.routes.ndjson import ndjson_response
+from backend.services.dir_cache import tree_cache
 
 router = APIRouter(prefix="/files", tags=["files"])
 
@@ -35,6 +52,81 @@ EXCLUDED_FILES = {
 }
 
 
+def _is_visible(name: str) -> bool:
+    """Apply the exclusion rules to a directory entry name."""
+    if name in EXCLUDED_DIRS or name in EXCLUDED_FILES:
+        return False
+    # Skip hidden files (except .owner, .collaborators for debugging)
+    return not name.startswith(".") or name in {".owner", ".collaborators"}
+
+
+class DirItem(NamedTuple):
+    name: str
+    path: str
+    is_dir: bool
+    is_file: bool
+
+
+def _read_dir(dir_path: Path) -> List[DirItem]:
+    try:
+        with os.scandir(dir_path) as it:
+            # DirEntry caches is_dir()/is_file(), so this costs no extra stat calls
+            items = [
+                DirItem(entry.name, entry.path, entry.is_dir(), entry.is_file())
+                for entry in it
+                if _is_visible(entry.name)
+            ]
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return []
+    items.sort(key=lambda item: (not item.is_dir, item.name.lower()))
+    return items
+
+
+def _scan(dir_path: Path) -> List[DirItem]:
+    """Visible entries of a directory, folders first, then by name (cached)."""
+    return tree_cache.get(dir_path, lambda: _read_dir(dir_path))
+
+
+def has_files(dir_path: Path, max_depth: int = 10) -> bool:
+    """True if a file is visible within ``max_depth`` levels (stops at the first one)."""
+    if max_depth <= 0:
+        return False
+    return any(
+        entry.is_file or (entry.is_dir and has_files(Path(entry.path), max_depth - 1))
+        for entry in _scan(dir_path)
+    )
+
+
+def count_children(dir_path: Path, max_depth: int = 10) -> int:
+    """Number of nodes a folder expands to: files, and subfolders that contain a file."""
+    if max_depth <= 0:
+        return 0
+    return sum(
+        1
+        for entry in _scan(dir_path)
+        if entry.is_file or (entry.is_dir and has_files(Path(entry.path), max_depth - 1))
+    )
+
+
+def list_directory(dir_path: Path, relative_path: str = "", max_depth: int = 10) -> List[Dict[str, Any]]:
+    """
+    List a single directory level.
+
+    Folders carry ``child_count`` instead of ``children``; folders without
+    any file within ``max_depth`` levels are skipped, as in the full tree.
+    """
+    nodes = []
+    for entry in _scan(dir_path):
+        rel_path = f"{relative_path}/{entry.name}" if relative_path else entry.name
+        if entry.is_dir:
+            child_count = count_children(Path(entry.path), max_depth - 1)
+            if child_count:
+                nodes.append({"name": entry.name, "path": rel_path, "type": "folder", "child_count": child_count})
+        elif entry.is_file:
+            nodes.append({"name": entry.name, "path": rel_path, "type": "file"})
+    return nodes
+
+
 def build_file_tree(
     dir_path: Path,
     relative_path: str = "",
@@ -56,60 +148,113 @@ def build_file_tree(
     if current_depth >= max_depth:
         return []
 
-    try:
-        entries = sorted(dir_path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower()))
-        nodes = []
-
-        for entry in entries:
-            name = entry.name
-
-            # Skip excluded files/dirs
-            if name in EXCLUDED_DIRS or name in EXCLUDED_FILES:
-                continue
-
-            # Skip hidden files (except .owner, .collaborators for debugging)
-            if name.startswith(".") and name not in {".owner", ".collaborators"}:
-                continue
-
-            rel_path = f"{relative_path}/{name}" if relative_path else name
-
-            if entry.is_dir():
-                children = build_file_tree(
-                    entry,
-                    rel_path,
-                    max_depth,
-                    current_depth + 1,
-                )
-
-                # Only include folders that have children
-                if children:
-                    nodes.append({
-                        "name": name,
-                        "path": rel_path,
-                        "type": "folder",
-                        "children": children,
-                    })
-            elif entry.is_file():
-                # Include all files (not just .md like Milkdown service)
+    nodes = []
+    for entry in _scan(dir_path):
+        name = entry.name
+        rel_path = f"{relative_path}/{name}" if relative_path else name
+
+        if entry.is_dir:
+            children = build_file_tree(
+                Path(entry.path),
+                rel_path,
+                max_depth,
+                current_depth + 1,
+            )
+
+            # Only include folders that have children
+            if children:
                 nodes.append({
                     "name": name,
                     "path": rel_path,
-                    "type": "file",
+                    "type": "folder",
+                    "children": children,
                 })
+        elif entry.is_file:
+            # Include all files (not just .md like Milkdown service)
+            nodes.append({
+                "name": name,
+                "path": rel_path,
+                "type": "file",
+            })
 
-        return nodes
-    except PermissionError:
-        return []
+    return nodes
+
+
+def iter_file_tree(
+    dir_path: Path,
+    relative_path: str = "",
+    max_depth: int = 10,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Walk the tree depth-first, yielding flat nodes in the same order and
+    with the same exclusions as ``build_file_tree``.
+
+    A folder is emitted just before its first file, so folders without any
+    files are skipped without buffering their subtrees. Memory use is bounded
+    by the depth of the walk, not the size of the tree.
+    """
+    pending: List[Dict[str, Any]] = []  # folders on the current path not yet emitted
+
+    def walk(path: Path, rel: str, depth: int) -> Iterator[Dict[str, Any]]:
+        if depth >= max_depth:
+            return
+        for entry in _scan(path):
+            child_rel = f"{rel}/{entry.name}" if rel else entry.name
+            if entry.is_dir:
+                pending.append({"name": entry.name, "path": child_rel, "type": "folder", "depth": depth})
+                yield from walk(Path(entry.path), child_rel, depth + 1)
+                if pending and pending[-1]["path"] == child_rel:
+                    pending.pop()
+            elif entry.is_file:
+                while pending:
+                    yield pending.pop(0)
+                yield {"name": entry.name, "path": child_rel, "type": "file", "depth": depth}
+
+    yield from walk(dir_path, relative_path, 0)
+
+
+def resolve_tree_path(workspace_root: Path, path: Optional[str]) -> Path:
+    """Resolve a workspace-relative directory, rejecting escapes and excluded dirs."""
+    if not path or path.strip("/") == "":
+        return workspace_root
+    rel = path.strip("/")
+    target = (workspace_root / rel).resolve()
+    if target != workspace_root and workspace_root not in target.parents:
+        raise HTTPException(status_code=400, detail="Path must stay inside the workspace")
+    if not all(_is_visible(part) for part in Path(rel).parts):
+        raise HTTPException(status_code=404, detail="Directory not found")
+    if not target.is_dir():
+        raise HTTPException(status_code=404, detail="Directory not found")
+    return target
 
 
 @router.get("/tree")
-async def get_file_tree() -> List[Dict[str, Any]]:
+async def get_file_tree(
+    path: Optional[str] = Query(None, description="Workspace-relative folder to list"),
+    lazy: bool = Query(False, description="Return one level with child counts"),
+    stream: bool = Query(False, description="Stream flat nodes as NDJSON while walking"),
+):
     """
-    Get complete repository file tree.
+    Get the repository file tree.
 
     Returns JSON structure suitable for TreeView component.
-    Excludes common build/dependency directories.
+    Excludes common build/dependency directories. With ``lazy`` or a
+    ``path``, only that folder's direct children are returned; with
+    ``stream`` the whole (sub)tree under ``path`` is streamed as NDJSON.
     """
-    workspace_root = Path.cwd()
-    tree = build_file_tree(workspace_root)
-    return tree
+    workspace_root = Path.cwd().resolve()
+    if stream:
+        target = resolve_tree_path(workspace_root, path)
+        relative = target.relative_to(workspace_root).as_posix() if target != workspace_root else ""
+        return ndjson_response(iter_file_tree(target, relative))
+    if path is None and not lazy:
+        return await asyncio.to_thread(build_file_tree, workspace_root)
+    target = resolve_tree_path(workspace_root, path)
+    relative = target.relative_to(workspace_root).as_posix() if target != workspace_root else ""
+    return await asyncio.to_thread(list_directory, target, relative)
+
+
+@router.get("/tree/cache")
+async def get_file_tree_cache_stats() -> Dict[str, Any]:
+    """Directory listing cache counters (hits, misses, evictions, size)."""
+    return tree_cache.stats()
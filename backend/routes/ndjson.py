@@ -0,0 +1,40 @@
+"""
+Helpers for newline-delimited JSON (application/x-ndjson) responses.
+
+Items are serialized one per line as they are produced, so clients can
+render progressively and the server never holds the whole result. Lines
+are grouped into ~16 KB chunks to avoid one socket write per item.
+"""
+
+import json
+from typing import Any, Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+FLUSH_BYTES = 16 * 1024
+
+
+def ndjson_chunks(items: Iterable[Any], flush_bytes: int = FLUSH_BYTES) -> Iterator[str]:
+    """Serialize items as NDJSON, yielding batches of complete lines."""
+    buffer = []
+    size = 0
+    for item in items:
+        line = json.dumps(item, default=str) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= flush_bytes:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def ndjson_response(items: Iterable[Any]) -> StreamingResponse:
+    """
+    Stream items as NDJSON.
+
+    Plain (sync) iterables are consumed in Starlette's threadpool, so
+    blocking filesystem walks do not stall the event loop.
+    """
+    return StreamingResponse(ndjson_chunks(items), media_type=NDJSON_MEDIA_TYPE)
@@ -1,25 +1,41 @@
 """
 Puck Page Builder Routes
 
-Simple file-based storage for Puck page JSON payloads.
+CRUD for Puck page JSON payloads.
 
-This is intended as a lightweight starter implementation; swap `PAGES_DIR`
-for a persistent store (DB/object storage) in production.
+Pages are persisted through `backend.services.page_storage` (file store by
+default; set PAGE_STORAGE=sqlite for the embedded database).
+
+Pages carry a version. PATCH accepts JSON Patch or JSON Merge Patch bodies
+(see `backend.services.page_patch`) and requires the version the client
+last read, so concurrent editors get 409 instead of silently overwriting.
+
+The listing is paginated with opaque cursors and carries a strong ETag;
+a matching If-None-Match is answered with 304 without reading any pages.
 """
 from datetime import datetime
-from fastapi import APIRouter, HTTPException
-from pathlib import Path
-from typing import Any, Dict, List, Optional
-import json
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Response
+from typing import Any, Callable, Dict, List, Optional, Union
 import uuid
 import re
 
-router = APIRouter()
+from backend.services.page_patch import (
+    JSON_PATCH,
+    PatchError,
+    PatchTestFailed,
+    apply_json_patch,
+    apply_page_merge_patch,
+    tests_pointer,
+)
+from backend.services.page_storage import (
+    DEFAULT_SORT,
+    MAX_PAGE_LIMIT,
+    VersionConflict,
+    etag_matches,
+    page_storage,
+)
 
-# File-based storage directory (created on import)
-BASE_DIR = Path(__file__).resolve().parents[2]
-PAGES_DIR = BASE_DIR / "data" / "puck_pages"
-PAGES_DIR.mkdir(parents=True, exist_ok=True)
+router = APIRouter()
 
 
 def slugify(value: str) -> str:
@@ -30,49 +46,52 @@ def slugify(value: str) -> str:
     return value or f"page-{uuid.uuid4().hex[:8]}"
 
 
-def _page_path(page_id: str) -> Path:
-    """Resolve the path for a given page id."""
-    return PAGES_DIR / f"{page_id}.json"
-
-
 def _load_page_by_id(page_id: str) -> Optional[Dict[str, Any]]:
     """Load a page by id if it exists."""
-    page_file = _page_path(page_id)
-    if not page_file.exists():
-        return None
-    with page_file.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return page_storage.get(page_id)
 
 
 def _load_page_by_slug(slug: str) -> Optional[Dict[str, Any]]:
-    """Linear scan for a page with the given slug."""
-    for page_file in PAGES_DIR.glob("*.json"):
-        with page_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            if data.get("slug") == slug:
-                return data
-    return None
+    """Load a page by slug (indexed lookup) if it exists."""
+    return page_storage.get_by_slug(slug)
 
 
 def _ensure_unique_slug(base_slug: str, exclude_id: Optional[str] = None) -> str:
     """Ensure slug uniqueness across stored pages."""
-    existing_slugs = set()
-    for page_file in PAGES_DIR.glob("*.json"):
-        with page_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            if exclude_id and data.get("id") == exclude_id:
-                continue
-            if data_slug := data.get("slug"):
-                existing_slugs.add(data_slug)
-
     slug = base_slug
     counter = 1
-    while slug in existing_slugs:
+    while page_storage.slug_taken(slug, exclude_id=exclude_id):
         slug = f"{base_slug}-{counter}"
         counter += 1
     return slug
 
 
+def _parse_version(value: Any) -> int:
+    """Parse a client-supplied page version (body field or If-Match value)."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid page version: {value!r}")
+
+
+def _update_page(
+    page_id: str,
+    changes: Callable[[Dict[str, Any]], Dict[str, Any]],
+    expected_version: Optional[int],
+) -> Dict[str, Any]:
+    """Run a versioned read-modify-write, mapping failures to HTTP errors."""
+    try:
+        return page_storage.update(page_id, changes, expected_version=expected_version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Page not found")
+    except VersionConflict as exc:
+        raise HTTPException(status_code=409, detail={"message": str(exc), "version": exc.current})
+    except PatchTestFailed as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except PatchError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
 def _normalize_page_payload(
     raw: Dict[str, Any],
     page_id: Optional[str] = None,
@@ -137,12 +156,21 @@ def _migrate_zones(page: Dict[str, Any]) -> Dict[str, Any]:
     return updated
 
 
-def _sanitize_page_payload(raw: Dict[str, Any]) -> Dict[str, Any]:
+def _sanitize_content_item(item: Dict[str, Any], idx: int) -> Dict[str, Any]:
+    """Ensure a content block has an id and a props object."""
+    item_id = item.get("id") or f"auto-{idx}-{uuid.uuid4().hex[:8]}"
+    props = item.get("props") or {}
+    return {**item, "id": item_id, "props": props}
+
+
+def _sanitize_page_payload(raw: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Strip legacy DropZone data and ensure root/content props are well-formed.
 
     This keeps persisted JSON aligned with the slot-based schema the frontend
-    now expects, preventing drag/drop crashes from stale data.
+    now expects, preventing drag/drop crashes from stale data. Content items
+    shared with ``previous`` (an already-sanitized stored page, e.g. the
+    untouched blocks of a patch) are kept as-is.
     """
     if not isinstance(raw, dict):
         return {}
@@ -158,14 +186,14 @@ def _sanitize_page_payload(raw: Dict[str, Any]) -> Dict[str, Any]:
                 root_props[k] = v
 
     # Normalize content list
+    stored = {id(item) for item in (previous or {}).get("content") or []}
     content: List[Dict[str, Any]] = []
     if isinstance(page.get("content"), list):
         for idx, item in enumerate(page["content"]):
-            if not isinstance(item, dict):
-                continue
-            item_id = item.get("id") or f"auto-{idx}-{uuid.uuid4().hex[:8]}"
-            props = item.get("props") or {}
-            content.append({**item, "id": item_id, "props": props})
+            if id(item) in stored:
+                content.append(item)
+            elif isinstance(item, dict):
+                content.append(_sanitize_content_item(item, idx))
 
     sanitized = {
         **page,
@@ -182,10 +210,10 @@ async def create_page(page_data: Dict[str, Any]):
     """Save a new Puck page configuration with title/slug metadata."""
     clean = _sanitize_page_payload(page_data)
     normalized = _normalize_page_payload(clean)
-    with _page_path(normalized["id"]).open("w", encoding="utf-8") as f:
-        json.dump(normalized, f, indent=2)
+    normalized["version"] = 1
+    page_storage.save(normalized)
 
-    return {"id": normalized["id"], "slug": normalized["slug"], "status": "created"}
+    return {"id": normalized["id"], "slug": normalized["slug"], "version": 1, "status": "created"}
 
 
 @router.get("/{page_id_or_slug}", summary="Get a Puck page by id or slug")
@@ -206,23 +234,70 @@ async def update_page(page_id_or_slug: str, page_data: Dict[str, Any]):
 
     page_id = existing["id"]
     overwrite = bool(page_data.get("overwrite"))
+    expected = _parse_version(page_data["version"]) if "version" in page_data else None
+
+    def changes(current: Dict[str, Any]) -> Dict[str, Any]:
+        merged = {**current, **_sanitize_page_payload(page_data)}
+        if overwrite:
+            # Force-keep the current slug unless caller explicitly changes it
+            desired_slug = page_data.get("slug") or current.get("slug")
+            return _normalize_page_payload(merged, page_id=page_id, current_slug=desired_slug)
+        return _normalize_page_payload(merged, page_id=page_id, current_slug=current.get("slug"))
+
+    normalized = _update_page(page_id, changes, expected)
+    return {
+        "id": normalized["id"],
+        "slug": normalized["slug"],
+        "version": normalized["version"],
+        "status": "updated",
+    }
 
-    merged = {**existing, **_sanitize_page_payload(page_data)}
 
-    if overwrite:
-        # Force-keep the current slug unless caller explicitly changes it
-        desired_slug = page_data.get("slug") or existing.get("slug")
-        normalized = _normalize_page_payload(
-            merged,
-            page_id=page_id,
-            current_slug=desired_slug,
-        )
-    else:
-        normalized = _normalize_page_payload(merged, page_id=page_id, current_slug=existing.get("slug"))
-    with _page_path(page_id).open("w", encoding="utf-8") as f:
-        json.dump(normalized, f, indent=2)
+@router.patch("/{page_id_or_slug}", summary="Patch a Puck page")
+async def patch_page(
+    page_id_or_slug: str,
+    patch: Union[List[Dict[str, Any]], Dict[str, Any]] = Body(...),
+    content_type: Optional[str] = Header(None),
+    if_match: Optional[str] = Header(None),
+):
+    """
+    Apply a JSON Patch (application/json-patch+json) or JSON Merge Patch
+    (application/merge-patch+json) to a page.
+
+    The expected version comes from If-Match, a merge patch ``version`` field
+    or a JSON Patch ``test`` of ``/version``; 428 if none is given.
+    """
+    existing = _load_page_by_id(page_id_or_slug) or _load_page_by_slug(page_id_or_slug)
+    if not existing:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    is_json_patch = isinstance(patch, list)
+    if (content_type or "").split(";")[0].strip() == JSON_PATCH and not is_json_patch:
+        raise HTTPException(status_code=422, detail="JSON Patch body must be an array of operations")
+
+    expected = None
+    if if_match and if_match.strip() != "*":
+        expected = _parse_version(if_match.strip().removeprefix("W/").strip('"'))
+    if not is_json_patch and "version" in patch:
+        patch = dict(patch)
+        body_version = _parse_version(patch.pop("version"))
+        expected = body_version if expected is None else expected
+    if expected is None and not (is_json_patch and tests_pointer(patch, "/version")):
+        raise HTTPException(status_code=428, detail="Send If-Match or the page version to patch a page")
+
+    def changes(current: Dict[str, Any]) -> Dict[str, Any]:
+        if is_json_patch:
+            patched = apply_json_patch(current, patch)
+        else:
+            patched = apply_page_merge_patch(current, patch)
+        if not isinstance(patched, dict):
+            raise PatchError("Patched page must be a JSON object")
+        clean = _sanitize_page_payload(patched, previous=current)
+        # Slug uniqueness is only re-checked when the patch changed the slug
+        return _normalize_page_payload(clean, page_id=current["id"], current_slug=current.get("slug"))
 
-    return {"id": normalized["id"], "slug": normalized["slug"], "status": "updated"}
+    page = _update_page(existing["id"], changes, expected)
+    return {"id": page["id"], "slug": page["slug"], "version": page["version"], "status": "patched"}
 
 
 @router.delete("/{page_id_or_slug}", summary="Delete a Puck page")
@@ -232,24 +307,26 @@ async def delete_page(page_id_or_slug: str):
     if not existing:
         raise HTTPException(status_code=404, detail="Page not found")
 
-    _page_path(existing["id"]).unlink()
+    page_storage.delete(existing["id"])
     return {"id": existing["id"], "slug": existing.get("slug"), "status": "deleted"}
 
 
 @router.get("/", summary="List Puck pages")
-async def list_pages():
-    """List stored Puck pages with lightweight metadata."""
-    pages: List[Dict[str, Any]] = []
-    for page_file in PAGES_DIR.glob("*.json"):
-        with page_file.open("r", encoding="utf-8") as f:
-            page_data = json.load(f)
-            pages.append(
-                {
-                    "id": page_data.get("id"),
-                    "title": page_data.get("title") or page_data.get("root", {}).get("title", "Untitled"),
-                    "slug": page_data.get("slug"),
-                    "updated_at": page_data.get("updated_at"),
-                }
-            )
-
-    return {"pages": pages}
+async def list_pages(
+    response: Response,
+    q: Optional[str] = Query(None, description="Case-insensitive prefix of slug or title"),
+    sort: str = Query(DEFAULT_SORT, description="updated_at or title; prefix '-' for descending"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    if_none_match: Optional[str] = Header(None),
+):
+    """List stored Puck pages with lightweight metadata (no page bodies are read)."""
+    etag = page_storage.etag()
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    try:
+        pages, next_cursor = page_storage.list_page(q=q, sort=sort, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    response.headers["ETag"] = etag
+    return {"pages": pages, "next_cursor": next_cursor}
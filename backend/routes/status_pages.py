@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from pydantic import BaseModel
 from typing import List, Optional
 
 from backend.services import status_page_store
+from backend.services.page_storage import DEFAULT_SORT, MAX_PAGE_LIMIT, etag_matches
 
 
 class PageDataModel(BaseModel):
@@ -19,6 +20,7 @@ class PageDataModel(BaseModel):
 
 class PageListResponse(BaseModel):
     pages: List[dict]
+    next_cursor: Optional[str] = None
 
 
 class PageResponse(BaseModel):
@@ -29,9 +31,24 @@ router = APIRouter(prefix="/api/status-pages", tags=["Status Pages"])
 
 
 @router.get("/", response_model=PageListResponse)
-async def list_pages():
-    """List all stored pages (slug/title/id)."""
-    return {"pages": status_page_store.list_pages()}
+async def list_pages(
+    response: Response,
+    q: Optional[str] = Query(None, description="Case-insensitive prefix of slug or title"),
+    sort: str = Query(DEFAULT_SORT, description="updated_at or title; prefix '-' for descending"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    if_none_match: Optional[str] = Header(None),
+):
+    """List stored pages (slug/title/id); 304 when If-None-Match is current."""
+    etag = status_page_store.etag()
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    try:
+        pages, next_cursor = status_page_store.list_pages(q=q, sort=sort, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    response.headers["ETag"] = etag
+    return {"pages": pages, "next_cursor": next_cursor}
 
 
 @router.get("/{slug}", response_model=PageResponse)
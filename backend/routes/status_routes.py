@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, HTTPException
+import os
+from typing import Any, Dict, List, Set
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from dataclasses import asdict
 
+from backend.routes.ndjson import ndjson_response
 from backend.services.status_service import status_service, ProjectSessionsResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/projects", tags=["status"])
 
+# Pub-sub for status SSE events (one queue per subscriber, grouped by project),
+# each mapped to the event loop that owns it
+status_subscribers: Dict[str, Dict[asyncio.Queue[Dict[str, Any]], asyncio.AbstractEventLoop]] = {}
+
+HEARTBEAT_SEC = 20
+# Revalidation interval for subscribers while no filesystem watcher is running
+POLL_SEC = float(os.environ.get("STATUS_STREAM_POLL_SEC", "1.0"))
+
 
 class SetActiveSessionRequest(BaseModel):
     project: str
@@ -19,16 +34,24 @@ class SetActiveSessionRequest(BaseModel):
 
 
 @router.get("/")
-async def list_projects():
+async def list_projects(stream: bool = Query(False, description="Stream {project_id} lines as NDJSON")):
     """List all projects discovered under projects/* (projects-root canonical)"""
     projects = status_service.list_projects()
+    if stream:
+        return ndjson_response({"project_id": project} for project in projects)
     return {"projects": projects}
 
 
 @router.get("/{project_id}/sessions")
-async def get_project_sessions(project_id: str) -> ProjectSessionsResponse:
+async def get_project_sessions(
+    project_id: str,
+    stream: bool = Query(False, description="Stream one session status per line as NDJSON"),
+) -> ProjectSessionsResponse:
     """Return session status for a given project."""
     try:
+        if stream:
+            sessions = status_service.iter_project_sessions(project_id)
+            return ndjson_response(asdict(session) for session in sessions)
         result = status_service.get_project_sessions(project_id)
         return asdict(result)
     except FileNotFoundError:
@@ -38,6 +61,96 @@ async def get_project_sessions(project_id: str) -> ProjectSessionsResponse:
         raise HTTPException(status_code=500, detail="Failed to scan project sessions") from exc
 
 
+def _put_events(q: asyncio.Queue[Dict[str, Any]], events: List[Dict[str, Any]]) -> None:
+    for event in events:
+        q.put_nowait(event)
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def enqueue_status_events(project_id: str, events: List[Dict[str, Any]]) -> None:
+    """
+    Place status delta events on every subscriber queue for a project.
+
+    Deltas are usually collected in a worker thread (watcher callbacks and
+    revalidation polls), so queues are filled on the loop that owns them.
+    """
+    queues = status_subscribers.get(project_id)
+    if not queues:
+        return
+    dead: Set[asyncio.Queue[Dict[str, Any]]] = set()
+    for q, loop in list(queues.items()):
+        try:
+            if _on_loop(loop):
+                _put_events(q, events)
+            else:
+                loop.call_soon_threadsafe(_put_events, q, events)
+        except Exception:
+            dead.add(q)
+    # Clean up any broken queues
+    for q in dead:
+        queues.pop(q, None)
+
+
+status_service.add_listener(enqueue_status_events)
+
+
+async def status_event_stream(project_id: str, snapshot: Dict[str, Any]):
+    """SSE generator for one project subscriber: snapshot first, then deltas."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+    status_subscribers.setdefault(project_id, {})[queue] = loop
+    status_service.watch(project_id)
+
+    await queue.put({"type": "SNAPSHOT", **snapshot})
+    # Flush anything invalidated between the snapshot and the subscription
+    await asyncio.to_thread(status_service.publish_deltas)
+
+    last_sent = loop.time()
+    try:
+        while True:
+            # No filesystem watcher: fall back to a cheap revalidation every POLL_SEC
+            polling = not status_service.watcher.running
+            timeout = HEARTBEAT_SEC - (loop.time() - last_sent)
+            if polling:
+                timeout = min(timeout, POLL_SEC)
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=max(timeout, 0))
+                yield f"data: {json.dumps(event, default=str)}\n\n"
+                last_sent = loop.time()
+            except asyncio.TimeoutError:
+                if polling:
+                    await asyncio.to_thread(status_service.publish_deltas)
+                    if not queue.empty():
+                        continue
+                if loop.time() - last_sent >= HEARTBEAT_SEC:
+                    # Heartbeat to keep the connection alive
+                    yield "data: {\"type\":\"HEARTBEAT\"}\n\n"
+                    last_sent = loop.time()
+    finally:
+        status_service.unwatch(project_id)
+        queues = status_subscribers.get(project_id)
+        if queues is not None:
+            queues.pop(queue, None)
+            if not queues:
+                status_subscribers.pop(project_id, None)
+
+
+@router.get("/{project_id}/sessions/stream")
+async def stream_project_sessions(project_id: str):
+    """Server-Sent Events stream of session status: a snapshot, then changed stages only."""
+    try:
+        snapshot = asdict(status_service.get_project_sessions(project_id))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+    return StreamingResponse(status_event_stream(project_id, snapshot), media_type="text/event-stream")
+
+
 @router.get("/active/session")
 async def get_active_session():
     """Get the currently active session."""
@@ -60,8 +173,8 @@ async def set_active_session(request: SetActiveSessionRequest):
         import time
         from pathlib import Path
 
-        # Load history to get session metadata
-        history_file = Path(__file__).resolve().parent.parent.parent / ".idse_sessions_history.json"
+        from SessionManager import SessionManager
+
         active_file = Path(__file__).resolve().parent.parent.parent / ".idse_active_session.json"
         projects_root = Path(__file__).resolve().parent.parent.parent / "projects"
 
@@ -70,29 +183,8 @@ async def set_active_session(request: SetActiveSessionRequest):
         if not session_path.exists():
             raise HTTPException(status_code=404, detail=f"Session folder '{request.session}' not found in project '{request.project}'")
 
-        # Load or create history
-        history = {}
-        if history_file.exists():
-            try:
-                history = json.loads(history_file.read_text(encoding="utf-8"))
-            except:
-                history = {}
-
-        # Find or create session metadata
-        session_meta = None
-        project_data = history.get(request.project, {})
-
-        # Check if it's the old format (with session_id at project level) or new format (nested sessions)
-        if isinstance(project_data, dict) and "session_id" in project_data:
-            # Old format - project has session_id directly
-            if project_data["session_id"] == request.session:
-                session_meta = project_data
-            else:
-                # Check nested sessions
-                session_meta = project_data.get(request.session)
-        else:
-            # New format - nested sessions only
-            session_meta = project_data.get(request.session)
+        # Look up session metadata in the history store (legacy JSON is imported on first use)
+        session_meta = SessionManager.history().get(request.project, request.session)
 
         # If not found in history, create from filesystem
         if not session_meta:
@@ -113,7 +205,7 @@ async def set_active_session(request: SetActiveSessionRequest):
         }
 
         # Write to active session file
-        active_file.write_text(json.dumps(session_data, indent=2), encoding="utf-8")
+        active_file.write_text(json.dumps(session_data, separators=(",", ":")), encoding="utf-8")
 
         return {"status": "ok", "session": session_data}
     except HTTPException:
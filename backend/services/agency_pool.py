@@ -0,0 +1,296 @@
+"""
+Per-conversation Agency pool.
+
+Each (project, thread) pair gets its own lazily constructed Agency so that
+conversation state is never shared between users. Agencies are kept warm in
+an LRU map bounded by AGENCY_POOL_MAX_SIZE; a per-agency lock serializes
+concurrent requests for the same conversation while different conversations
+run in parallel. Waiting for that lock is bounded by AGENCY_LEASE_TIMEOUT_SEC.
+
+Requests without a thread id get a fresh one from new_thread_id(); callers
+return it so the client can echo it back and continue the conversation.
+Anonymous requests therefore never share an agency (or its lock). Their
+agencies live in a separate LRU bounded by AGENCY_POOL_ANON_MAX_SIZE, so a
+burst of one-shot requests never evicts warm named conversations.
+
+Usage:
+    async with agency_pool.lease(project, thread_id) as agency:
+        response = await get_response_text(agency, message, timeout=60)
+
+    async with agency_pool.lease(project, thread_id) as agency:
+        async with aclosing(stream_response_text(agency, message, timeout=60)) as deltas:
+            async for delta in deltas:
+                ...
+
+Streamed text must pass the output guardrail before it is sent; wrap the
+deltas in guard_stream() with a scanner from leakage_stream().
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AGENCY_POOL_MAX_SIZE = int(os.environ.get("AGENCY_POOL_MAX_SIZE", "32"))
+AGENCY_POOL_ANON_MAX_SIZE = int(os.environ.get("AGENCY_POOL_ANON_MAX_SIZE", "4"))
+AGENCY_LEASE_TIMEOUT_SEC = float(os.environ.get("AGENCY_LEASE_TIMEOUT_SEC", "30"))
+DEFAULT_PROJECT = "default"
+DEFAULT_THREAD = "default"
+ANON_THREAD_PREFIX = "anon-"
+
+PoolKey = Tuple[str, str]
+
+# agency_swarm streams openai-agents events; text arrives as raw response deltas
+RAW_RESPONSE_EVENT = "raw_response_event"
+TEXT_DELTA_EVENT = "response.output_text.delta"
+
+
+class LeaseTimeout(asyncio.TimeoutError):
+    """Raised when a conversation's agency stays busy past the lease timeout."""
+
+
+def build_agency() -> Any:
+    """Construct a fresh IDSE Developer Agency."""
+    from agency_swarm import Agency
+    from idse_developer_agent import idse_developer_agent
+
+    return Agency(
+        idse_developer_agent,
+        communication_flows=[],
+        name="IDSEDeveloperAgency",
+        shared_instructions="shared_instructions.md",
+    )
+
+
+async def get_response_text(agency: Any, message: str, timeout: Optional[float] = None) -> str:
+    """
+    Run the agency on the event loop and return its final text output.
+
+    Uses the agency's native async API, so no executor thread is held per
+    in-flight call. On timeout the awaiting task is cancelled, which aborts
+    the upstream model request instead of leaving it running in a thread.
+    Raises asyncio.TimeoutError when the timeout expires.
+    """
+    if timeout is None:
+        result = await agency.get_response(message)
+    else:
+        result = await asyncio.wait_for(agency.get_response(message), timeout=timeout)
+    output = getattr(result, "final_output", result)
+    if output is None:
+        return ""
+    return output if isinstance(output, str) else str(output)
+
+
+def _text_delta(event: Any) -> Optional[str]:
+    """Return the text delta carried by a stream event, if any."""
+    if isinstance(event, dict):
+        # agency_swarm reports stream failures as plain dict events
+        if event.get("type") == "error":
+            raise RuntimeError(event.get("content") or event.get("error") or "Agency stream failed")
+        return None
+    if getattr(event, "type", None) != RAW_RESPONSE_EVENT:
+        return None
+    data = getattr(event, "data", None)
+    if getattr(data, "type", None) != TEXT_DELTA_EVENT:
+        return None
+    return getattr(data, "delta", None) or None
+
+
+async def stream_response_text(
+    agency: Any, message: str, timeout: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Yield text deltas from the agency as the model produces them.
+
+    The timeout bounds the whole response, not each delta. The upstream
+    stream is closed when the deadline passes, when the stream fails, or when
+    the caller stops iterating early (use contextlib.aclosing to make that
+    deterministic). Raises asyncio.TimeoutError when the timeout expires.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    events = agency.get_response_stream(message).__aiter__()
+    try:
+        while True:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                raise asyncio.TimeoutError
+            try:
+                event = await asyncio.wait_for(events.__anext__(), timeout=remaining)
+            except StopAsyncIteration:
+                return
+            delta = _text_delta(event)
+            if delta:
+                yield delta
+    finally:
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def guard_stream(deltas: AsyncIterator[str], scanner: Any) -> AsyncIterator[str]:
+    """
+    Pass text deltas through a streaming leakage scanner.
+
+    Yields only text the scanner has cleared and stops as soon as it blocks
+    (check ``scanner.match`` afterwards; the caller sends the block message
+    and closing the deltas stops the upstream generation).
+    """
+    async for delta in deltas:
+        verdict = scanner.feed(delta)
+        if verdict.release:
+            yield verdict.release
+        if verdict.blocked:
+            return
+    verdict = scanner.close()
+    if verdict.release:
+        yield verdict.release
+
+
+def new_thread_id() -> str:
+    """Thread id for a request that did not name its conversation."""
+    return f"{ANON_THREAD_PREFIX}{uuid.uuid4().hex}"
+
+
+def pool_key(project: Optional[str] = None, thread_id: Optional[str] = None) -> PoolKey:
+    """Normalize a (project, thread) pair into a pool key."""
+    return (project or DEFAULT_PROJECT, thread_id or DEFAULT_THREAD)
+
+
+@dataclass
+class _PoolEntry:
+    agency: Any
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    leases: int = 0
+
+
+class AgencyPool:
+    """LRU pool of Agency instances keyed by (project, thread); anonymous threads get their own LRU."""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any] = build_agency,
+        max_size: int = AGENCY_POOL_MAX_SIZE,
+        anon_max_size: int = AGENCY_POOL_ANON_MAX_SIZE,
+    ):
+        if max_size < 1 or anon_max_size < 1:
+            raise ValueError("AgencyPool max_size and anon_max_size must be at least 1")
+        self.factory = factory
+        self.max_size = max_size
+        self.anon_max_size = anon_max_size
+        self._entries: "OrderedDict[PoolKey, _PoolEntry]" = OrderedDict()
+        self._anonymous: "OrderedDict[PoolKey, _PoolEntry]" = OrderedDict()
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._anonymous)
+
+    def __contains__(self, key: PoolKey) -> bool:
+        return key in self._bucket(key)[0]
+
+    def get(self, project: Optional[str] = None, thread_id: Optional[str] = None) -> Any:
+        """Return the agency for a conversation, constructing it on first use."""
+        return self._entry(pool_key(project, thread_id)).agency
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        project: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        timeout: Optional[float] = AGENCY_LEASE_TIMEOUT_SEC,
+    ) -> AsyncIterator[Any]:
+        """
+        Exclusive access to a conversation's agency for the duration of a request.
+
+        Requests for the same conversation queue on its lock, for at most
+        ``timeout`` seconds (LeaseTimeout); leased agencies are never evicted.
+        Without a thread id the request gets a one-off conversation; use
+        new_thread_id() up front to hand the id back to the client.
+        """
+        key = pool_key(project, thread_id or new_thread_id())
+        entry = self._entry(key)
+        entry.leases += 1
+        try:
+            try:
+                await asyncio.wait_for(entry.lock.acquire(), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise LeaseTimeout(f"Conversation {thread_id!r} is busy") from None
+            try:
+                yield entry.agency
+            finally:
+                entry.lock.release()
+        finally:
+            entry.leases -= 1
+            # Agencies that were busy at insert time may have left the bucket over capacity
+            self._evict(*self._bucket(key))
+
+    def discard(self, project: Optional[str] = None, thread_id: Optional[str] = None) -> bool:
+        """Drop a conversation's agency (e.g. when the client resets the chat)."""
+        key = pool_key(project, thread_id)
+        entries, _ = self._bucket(key)
+        entry = entries.get(key)
+        if entry is None or entry.leases:
+            return False
+        del entries[key]
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        every = [*self._entries.values(), *self._anonymous.values()]
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "anonymous": len(self._anonymous),
+            "anon_max_size": self.anon_max_size,
+            "busy": sum(1 for e in every if e.leases),
+            "created": self.created,
+            "evicted": self.evicted,
+        }
+
+    def _bucket(self, key: PoolKey) -> Tuple["OrderedDict[PoolKey, _PoolEntry]", int]:
+        if key[1].startswith(ANON_THREAD_PREFIX):
+            return self._anonymous, self.anon_max_size
+        return self._entries, self.max_size
+
+    def _entry(self, key: PoolKey) -> _PoolEntry:
+        entries, max_size = self._bucket(key)
+        entry = entries.get(key)
+        if entry is not None:
+            entries.move_to_end(key)
+            return entry
+
+        entry = _PoolEntry(agency=self.factory())
+        self.created += 1
+        entries[key] = entry
+        self._evict(entries, max_size, keep=key)
+        logger.info("Agency created for project=%s thread=%s (pool size %d)", key[0], key[1], len(self))
+        return entry
+
+    def _evict(
+        self, entries: "OrderedDict[PoolKey, _PoolEntry]", max_size: int, keep: Optional[PoolKey] = None
+    ) -> None:
+        """Drop least recently used idle agencies until the bucket fits max_size."""
+        overflow = len(entries) - max_size
+        if overflow <= 0:
+            return
+        for key in list(entries):
+            if overflow <= 0:
+                break
+            if key == keep or entries[key].leases:
+                continue
+            del entries[key]
+            self.evicted += 1
+            overflow -= 1
+        if overflow > 0:
+            logger.warning("Agency pool over capacity: %d agencies busy", len(entries))
+
+
+agency_pool = AgencyPool()
@@ -0,0 +1,98 @@
+"""
+Bounded cache of directory listings for the file browser.
+
+- Entries are keyed by directory path and validated against the
+  directory's mtime, so a listing is re-read only after entries were
+  added, removed or renamed; one stat replaces a full scandir
+- The cache is an LRU bounded by entry count (one entry per directory)
+- Hit/miss/eviction counters are exposed via ``stats()`` for sizing
+
+There is deliberately no filesystem watcher: a recursive watch of the
+browsed tree would add inotify watches for every excluded directory
+(node_modules/, .git/, build output) and compete with the status watcher
+for ``fs.inotify.max_user_watches``, only to duplicate the mtime check.
+
+Configuration (environment):
+- FILE_TREE_CACHE_MAX_ENTRIES: maximum cached directories (default: 4096)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+MAX_ENTRIES = int(os.environ.get("FILE_TREE_CACHE_MAX_ENTRIES", "4096"))
+
+T = TypeVar("T")
+
+
+def _dir_stamp(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class DirListingCache:
+    """LRU of per-directory listings keyed by (path, mtime)."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, path: Path, loader: Callable[[], T]) -> T:
+        """Return the cached listing for ``path`` or load and cache it."""
+        key = os.fspath(path)
+        stamp = _dir_stamp(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and stamp is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = loader()
+        if stamp is None or self.max_entries <= 0:
+            return value
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, paths: Optional[Iterable[Path]] = None) -> None:
+        """Drop listings for the given directories (everything if None)."""
+        with self._lock:
+            if paths is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                return
+            for path in paths:
+                if self._entries.pop(os.fspath(path), None) is not None:
+                    self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+tree_cache = DirListingCache()
@@ -0,0 +1,105 @@
+"""
+On-disk encoding for JSON documents (Puck/status pages and metadata files).
+
+- Documents are written as compact JSON (no indentation or padding), which
+  is 2-3x smaller than the old ``indent=2`` files and faster to parse
+- Optionally, documents of at least DOC_COMPRESSION_MIN_BYTES are framed
+  with gzip or zstd; readers detect the frame from its magic bytes, so
+  compressed, compact and legacy pretty-printed files all load the same way
+- Writes go to a temp file and are moved into place with os.replace
+
+Configuration (environment):
+- DOC_COMPRESSION: none | gzip | zstd (default: none; zstd needs the
+  optional ``zstandard`` package)
+- DOC_COMPRESSION_MIN_BYTES: smallest document to compress (default: 32768)
+
+``scripts/migrate_page_storage_format.py`` rewrites existing data in bulk.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Union
+
+try:  # optional: zstd framing
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+COMPRESSION = os.environ.get("DOC_COMPRESSION", "none").lower()
+COMPRESSION_MIN_BYTES = int(os.environ.get("DOC_COMPRESSION_MIN_BYTES", "32768"))
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def dumps(data: Any) -> str:
+    """Compact JSON text."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode(data: Any, compression: Optional[str] = None, min_bytes: Optional[int] = None) -> bytes:
+    """Serialize a document for storage, compressing it if configured and large enough."""
+    compression = (compression or COMPRESSION).lower()
+    min_bytes = COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}; expected one of {', '.join(COMPRESSIONS)}")
+    raw = dumps(data).encode("utf-8")
+    if compression == "none" or len(raw) < min_bytes:
+        return raw
+    if compression == "gzip":
+        # mtime=0 keeps output deterministic for identical documents
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+    if zstandard is None:
+        raise RuntimeError("DOC_COMPRESSION=zstd requires the 'zstandard' package")
+    return zstandard.ZstdCompressor(level=3).compress(raw)
+
+
+def decode(raw: Union[bytes, str]) -> Any:
+    """Parse a stored document in any supported encoding."""
+    if isinstance(raw, str):
+        return json.loads(raw)
+    if raw.startswith(GZIP_MAGIC):
+        raw = gzip.decompress(raw)
+    elif raw.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Reading zstd-compressed documents requires the 'zstandard' package")
+        try:
+            raw = zstandard.ZstdDecompressor().decompress(raw)
+        except zstandard.ZstdError as exc:
+            raise ValueError(f"Corrupt zstd document: {exc}") from exc
+    return json.loads(raw)
+
+
+def encoding_of(raw: Union[bytes, str]) -> str:
+    """Classify stored bytes: gzip, zstd, compact or pretty (legacy indented JSON)."""
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    if raw.startswith(GZIP_MAGIC):
+        return "gzip"
+    if raw.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return "pretty" if b"\n" in raw.strip() else "compact"
+
+
+def read_document(path: Path) -> Any:
+    """Load a document from disk (raises FileNotFoundError / ValueError)."""
+    return decode(Path(path).read_bytes())
+
+
+def write_document(
+    path: Path,
+    data: Any,
+    compression: Optional[str] = None,
+    min_bytes: Optional[int] = None,
+) -> None:
+    """Atomically write a document in the configured encoding."""
+    path = Path(path)
+    payload = encode(data, compression=compression, min_bytes=min_bytes)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
@@ -0,0 +1,267 @@
+"""
+Persistent summary index for Puck page files.
+
+Keeps slug -> page key and per-page summaries (id, title, slug, updated_at)
+in a small JSON sidecar next to the pages, so slug lookups, uniqueness
+checks and listings never parse page bodies.
+
+- On first use the sidecar is reconciled against the directory with stat
+  calls only; files whose (mtime_ns, size) changed are re-read. A missing
+  or unreadable sidecar is rebuilt from the page files.
+- Writers call ``put``/``remove`` after touching a page file; the sidecar
+  is rewritten atomically (temp file + os.replace).
+- If another process rewrites the sidecar it is reloaded on next access.
+- Every sidecar write bumps a persisted generation counter; together with
+  a random epoch (new whenever the sidecar is rebuilt) it forms
+  ``version_tag()``, which changes whenever any page changes.
+
+Page keys are file stems (``<key>.json``), matching how the routes name files.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.services import doc_codec
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "_pages.index"
+INDEX_VERSION = 1
+
+Stamp = Tuple[int, int]
+
+
+def _stamp(path: Path) -> Optional[Stamp]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def page_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing metadata for a page payload."""
+    root = data.get("root") if isinstance(data.get("root"), dict) else {}
+    return {
+        "id": data.get("id"),
+        "title": data.get("title") or root.get("title") or "Untitled",
+        "slug": data.get("slug"),
+        "updated_at": data.get("updated_at"),
+    }
+
+
+class PageIndex:
+    """Slug and summary index over a directory of ``*.json`` page files."""
+
+    def __init__(self, pages_dir: Path, index_file: Optional[Path] = None):
+        self.pages_dir = Path(pages_dir)
+        self.index_file = index_file or self.pages_dir / INDEX_FILENAME
+
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._slugs: Dict[str, Set[str]] = {}
+        self._ids: Dict[str, str] = {}
+        self._loaded = False
+        self._index_stamp: Optional[Stamp] = None
+        self.generation = 0
+        self.epoch = uuid.uuid4().hex[:8]
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+    def key_for_slug(self, slug: str) -> Optional[str]:
+        """Return the page key (file stem) for a slug, or None."""
+        with self._lock:
+            self._ensure_loaded()
+            keys = self._slugs.get(slug)
+            return min(keys) if keys else None
+
+    def key_for_id(self, page_id: str) -> Optional[str]:
+        """Return the page key for a page id (usually the id itself), or None."""
+        with self._lock:
+            self._ensure_loaded()
+            if page_id in self._entries:
+                return page_id
+            return self._ids.get(page_id)
+
+    def slug_taken(self, slug: str, exclude_id: Optional[str] = None) -> bool:
+        """True if any page other than ``exclude_id`` uses the slug."""
+        with self._lock:
+            self._ensure_loaded()
+            return any(
+                not exclude_id or self._entries[key]["summary"].get("id") != exclude_id
+                for key in self._slugs.get(slug, ())
+            )
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Return listing metadata for every indexed page."""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(entry["summary"]) for entry in self._entries.values()]
+
+    def version_tag(self) -> str:
+        """Opaque token that changes whenever any indexed page changes."""
+        with self._lock:
+            self._ensure_loaded()
+            return f"{self.epoch}-{self.generation}"
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+    def put(self, key: str, data: Dict[str, Any]) -> None:
+        """Record a page that was just written to ``<key>.json``."""
+        with self._lock:
+            self._ensure_loaded()
+            self._set(key, data, _stamp(self.pages_dir / f"{key}.json"))
+            self._save()
+
+    def remove(self, key: str) -> None:
+        """Forget a page whose file was deleted."""
+        with self._lock:
+            self._ensure_loaded()
+            if self._drop(key):
+                self._save()
+
+    def rebuild(self) -> None:
+        """Discard the sidecar and re-read every page file."""
+        with self._lock:
+            self._entries = {}
+            self._slugs = {}
+            self._ids = {}
+            self._reconcile()
+            self._loaded = True
+            self._save()
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            if _stamp(self.index_file) != self._index_stamp:
+                # Another process rewrote the sidecar
+                self._load_sidecar()
+            return
+        self._loaded = True
+        if not self._load_sidecar():
+            logger.info("Rebuilding page index for %s", self.pages_dir)
+            self._entries = {}
+            self._slugs = {}
+            self._ids = {}
+        if self._reconcile() or self._index_stamp is None:
+            self._save()
+
+    def _load_sidecar(self) -> bool:
+        self._index_stamp = _stamp(self.index_file)
+        if self._index_stamp is None:
+            return False
+        try:
+            raw = json.loads(self.index_file.read_text(encoding="utf-8"))
+            if raw.get("version") != INDEX_VERSION:
+                return False
+            entries = {
+                key: {"summary": entry["summary"], "stamp": tuple(entry["stamp"]) if entry.get("stamp") else None}
+                for key, entry in raw["pages"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable page index %s: %s", self.index_file, exc)
+            self._index_stamp = None
+            return False
+        self._entries = entries
+        self._slugs = {}
+        self._ids = {}
+        self.generation = int(raw.get("generation", 0))
+        self.epoch = str(raw.get("epoch") or self.epoch)
+        for key, entry in entries.items():
+            self._link(key, entry["summary"])
+        return True
+
+    def _reconcile(self) -> bool:
+        """Stat every page file; re-read only new or changed ones."""
+        seen: Set[str] = set()
+        changed = False
+        try:
+            with os.scandir(self.pages_dir) as it:
+                files = [e for e in it if e.name.endswith(".json") and e.is_file()]
+        except FileNotFoundError:
+            files = []
+        for entry in files:
+            key = entry.name[: -len(".json")]
+            seen.add(key)
+            st = entry.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+            current = self._entries.get(key)
+            if current is not None and current["stamp"] == stamp:
+                continue
+            try:
+                data = doc_codec.read_document(Path(entry.path))
+            except (OSError, ValueError, RuntimeError) as exc:
+                logger.warning("Skipping unreadable page %s: %s", entry.path, exc)
+                changed = self._drop(key) or changed
+                continue
+            if isinstance(data, dict):
+                self._set(key, data, stamp)
+                changed = True
+        for key in set(self._entries) - seen:
+            changed = self._drop(key) or changed
+        return changed
+
+    def _set(self, key: str, data: Dict[str, Any], stamp: Optional[Stamp]) -> None:
+        self._drop(key)
+        summary = page_summary(data)
+        self._entries[key] = {"summary": summary, "stamp": stamp}
+        self._link(key, summary)
+
+    def _drop(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        slug = entry["summary"].get("slug")
+        keys = self._slugs.get(slug)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._slugs[slug]
+        page_id = entry["summary"].get("id")
+        if page_id and self._ids.get(page_id) == key:
+            del self._ids[page_id]
+        return True
+
+    def _link(self, key: str, summary: Dict[str, Any]) -> None:
+        if summary.get("slug"):
+            self._slugs.setdefault(summary["slug"], set()).add(key)
+        if summary.get("id"):
+            self._ids[summary["id"]] = key
+
+    def _save(self) -> None:
+        self.generation += 1
+        payload = {
+            "version": INDEX_VERSION,
+            "epoch": self.epoch,
+            "generation": self.generation,
+            "pages": {
+                key: {"summary": entry["summary"], "stamp": list(entry["stamp"]) if entry["stamp"] else None}
+                for key, entry in self._entries.items()
+            },
+        }
+        try:
+            self.pages_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_file.with_name(self.index_file.name + ".tmp")
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.index_file)
+        except OSError as exc:
+            logger.warning("Failed to persist page index %s: %s", self.index_file, exc)
+            self._index_stamp = None
+            return
+        self._index_stamp = _stamp(self.index_file)
@@ -0,0 +1,225 @@
+"""
+Partial updates for page documents.
+
+Two patch formats are supported:
+- JSON Patch (RFC 6902): a list of add/remove/replace/move/copy/test
+  operations addressed by JSON Pointers, e.g. ``/content/12/props/text``
+- JSON Merge Patch (RFC 7386): a partial document; ``null`` removes a key.
+  As an extension, ``content`` may be an object keyed by content item id
+  (``{"<id>": {...}}`` merges into that item, ``null`` deletes it, unknown
+  ids are appended), so clients can send only the blocks they changed.
+
+Patches never mutate their input. Only the containers along patched paths
+are copied; untouched content items are shared with the original page.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, List, Set, Union
+
+JSON_PATCH = "application/json-patch+json"
+MERGE_PATCH = "application/merge-patch+json"
+
+Container = Union[Dict[str, Any], List[Any]]
+
+
+class PatchError(ValueError):
+    """The patch is malformed or cannot be applied to the document."""
+
+
+class PatchTestFailed(PatchError):
+    """A JSON Patch ``test`` operation did not match."""
+
+
+# ---------------------------------------------------------------------- #
+# JSON Patch (RFC 6902)
+# ---------------------------------------------------------------------- #
+def parse_pointer(pointer: str) -> List[str]:
+    """Split a JSON Pointer into unescaped reference tokens."""
+    if pointer == "":
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise PatchError(f"Invalid JSON Pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: List[Any], token: str, allow_end: bool = False) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _child(node: Any, token: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise PatchError(f"Path not found: {token!r}")
+        return node[token]
+    if isinstance(node, list):
+        return node[_index(node, token)]
+    raise PatchError(f"Cannot traverse into {type(node).__name__}")
+
+
+def resolve(doc: Any, pointer: str) -> Any:
+    """Return the value at a JSON Pointer."""
+    node = doc
+    for token in parse_pointer(pointer):
+        node = _child(node, token)
+    return node
+
+
+class _Patcher:
+    """Applies operations with copy-on-write along each patched path."""
+
+    def __init__(self, doc: Any):
+        self.root = doc
+        self._owned: Set[int] = set()
+
+    def _own(self, container: Container) -> Container:
+        if id(container) in self._owned:
+            return container
+        owned = list(container) if isinstance(container, list) else dict(container)
+        self._owned.add(id(owned))
+        return owned
+
+    def _parent(self, tokens: List[str]) -> Container:
+        """Copy the containers leading to ``tokens`` and return the last one."""
+        if not isinstance(self.root, (dict, list)):
+            raise PatchError("Document root is not a container")
+        self.root = node = self._own(self.root)
+        for token in tokens[:-1]:
+            child = _child(node, token)
+            if not isinstance(child, (dict, list)):
+                raise PatchError(f"Cannot traverse into {type(child).__name__}")
+            child = self._own(child)
+            node[_index(node, token) if isinstance(node, list) else token] = child
+            node = child
+        return node
+
+    def add(self, tokens: List[str], value: Any) -> None:
+        if not tokens:
+            self.root = value
+            return
+        parent, token = self._parent(tokens), tokens[-1]
+        if isinstance(parent, list):
+            parent.insert(_index(parent, token, allow_end=True), value)
+        else:
+            parent[token] = value
+
+    def remove(self, tokens: List[str]) -> Any:
+        if not tokens:
+            raise PatchError("Cannot remove the document root")
+        parent, token = self._parent(tokens), tokens[-1]
+        if isinstance(parent, list):
+            return parent.pop(_index(parent, token))
+        if token not in parent:
+            raise PatchError(f"Path not found: {token!r}")
+        return parent.pop(token)
+
+    def replace(self, tokens: List[str], value: Any) -> None:
+        if not tokens:
+            self.root = value
+            return
+        parent, token = self._parent(tokens), tokens[-1]
+        if isinstance(parent, list):
+            parent[_index(parent, token)] = value
+        else:
+            if token not in parent:
+                raise PatchError(f"Path not found: {token!r}")
+            parent[token] = value
+
+    def apply(self, operation: Dict[str, Any]) -> None:
+        if not isinstance(operation, dict) or "op" not in operation or "path" not in operation:
+            raise PatchError("Each operation needs 'op' and 'path'")
+        op, path = operation["op"], operation["path"]
+        tokens = parse_pointer(path)
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"'{op}' operation needs a 'value'")
+
+        if op == "add":
+            self.add(tokens, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            self.remove(tokens)
+        elif op == "replace":
+            self.replace(tokens, copy.deepcopy(operation["value"]))
+        elif op in ("move", "copy"):
+            source = operation.get("from")
+            if source is None:
+                raise PatchError(f"'{op}' operation needs 'from'")
+            if op == "move":
+                if path != source and path.startswith(source + "/"):
+                    raise PatchError("Cannot move a value into one of its children")
+                self.add(tokens, self.remove(parse_pointer(source)))
+            else:
+                self.add(tokens, copy.deepcopy(resolve(self.root, source)))
+        elif op == "test":
+            if resolve(self.root, path) != operation["value"]:
+                raise PatchTestFailed(f"Test failed at {path!r}")
+        else:
+            raise PatchError(f"Unknown operation: {op!r}")
+
+
+def apply_json_patch(doc: Any, operations: List[Dict[str, Any]]) -> Any:
+    """Apply an RFC 6902 patch atomically; returns the new document."""
+    if not isinstance(operations, list):
+        raise PatchError("JSON Patch must be an array of operations")
+    patcher = _Patcher(doc)
+    for operation in operations:
+        patcher.apply(operation)
+    return patcher.root
+
+
+def tests_pointer(operations: List[Dict[str, Any]], pointer: str) -> bool:
+    """True if the patch contains a ``test`` operation on ``pointer``."""
+    return any(isinstance(op, dict) and op.get("op") == "test" and op.get("path") == pointer for op in operations)
+
+
+# ---------------------------------------------------------------------- #
+# JSON Merge Patch (RFC 7386)
+# ---------------------------------------------------------------------- #
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7386 merge patch; untouched subtrees are shared."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def _merge_content(items: List[Any], changes: Dict[str, Any]) -> List[Any]:
+    positions = {item.get("id"): i for i, item in enumerate(items) if isinstance(item, dict)}
+    result = list(items)
+    removed: Set[int] = set()
+    for item_id, change in changes.items():
+        position = positions.get(item_id)
+        if change is None:
+            if position is not None:
+                removed.add(position)
+        elif position is None:
+            result.append({**apply_merge_patch({}, change), "id": item_id})
+        else:
+            result[position] = apply_merge_patch(items[position], change)
+    return [item for i, item in enumerate(result) if i not in removed]
+
+
+def apply_page_merge_patch(page: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge patch with per-item ``content`` updates keyed by item id."""
+    if not isinstance(patch, dict):
+        raise PatchError("Merge patch must be a JSON object")
+    content = patch.get("content")
+    if not isinstance(content, dict):
+        return apply_merge_patch(page, patch)
+    merged = apply_merge_patch(page, {k: v for k, v in patch.items() if k != "content"})
+    existing = page.get("content") if isinstance(page.get("content"), list) else []
+    merged["content"] = _merge_content(existing, content)
+    return merged
+
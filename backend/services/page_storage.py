@@ -0,0 +1,470 @@
+"""
+Pluggable storage for Puck/status page documents.
+
+Both ``puck_routes`` and ``status_page_store`` persist pages through the
+``PageStorage`` interface. Pages are dicts keyed by ``id``; ``slug`` is
+indexed for lookups and uniqueness checks.
+
+Engines:
+- ``file``: one JSON document per page in data/puck_pages, with the
+  slug/summary sidecar index from ``page_index``
+- ``sqlite``: a single embedded database in WAL mode with indexed slug and
+  updated_at columns and transactional upserts; on first use it imports any
+  pages already stored as files
+
+Both engines encode pages with ``doc_codec`` (compact JSON, optionally
+gzip/zstd for large pages) and read any earlier encoding transparently.
+
+Every page carries an integer ``version``. ``update`` does a locked
+read-modify-write that checks the caller's expected version and bumps it,
+giving patch/PUT clients optimistic concurrency control.
+
+Listings support keyset (cursor) pagination, sorting by updated_at or
+title, and prefix search on slug/title via ``list_page``. ``version_tag``
+changes whenever any page changes and backs the listing ETags.
+
+Configuration (environment):
+- PAGE_STORAGE: file | sqlite (default: file)
+- PAGE_STORAGE_SQLITE_PATH: database path (default: data/puck_pages.sqlite3)
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.services import doc_codec
+from backend.services.page_index import PageIndex, page_summary
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+PAGES_DIR = BASE_DIR / "data" / "puck_pages"
+SQLITE_PATH = Path(os.environ.get("PAGE_STORAGE_SQLITE_PATH", str(BASE_DIR / "data" / "puck_pages.sqlite3")))
+PAGE_STORAGE = os.environ.get("PAGE_STORAGE", "file").lower()
+
+SORT_FIELDS = ("updated_at", "title")
+DEFAULT_SORT = "-updated_at"
+MAX_PAGE_LIMIT = 500
+
+# (sort value, page id) of the last item on a page
+CursorKey = Tuple[str, str]
+
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    """Split "-updated_at" into ("updated_at", descending=True); raises ValueError."""
+    field = sort.lstrip("-")
+    if field not in SORT_FIELDS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_FIELDS)} (prefix '-' for descending)")
+    return field, sort.startswith("-")
+
+
+def encode_cursor(key: CursorKey) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    """Decode an opaque cursor; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, page_id = json.loads(raw)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    return str(value), str(page_id)
+
+
+class VersionConflict(Exception):
+    """The page changed since the client read it."""
+
+    def __init__(self, page_id: str, expected: int, current: int):
+        super().__init__(f"Page {page_id} is at version {current}, expected {expected}")
+        self.page_id = page_id
+        self.expected = expected
+        self.current = current
+
+
+def page_version(page: Dict[str, Any]) -> int:
+    """Stored version of a page (0 for pages written before versioning)."""
+    try:
+        return int(page.get("version") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in {tag[2:] if tag.startswith("W/") else tag for tag in candidates}
+
+
+class PageStorage(ABC):
+    """Storage interface shared by the page routes; engines set ``_write_lock``."""
+
+    @abstractmethod
+    def get(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """Return a page by id, or None."""
+
+    @abstractmethod
+    def get_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Return a page by slug, or None."""
+
+    @abstractmethod
+    def slug_taken(self, slug: str, exclude_id: Optional[str] = None) -> bool:
+        """True if a page other than ``exclude_id`` uses the slug."""
+
+    @abstractmethod
+    def save(self, page: Dict[str, Any]) -> None:
+        """Insert or replace a page; ``page["id"]`` is required."""
+
+    @abstractmethod
+    def delete(self, page_id: str) -> bool:
+        """Delete a page by id; returns False if it did not exist."""
+
+    @abstractmethod
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Listing metadata (id, title, slug, updated_at) for every page."""
+
+    def update(
+        self,
+        page_id: str,
+        changes: Callable[[Dict[str, Any]], Dict[str, Any]],
+        expected_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Read-modify-write one page and bump its version.
+
+        ``changes`` receives the stored page and returns the new document (it
+        may raise to abort). Raises KeyError if the page does not exist and
+        VersionConflict if ``expected_version`` is stale. The lock is
+        per-process; run a single writer process per storage.
+        """
+        with self._write_lock:
+            current = self.get(page_id)
+            if current is None:
+                raise KeyError(page_id)
+            version = page_version(current)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(page_id, expected_version, version)
+            page = changes(current)
+            page["id"] = current["id"]
+            page["version"] = version + 1
+            self.save(page)
+            return page
+
+    def replace_slug(self, slug: str, page: Dict[str, Any]) -> None:
+        """Save ``page`` as the one page using ``slug``, replacing the page stored there."""
+        with self._write_lock:
+            existing = self.get_by_slug(slug)
+            if existing and existing.get("id") and existing["id"] != page["id"]:
+                self.delete(existing["id"])
+            self.save(page)
+
+    @abstractmethod
+    def version_tag(self) -> str:
+        """Opaque token that changes whenever any page is saved or deleted."""
+
+    def etag(self) -> str:
+        """Strong ETag for page listings."""
+        return f'"{self.version_tag()}"'
+
+    def list_page(
+        self,
+        q: Optional[str] = None,
+        sort: str = DEFAULT_SORT,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        with_slug: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Return one page of summaries and the cursor for the next one.
+
+        ``q`` is a case-insensitive prefix match on slug or title;
+        ``with_slug`` skips pages without a slug (before the limit applies).
+        Without a limit every matching page is returned. Raises ValueError
+        for an unknown sort field or a malformed cursor.
+        """
+        field, descending = parse_sort(sort)
+        after = decode_cursor(cursor) if cursor else None
+        items = self.summaries()
+        if with_slug:
+            items = [s for s in items if s.get("slug")]
+        if q:
+            prefix = q.lower()
+            items = [
+                s for s in items
+                if (s.get("slug") or "").lower().startswith(prefix)
+                or (s.get("title") or "").lower().startswith(prefix)
+            ]
+
+        def key(summary: Dict[str, Any]) -> CursorKey:
+            value = summary.get(field) or ""
+            return (value.lower() if field == "title" else value, summary.get("id") or "")
+
+        keyed = sorted(((key(s), s) for s in items), key=lambda pair: pair[0], reverse=descending)
+        if after is not None:
+            keyed = [(k, s) for k, s in keyed if (k < after if descending else k > after)]
+        if limit is None or len(keyed) <= limit:
+            return [s for _, s in keyed], None
+        page = keyed[:limit]
+        return [s for _, s in page], encode_cursor(page[-1][0])
+
+
+class FilePageStorage(PageStorage):
+    """One ``<key>.json`` file per page, indexed by a sidecar."""
+
+    def __init__(self, pages_dir: Path = PAGES_DIR):
+        self.pages_dir = Path(pages_dir)
+        self.pages_dir.mkdir(parents=True, exist_ok=True)
+        self.index = PageIndex(self.pages_dir)
+        self._write_lock = threading.RLock()
+
+    def _path(self, key: str) -> Path:
+        return self.pages_dir / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return doc_codec.read_document(self._path(key))
+        except FileNotFoundError:
+            return None
+
+    def get(self, page_id: str) -> Optional[Dict[str, Any]]:
+        # Pages are normally stored as <id>.json; older status pages use <slug>.json
+        page = self._read(page_id)
+        if page is not None:
+            return page
+        key = self.index.key_for_id(page_id)
+        return self._read(key) if key and key != page_id else None
+
+    def get_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        for attempt in range(2):
+            key = self.index.key_for_slug(slug)
+            if key is None:
+                return None
+            page = self._read(key)
+            if page and page.get("slug") == slug:
+                return page
+            # Index is stale (file changed out-of-band); rebuild once and retry
+            if attempt == 0:
+                self.index.rebuild()
+        return None
+
+    def slug_taken(self, slug: str, exclude_id: Optional[str] = None) -> bool:
+        return self.index.slug_taken(slug, exclude_id=exclude_id)
+
+    def save(self, page: Dict[str, Any]) -> None:
+        key = self.index.key_for_id(page["id"]) or page["id"]
+        doc_codec.write_document(self._path(key), page)
+        self.index.put(key, page)
+
+    def replace_slug(self, slug: str, page: Dict[str, Any]) -> None:
+        with self._write_lock:
+            key = self.index.key_for_slug(slug)
+            legacy = self._read(key) if key else None
+            if legacy is None or legacy.get("id"):
+                super().replace_slug(slug, page)
+                return
+            # Older status pages are <slug>.json without an id; rewrite that file in place
+            doc_codec.write_document(self._path(key), page)
+            self.index.put(key, page)
+
+    def delete(self, page_id: str) -> bool:
+        key = self.index.key_for_id(page_id) or page_id
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            return False
+        self.index.remove(key)
+        return True
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        return self.index.summaries()
+
+    def version_tag(self) -> str:
+        return self.index.version_tag()
+
+
+class SQLitePageStorage(PageStorage):
+    """Pages in an embedded SQLite database (WAL mode)."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pages (
+            id TEXT PRIMARY KEY,
+            slug TEXT,
+            title TEXT,
+            updated_at TEXT,
+            body TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS pages_slug ON pages (slug);
+        CREATE INDEX IF NOT EXISTS pages_updated_at ON pages (updated_at);
+        DROP INDEX IF EXISTS pages_title;
+        CREATE INDEX IF NOT EXISTS pages_title_key ON pages (COALESCE(title, '') COLLATE NOCASE);
+        CREATE TABLE IF NOT EXISTS page_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    BUMP_GENERATION = "UPDATE page_meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'generation'"
+    # NULL titles sort (and page) as "" so the keyset comparison never sees NULL
+    SORT_COLUMNS = {"updated_at": "updated_at", "title": "COALESCE(title, '') COLLATE NOCASE"}
+
+    def __init__(self, path: Path = SQLITE_PATH, import_from: Optional[Path] = PAGES_DIR):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists()
+        self._lock = self._write_lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO page_meta (key, value) VALUES (?, ?)",
+                [("epoch", uuid.uuid4().hex[:8]), ("generation", "0")],
+            )
+        if is_new and import_from is not None and Path(import_from).is_dir():
+            count = self.import_pages(FilePageStorage(import_from))
+            if count:
+                logger.info("✅ Imported %d page(s) from %s into %s", count, import_from, self.path)
+
+    def import_pages(self, source: PageStorage) -> int:
+        """Copy every page from another storage in one transaction."""
+        pages = [source.get(s["id"]) for s in source.summaries() if s.get("id")]
+        pages = [p for p in pages if p is not None]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (id, slug, title, updated_at, body) VALUES (?, ?, ?, ?, ?)",
+                [self._row(page) for page in pages],
+            )
+            self._conn.execute(self.BUMP_GENERATION)
+        return len(pages)
+
+    @staticmethod
+    def _row(page: Dict[str, Any]) -> tuple:
+        summary = page_summary(page)
+        # updated_at is stored as "" rather than NULL so ORDER BY can use its index
+        return (page["id"], summary["slug"], summary["title"], summary["updated_at"] or "", SQLitePageStorage._body(page))
+
+    @staticmethod
+    def _body(page: Dict[str, Any]) -> Any:
+        """Compact JSON text, or a BLOB when doc_codec compresses the page."""
+        body = doc_codec.encode(page)
+        return body.decode("utf-8") if doc_codec.encoding_of(body) == "compact" else body
+
+    def _one(self, sql: str, params: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return doc_codec.decode(row[0]) if row else None
+
+    def get(self, page_id: str) -> Optional[Dict[str, Any]]:
+        return self._one("SELECT body FROM pages WHERE id = ?", (page_id,))
+
+    def get_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        return self._one("SELECT body FROM pages WHERE slug = ? ORDER BY id LIMIT 1", (slug,))
+
+    def slug_taken(self, slug: str, exclude_id: Optional[str] = None) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM pages WHERE slug = ? AND id IS NOT ? LIMIT 1", (slug, exclude_id)
+            ).fetchone()
+        return row is not None
+
+    def save(self, page: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO pages (id, slug, title, updated_at, body) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    slug = excluded.slug,
+                    title = excluded.title,
+                    updated_at = excluded.updated_at,
+                    body = excluded.body
+                """,
+                self._row(page),
+            )
+            self._conn.execute(self.BUMP_GENERATION)
+
+    def delete(self, page_id: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM pages WHERE id = ?", (page_id,))
+            if cursor.rowcount:
+                self._conn.execute(self.BUMP_GENERATION)
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _summary(row: tuple) -> Dict[str, Any]:
+        return {"id": row[0], "title": row[1], "slug": row[2], "updated_at": row[3] or None}
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, title, slug, updated_at FROM pages").fetchall()
+        return [self._summary(r) for r in rows]
+
+    def version_tag(self) -> str:
+        with self._lock:
+            meta = dict(self._conn.execute("SELECT key, value FROM page_meta").fetchall())
+        return f"{meta.get('epoch', '')}-{meta.get('generation', '0')}"
+
+    def list_page(
+        self,
+        q: Optional[str] = None,
+        sort: str = DEFAULT_SORT,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        with_slug: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset pagination in SQL over the indexed sort columns."""
+        field, descending = parse_sort(sort)
+        column = self.SORT_COLUMNS[field]
+        direction = "DESC" if descending else "ASC"
+        where: List[str] = []
+        params: List[Any] = []
+        if with_slug:
+            where.append("slug IS NOT NULL AND slug != ''")
+        if q:
+            pattern = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(slug LIKE ? ESCAPE '\\' OR title LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+        if cursor:
+            where.append(f"({column}, id) {'<' if descending else '>'} (?, ?)")
+            params += list(decode_cursor(cursor))
+        sql = "SELECT id, title, slug, updated_at FROM pages"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {column} {direction}, id {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        if limit is None or len(rows) <= limit:
+            return [self._summary(r) for r in rows], None
+        rows = rows[:limit]
+        last = rows[-1]
+        return [self._summary(r) for r in rows], encode_cursor((last[3] if field == "updated_at" else last[1] or "", last[0]))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_page_storage(engine: str = PAGE_STORAGE) -> PageStorage:
+    """Build the configured storage engine."""
+    if engine == "sqlite":
+        return SQLitePageStorage()
+    if engine != "file":
+        logger.warning("⚠️ Unknown PAGE_STORAGE=%s; using file storage", engine)
+    return FilePageStorage()
+
+
+page_storage = create_page_storage()
@@ -0,0 +1,381 @@
+"""
+In-memory index of projects, sessions and stage artifacts for the status browser.
+
+The index is built once and then maintained incrementally: every stage file is
+remembered together with its (mtime_ns, size) stamp, so a refresh only re-reads
+files whose stamp changed and a listing is served from dictionaries.
+
+Freshness is controlled in two ways:
+- ``invalidate(project, session, stage)`` marks a subtree dirty so the next
+  read re-stats just that part of the tree.
+- ``ttl`` (seconds) bounds how long a project is trusted without any
+  invalidation. ``None`` means "trust until invalidated".
+
+Every change a read discovers is also queued for ``sync()``, so a status
+request that happens to revalidate first does not hide the change from
+delta subscribers. Changes found while a project is first populated are not
+queued (nobody can have seen the state before).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from session_history import SessionHistory
+
+logger = logging.getLogger(__name__)
+
+REQUIRES_INPUT_MARKER = "[REQUIRES INPUT]"
+
+# (project, session, stage_key); session/stage are "" for wider scopes
+ChangeKey = Tuple[str, str, str]
+Stamp = Tuple[int, int]
+
+
+def file_stamp(path: Path) -> Optional[Stamp]:
+    """Return (mtime_ns, size) for a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@dataclass
+class StageEntry:
+    stamp: Optional[Stamp]
+    requires_input_count: int
+    path: Optional[str]
+
+    @property
+    def exists(self) -> bool:
+        return self.stamp is not None
+
+
+@dataclass
+class SessionEntry:
+    session_id: str
+    dir_mtime: float
+    stages: Dict[str, StageEntry] = field(default_factory=dict)
+
+
+@dataclass
+class ProjectEntry:
+    name: str
+    sessions_dir_stamp: Optional[Stamp] = None
+    sessions: Dict[str, SessionEntry] = field(default_factory=dict)
+    checked_at: float = 0.0
+    scanned: bool = False
+
+
+class StatusIndex:
+    """Incrementally maintained project/session/stage index."""
+
+    def __init__(
+        self,
+        root: Path,
+        stages: Dict[str, Tuple[str, str]],
+        history_file: Path,
+        ttl: Optional[float] = 2.0,
+        legacy_history_file: Optional[Path] = None,
+    ):
+        self.root = root
+        self.stages = stages
+        self.history_file = history_file
+        self.ttl = ttl
+        self.history = SessionHistory(history_file, legacy_path=legacy_history_file)
+
+        self._lock = threading.RLock()
+        self._projects: Dict[str, ProjectEntry] = {}
+        self._projects_checked_at = 0.0
+        self._history_checked_at = 0.0
+
+        # Pending invalidations, consumed on the next read
+        self._dirty_projects: Set[str] = set()
+        self._dirty_sessions: Set[Tuple[str, str]] = set()
+        self._dirty_stages: Set[ChangeKey] = set()
+        self._dirty_project_list = False
+        self._dirty_all = True
+
+        # Changes found by any read since the last sync(), in discovery order
+        self._unreported: Dict[ChangeKey, None] = {}
+
+    @property
+    def projects_dir(self) -> Path:
+        return self.root / "projects"
+
+    # ------------------------------------------------------------------ #
+    # Invalidation
+    # ------------------------------------------------------------------ #
+    def invalidate(
+        self,
+        project: Optional[str] = None,
+        session: Optional[str] = None,
+        stage: Optional[str] = None,
+    ) -> None:
+        """Mark part of the tree as stale. No disk access happens here."""
+        with self._lock:
+            if project is None:
+                self._dirty_all = True
+                self._history_checked_at = 0.0
+            elif session is None:
+                # Project added/removed or its sessions/ listing changed
+                self._dirty_project_list = True
+                self._dirty_projects.add(project)
+            elif stage is None:
+                self._dirty_sessions.add((project, session))
+            else:
+                self._dirty_stages.add((project, session, stage))
+
+    def invalidate_history(self) -> None:
+        """Mark the session history file as stale."""
+        with self._lock:
+            self._history_checked_at = 0.0
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+    def list_projects(self) -> List[str]:
+        with self._lock:
+            self._sync_projects()
+            return sorted(self._projects)
+
+    def get_project(self, project: str) -> Optional[ProjectEntry]:
+        """Return the (fresh) index entry for a project, or None if missing."""
+        with self._lock:
+            self._sync_projects()
+            entry = self._projects.get(project)
+            if entry is None:
+                return None
+            self._sync_project(entry)
+            if entry.sessions_dir_stamp is None:
+                return None
+            return entry
+
+    def sessions(self, project: str) -> Optional[List[SessionEntry]]:
+        """Return a sorted copy of a project's session entries, or None if missing."""
+        with self._lock:
+            entry = self.get_project(project)
+            if entry is None:
+                return None
+            return [entry.sessions[k] for k in sorted(entry.sessions)]
+
+    def session_meta(self, project: str, session_id: str, dir_mtime: float) -> Dict[str, Any]:
+        """Resolve display metadata for a session from the session history store."""
+        with self._lock:
+            self._sync_history()
+            record = self.history.get(project, session_id, refresh=False)
+        if record is not None:
+            return {
+                "name": record.get("name", session_id),
+                "created_at": record.get("created_at"),
+                "owner": record.get("owner"),
+            }
+
+        # Fallback: directory timestamp captured during the scan
+        return {"name": session_id, "created_at": dir_mtime, "owner": None}
+
+    # ------------------------------------------------------------------ #
+    # Incremental refresh
+    # ------------------------------------------------------------------ #
+    def refresh(self, project: Optional[str] = None) -> List[ChangeKey]:
+        """
+        Force a stat-based refresh and return changed (project, session, stage) keys.
+
+        Only files whose (mtime_ns, size) stamp changed are re-read.
+        """
+        with self._lock:
+            if project is None:
+                self._dirty_all = True
+                changes = self._sync_projects(force=True)
+                for entry in self._projects.values():
+                    changes.extend(self._sync_project(entry, force=True))
+                return changes
+            self._sync_projects()
+            entry = self._projects.get(project)
+            if entry is None:
+                return []
+            return self._sync_project(entry, force=True)
+
+    def sync(self, projects: Optional[Iterable[str]] = None) -> List[ChangeKey]:
+        """
+        Apply pending invalidations and return the keys whose visible state
+        changed since the previous ``sync()``, including changes other reads
+        picked up in between.
+
+        Unlike ``refresh`` this only touches subtrees that are dirty or expired.
+        """
+        with self._lock:
+            self._sync_projects()
+            names = list(self._projects) if projects is None else projects
+            for name in names:
+                entry = self._projects.get(name)
+                if entry is not None:
+                    self._sync_project(entry)
+            changes = list(self._unreported)
+            self._unreported.clear()
+            return changes
+
+    def session_entry(self, project: str, session: str) -> Optional[SessionEntry]:
+        """Return the cached entry for one session without touching disk."""
+        with self._lock:
+            entry = self._projects.get(project)
+            return entry.sessions.get(session) if entry is not None else None
+
+    def _expired(self, checked_at: float) -> bool:
+        return self.ttl is not None and (time.monotonic() - checked_at) >= self.ttl
+
+    def _sync_history(self) -> None:
+        if self._history_checked_at and not self._expired(self._history_checked_at):
+            return
+        self._history_checked_at = time.monotonic()
+        try:
+            self.history.refresh()
+        except Exception as exc:
+            logger.warning("Failed to read session history: %s", exc)
+
+    def _note(self, changes: Iterable[ChangeKey]) -> None:
+        for key in changes:
+            self._unreported[key] = None
+
+    def _sync_projects(self, force: bool = False) -> List[ChangeKey]:
+        everything = force or self._dirty_all
+        if not (everything or self._dirty_project_list or self._expired(self._projects_checked_at)):
+            return []
+        self._dirty_all = False
+        self._dirty_project_list = False
+
+        listed = bool(self._projects_checked_at)
+        self._projects_checked_at = time.monotonic()
+
+        names: Set[str] = set()
+        try:
+            with os.scandir(self.projects_dir) as it:
+                names = {e.name for e in it if e.is_dir()}
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning("Failed to list projects: %s", exc)
+
+        changes: List[ChangeKey] = []
+        for removed in set(self._projects) - names:
+            del self._projects[removed]
+            changes.append((removed, "", ""))
+        for name in names:
+            if name not in self._projects:
+                self._projects[name] = ProjectEntry(name=name)
+                changes.append((name, "", ""))
+            elif everything:
+                # Force a rescan of this project on next access
+                self._projects[name].checked_at = 0.0
+        if listed:
+            self._note(changes)
+        return changes
+
+    def _sync_project(self, entry: ProjectEntry, force: bool = False) -> List[ChangeKey]:
+        populated = entry.scanned
+        changes = self._update_project(entry, force)
+        if populated:
+            self._note(changes)
+        return changes
+
+    def _update_project(self, entry: ProjectEntry, force: bool) -> List[ChangeKey]:
+        name = entry.name
+        changes: List[ChangeKey] = []
+
+        stale = not entry.checked_at or self._expired(entry.checked_at)
+        if force or stale or name in self._dirty_projects:
+            self._dirty_projects.discard(name)
+            entry.checked_at = time.monotonic()
+            changes.extend(self._scan_sessions(entry))
+            # A full project scan supersedes narrower invalidations
+            self._dirty_sessions = {k for k in self._dirty_sessions if k[0] != name}
+            self._dirty_stages = {k for k in self._dirty_stages if k[0] != name}
+            return changes
+
+        for key in [k for k in self._dirty_sessions if k[0] == name]:
+            self._dirty_sessions.discard(key)
+            session = entry.sessions.get(key[1])
+            if session is None:
+                # Unknown session: the listing itself is stale
+                changes.extend(self._scan_sessions(entry))
+                continue
+            changes.extend(self._scan_stages(name, session))
+
+        for key in [k for k in self._dirty_stages if k[0] == name]:
+            self._dirty_stages.discard(key)
+            session = entry.sessions.get(key[1])
+            if session is None:
+                changes.extend(self._scan_sessions(entry))
+            elif key[2] in self.stages:
+                if self._scan_stage(name, session, key[2]):
+                    changes.append(key)
+        return changes
+
+    def _scan_sessions(self, entry: ProjectEntry) -> List[ChangeKey]:
+        sessions_dir = self.projects_dir / entry.name / "sessions"
+        changes: List[ChangeKey] = []
+        entry.sessions_dir_stamp = file_stamp(sessions_dir)
+        entry.scanned = True
+
+        found: Dict[str, float] = {}
+        if entry.sessions_dir_stamp is not None:
+            try:
+                with os.scandir(sessions_dir) as it:
+                    for e in it:
+                        if e.is_dir():
+                            found[e.name] = e.stat().st_mtime
+            except OSError as exc:
+                logger.warning("Failed to list sessions for %s: %s", entry.name, exc)
+
+        for removed in set(entry.sessions) - set(found):
+            del entry.sessions[removed]
+            changes.append((entry.name, removed, ""))
+
+        for session_id, dir_mtime in found.items():
+            session = entry.sessions.get(session_id)
+            if session is None:
+                # New session: reported once as a whole rather than per stage
+                session = SessionEntry(session_id=session_id, dir_mtime=dir_mtime)
+                entry.sessions[session_id] = session
+                self._scan_stages(entry.name, session)
+                changes.append((entry.name, session_id, ""))
+                continue
+            session.dir_mtime = dir_mtime
+            changes.extend(self._scan_stages(entry.name, session))
+        return changes
+
+    def _scan_stages(self, project: str, session: SessionEntry) -> List[ChangeKey]:
+        return [
+            (project, session.session_id, stage_key)
+            for stage_key in self.stages
+            if self._scan_stage(project, session, stage_key)
+        ]
+
+    def _scan_stage(self, project: str, session: SessionEntry, stage_key: str) -> bool:
+        """Re-stat one stage file; re-read it only if its stamp changed."""
+        stage_dir, filename = self.stages[stage_key]
+        path = self.projects_dir / project / "sessions" / session.session_id / stage_dir / filename
+        stamp = file_stamp(path)
+        previous = session.stages.get(stage_key)
+        if previous is not None and previous.stamp == stamp:
+            return False
+
+        count = 0
+        if stamp is not None:
+            try:
+                count = path.read_text(encoding="utf-8").count(REQUIRES_INPUT_MARKER)
+            except Exception as exc:
+                logger.warning("Failed to read %s: %s", path, exc)
+        session.stages[stage_key] = StageEntry(
+            stamp=stamp,
+            requires_input_count=count,
+            path=str(path) if stamp is not None else None,
+        )
+        return previous is None or previous.exists != (stamp is not None) or previous.requires_input_count != count
@@ -1,11 +1,8 @@
-import json
 import uuid
 from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-BASE_DIR = Path(__file__).resolve().parents[2]
-DATA_ROOT = BASE_DIR / "data" / "puck_pages"
+from backend.services.page_storage import DEFAULT_SORT, page_storage, page_version
 
 
 @dataclass
@@ -43,49 +40,38 @@ class PageData:
         return {**base, **self.extras}
 
 
-def _ensure_dir() -> None:
-    DATA_ROOT.mkdir(parents=True, exist_ok=True)
+def list_pages(
+    q: Optional[str] = None,
+    sort: str = DEFAULT_SORT,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Return one page of the lightweight listing and the cursor for the next."""
+    # Slugless pages are filtered in the query, so every page holds up to ``limit`` items
+    summaries, next_cursor = page_storage.list_page(q=q, sort=sort, cursor=cursor, limit=limit, with_slug=True)
+    pages = [
+        {"slug": summary["slug"], "title": summary["title"] or summary["slug"], "id": summary["id"]}
+        for summary in summaries
+    ]
+    return pages, next_cursor
 
 
-def _file_path(slug: str) -> Path:
-    return DATA_ROOT / f"{slug}.json"
-
-
-def list_pages() -> List[Dict]:
-    """Return a lightweight listing of stored pages."""
-    _ensure_dir()
-    pages: List[Dict] = []
-    for file in DATA_ROOT.glob("*.json"):
-        try:
-            data = json.loads(file.read_text(encoding="utf-8"))
-            pages.append(
-                {
-                    "slug": data.get("slug") or file.stem,
-                    "title": data.get("title") or file.stem,
-                    "id": data.get("id"),
-                }
-            )
-        except Exception:
-            # Skip unreadable entries but continue scanning
-            continue
-    return pages
+def etag() -> str:
+    """ETag for the listing; changes whenever any page is written."""
+    return page_storage.etag()
 
 
 def find_by_slug(slug: str) -> Optional[PageData]:
-    _ensure_dir()
-    path = _file_path(slug)
-    if not path.exists():
-        return None
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return PageData.from_dict(data)
+    data = page_storage.get_by_slug(slug)
+    return PageData.from_dict(data) if data else None
 
 
 def create(page: PageData) -> PageData:
-    """Create a page with a fixed slug. Overwrites if file already exists."""
-    _ensure_dir()
-    page.id = page.id or str(uuid.uuid4())
-    path = _file_path(page.slug)
-    path.write_text(json.dumps(page.to_dict(), indent=2), encoding="utf-8")
+    """Create a page with a fixed slug. Overwrites any page that already uses the slug."""
+    existing = page_storage.get_by_slug(page.slug)
+    page.id = page.id or (existing or {}).get("id") or str(uuid.uuid4())
+    page.extras["version"] = page_version(existing) + 1 if existing else 1
+    page_storage.replace_slug(page.slug, page.to_dict())
     return page
 
 
@@ -97,7 +83,12 @@ def update_by_slug(slug: str, page: PageData) -> PageData:
 
     page.slug = existing.slug
     page.id = existing.id or page.id or str(uuid.uuid4())
-
-    path = _file_path(existing.slug)
-    path.write_text(json.dumps(page.to_dict(), indent=2), encoding="utf-8")
+    if not existing.id:
+        page_storage.replace_slug(existing.slug, page.to_dict())
+        return page
+    try:
+        stored = page_storage.update(page.id, lambda current: page.to_dict())
+    except KeyError:
+        raise FileNotFoundError(slug)
+    page.extras["version"] = stored["version"]
     return page
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
-import json
 import logging
-from dataclasses import dataclass
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from backend.services.status_index import ChangeKey, SessionEntry, StageEntry, StatusIndex
+from backend.services.status_watcher import StatusWatcher
 
 logger = logging.getLogger(__name__)
 
 ROOT = Path(__file__).resolve().parent.parent.parent  # repo root
-HISTORY_FILE = ROOT / ".idse_sessions_history.json"
+HISTORY_FILE = ROOT / ".idse_sessions_history.jsonl"
+LEGACY_HISTORY_FILE = ROOT / ".idse_sessions_history.json"
+
+# Seconds a cached listing is trusted before a stat-only revalidation
+STATUS_INDEX_TTL = float(os.environ.get("STATUS_INDEX_TTL", "2.0"))
 
 STAGES = {
     "intent": ("intents", "intent.md"),
@@ -22,6 +30,10 @@ STAGES = {
 }
 
 
+# Receives (project_id, delta events) whenever watched status changes
+StatusListener = Callable[[str, List[Dict[str, Any]]], None]
+
+
 @dataclass
 class StageStatus:
     exists: bool
@@ -55,100 +67,152 @@ class ProjectSessionsResponse:
 
 
 class StatusService:
-    def __init__(self):
-        self.root = ROOT
+    def __init__(self, root: Path = ROOT, ttl: Optional[float] = STATUS_INDEX_TTL):
+        self.root = root
+        self.index = StatusIndex(
+            root=root,
+            stages=STAGES,
+            history_file=root / HISTORY_FILE.name,
+            ttl=ttl,
+            legacy_history_file=root / LEGACY_HISTORY_FILE.name,
+        )
+        self.ttl = ttl
+        self.watcher = StatusWatcher(
+            root=root,
+            stages=STAGES,
+            history_file=self.index.history_file,
+            on_changes=self.apply_changes,
+        )
+        self._listeners: List[StatusListener] = []
+        self._watched_projects: Counter = Counter()
+
+    async def start_watching(self) -> Optional[str]:
+        """Start the filesystem watcher; while it runs the index trusts its cache."""
+        backend = await self.watcher.start()
+        if backend:
+            self.index.ttl = None
+            self.index.invalidate()
+        return backend
+
+    async def stop_watching(self) -> None:
+        await self.watcher.stop()
+        self.index.ttl = self.ttl
+
+    def apply_changes(self, keys: Iterable[ChangeKey], history_changed: bool = False) -> None:
+        """Push changed (project, session, stage) keys into the index and notify listeners (watcher thread)."""
+        if history_changed:
+            self.index.invalidate_history()
+        for project, session, stage in keys:
+            self.index.invalidate(project or None, session or None, stage or None)
+        if self._listeners and self._watched_projects:
+            self.publish_deltas()
 
     def list_projects(self) -> List[str]:
-        # Use canonical projects-root structure
-        projects_dir = self.root / "projects"
-        if not projects_dir.exists():
-            return []
-        return sorted([p.name for p in projects_dir.iterdir() if p.is_dir()])
-
-    def _load_history(self) -> Dict[str, Dict[str, str]]:
-        if not HISTORY_FILE.exists():
-            return {}
-        try:
-            return json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
-        except Exception as exc:
-            logger.warning("Failed to read session history: %s", exc)
-            return {}
-
-    def _get_meta_for_session(self, project: str, session_id: str) -> Dict[str, Optional[str]]:
-        history = self._load_history()
-        project_entry = history.get(project, {})
-
-        # Check if the project entry itself matches this session (old format)
-        if project_entry.get("session_id") == session_id:
-            return {
-                "name": project_entry.get("name"),
-                "created_at": project_entry.get("created_at"),
-                "owner": project_entry.get("owner"),
-            }
-
-        # Check if session is nested inside project entry (new format)
-        if session_id in project_entry:
-            session_meta = project_entry[session_id]
-            return {
-                "name": session_meta.get("name", session_id),
-                "created_at": session_meta.get("created_at"),
-                "owner": session_meta.get("owner"),
-            }
-
-        # Fallback: check directory timestamps as last resort
-        session_dir = self.root / "projects" / project / "sessions" / session_id
-        if session_dir.exists():
-            created_at = session_dir.stat().st_mtime
-            return {
-                "name": session_id,
-                "created_at": created_at,
-                "owner": None,
-            }
-
-        return {"name": session_id, "created_at": None, "owner": None}
-
-    def count_requires_input(self, file_path: Path) -> int:
-        if not file_path.exists():
-            return 0
-        try:
-            text = file_path.read_text(encoding="utf-8")
-            return text.count("[REQUIRES INPUT]")
-        except Exception as exc:
-            logger.warning("Failed to read %s: %s", file_path, exc)
-            return 0
+        # Use canonical projects-root structure (served from the index)
+        return self.index.list_projects()
 
     def get_stage_status(self, project: str, session: str, stage_key: str) -> StageStatus:
-        stage_dir, filename = STAGES[stage_key]
-        # Use project-rooted structure
-        path = self.root / "projects" / project / "sessions" / session / stage_dir / filename
-        exists = path.exists()
-        req_count = self.count_requires_input(path) if exists else 0
-        return StageStatus(exists=exists, requires_input_count=req_count, path=str(path) if exists else None)
+        self.index.sessions(project)  # bring the project up to date
+        entry = self.index.session_entry(project, session)
+        return self._stage_status(entry.stages.get(stage_key) if entry else None)
 
     def get_project_sessions(self, project: str) -> ProjectSessionsResponse:
-        # Use project-rooted structure
-        sessions_dir = self.root / "projects" / project / "sessions"
-        if not sessions_dir.exists():
-            raise FileNotFoundError(f"Project '{project}' not found")
+        return ProjectSessionsResponse(project_id=project, sessions=list(self.iter_project_sessions(project)))
+
+    def iter_project_sessions(self, project: str) -> Iterator[SessionStatus]:
+        """
+        Session statuses built one at a time (for streaming responses).
 
-        session_ids = sorted([p.name for p in sessions_dir.iterdir() if p.is_dir()])
-        sessions: List[SessionStatus] = []
-
-        for session_id in session_ids:
-            meta = self._get_meta_for_session(project, session_id)
-            stages = {k: self.get_stage_status(project, session_id, k) for k in STAGES.keys()}
-            sessions.append(
-                SessionStatus(
-                    session_id=session_id,
-                    name=meta.get("name") or session_id,
-                    created_at=meta.get("created_at"),
-                    owner=meta.get("owner"),
-                    stages=stages,
-                    validation=None,  # v1: no cached validation parsing
-                )
-            )
-
-        return ProjectSessionsResponse(project_id=project, sessions=sessions)
+        Raises FileNotFoundError immediately if the project does not exist.
+        """
+        # Served from the incrementally maintained index; only stale entries touch disk
+        entries = self.index.sessions(project)
+        if entries is None:
+            raise FileNotFoundError(f"Project '{project}' not found")
+        return (self._session_status(project, session) for session in entries)
+
+    # ------------------------------------------------------------------ #
+    # Delta subscriptions
+    # ------------------------------------------------------------------ #
+    def add_listener(self, listener: StatusListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: StatusListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def watch(self, project: str) -> None:
+        """Register interest in deltas for a project (reference counted)."""
+        self._watched_projects[project] += 1
+
+    def unwatch(self, project: str) -> None:
+        self._watched_projects[project] -= 1
+        if self._watched_projects[project] <= 0:
+            del self._watched_projects[project]
+
+    def collect_deltas(self, projects: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Sync pending invalidations and describe what changed, grouped by project.
+
+        Changes since the previous collection are consumed for every project,
+        so ``projects`` defaults to all watched projects.
+        """
+        wanted = set(self._watched_projects if projects is None else projects)
+        deltas: Dict[str, List[Dict[str, Any]]] = {}
+        for project, session, stage in self.index.sync(wanted):
+            if project not in wanted:
+                continue
+            deltas.setdefault(project, []).append(self._delta_event(project, session, stage))
+        return deltas
+
+    def publish_deltas(self, projects: Optional[Iterable[str]] = None) -> None:
+        for project, events in self.collect_deltas(projects).items():
+            for listener in list(self._listeners):
+                try:
+                    listener(project, events)
+                except Exception:
+                    logger.exception("Status listener failed")
+
+    def _delta_event(self, project: str, session: str, stage: str) -> Dict[str, Any]:
+        if not session:
+            return {
+                "type": "PROJECT_CHANGED",
+                "project_id": project,
+                "exists": project in self.index.list_projects(),
+            }
+        entry = self.index.session_entry(project, session)
+        if entry is None:
+            return {"type": "SESSION_REMOVED", "project_id": project, "session_id": session}
+        if not stage:
+            return {
+                "type": "SESSION_STATUS",
+                "project_id": project,
+                "session": asdict(self._session_status(project, entry)),
+            }
+        return {
+            "type": "STAGE_STATUS",
+            "project_id": project,
+            "session_id": session,
+            "stage": stage,
+            "status": asdict(self._stage_status(entry.stages[stage])),
+        }
+
+    def _stage_status(self, stage: Optional[StageEntry]) -> StageStatus:
+        if stage is None:
+            return StageStatus(exists=False, requires_input_count=0, path=None)
+        return StageStatus(exists=stage.exists, requires_input_count=stage.requires_input_count, path=stage.path)
+
+    def _session_status(self, project: str, session: SessionEntry) -> SessionStatus:
+        meta = self.index.session_meta(project, session.session_id, session.dir_mtime)
+        return SessionStatus(
+            session_id=session.session_id,
+            name=meta.get("name") or session.session_id,
+            created_at=meta.get("created_at"),
+            owner=meta.get("owner"),
+            stages={k: self._stage_status(session.stages.get(k)) for k in STAGES.keys()},
+            validation=None,  # v1: no cached validation parsing
+        )
 
 
 status_service = StatusService()
@@ -0,0 +1,244 @@
+"""
+Filesystem watcher that keeps the status index in sync with projects/.
+
+Two backends are supported:
+- ``inotify``: native change notifications via ``watchfiles`` (optional dependency)
+- ``poll``: a cheap mtime/size polling loop over the known stage files
+
+Raw events are coalesced over a short window and mapped to
+(project, session, stage) keys before being pushed into the status caches,
+so a burst of writes to one artifact results in a single invalidation.
+
+Configuration (environment):
+- STATUS_WATCHER: auto | inotify | poll | off (default: auto)
+- STATUS_WATCHER_DEBOUNCE_MS: coalescing window (default: 50)
+- STATUS_WATCHER_POLL_SEC: polling interval for the fallback (default: 1.0)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from backend.services.status_index import ChangeKey, Stamp, file_stamp
+
+logger = logging.getLogger(__name__)
+
+try:  # Optional: native inotify/FSEvents backend
+    from watchfiles import awatch
+except ImportError:  # pragma: no cover - exercised when watchfiles is absent
+    awatch = None
+
+WATCHER_MODE = os.environ.get("STATUS_WATCHER", "auto").lower()
+DEBOUNCE_MS = int(os.environ.get("STATUS_WATCHER_DEBOUNCE_MS", "50"))
+POLL_INTERVAL_SEC = float(os.environ.get("STATUS_WATCHER_POLL_SEC", "1.0"))
+
+# Called in a worker thread: syncing the index stats and reads files
+ChangeCallback = Callable[[Set[ChangeKey], bool], None]
+
+
+class StatusWatcher:
+    """Watch projects/ and report changed (project, session, stage) keys."""
+
+    def __init__(
+        self,
+        root: Path,
+        stages: Dict[str, Tuple[str, str]],
+        history_file: Path,
+        on_changes: ChangeCallback,
+        mode: str = WATCHER_MODE,
+        debounce_ms: int = DEBOUNCE_MS,
+        poll_interval: float = POLL_INTERVAL_SEC,
+    ):
+        self.root = root
+        self.projects_dir = root / "projects"
+        self.stages = stages
+        self.history_file = history_file
+        self.on_changes = on_changes
+        self.mode = mode
+        self.debounce_ms = debounce_ms
+        self.poll_interval = poll_interval
+
+        # (stage_dir, filename) -> stage key (plans/ holds two stages)
+        self._stage_lookup: Dict[Tuple[str, str], str] = {
+            location: key for key, location in stages.items()
+        }
+        self._stage_dirs = {stage_dir for stage_dir, _ in stages.values()}
+
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.backend: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    async def start(self) -> Optional[str]:
+        """Start watching; returns the selected backend or None if disabled."""
+        if self.running:
+            return self.backend
+        if self.mode == "off":
+            logger.info("ℹ️ Status watcher disabled via STATUS_WATCHER=off")
+            return None
+
+        use_inotify = self.mode in ("auto", "inotify") and awatch is not None
+        if self.mode == "inotify" and awatch is None:
+            logger.warning("⚠️ STATUS_WATCHER=inotify but watchfiles is not installed; polling instead")
+
+        self.projects_dir.mkdir(parents=True, exist_ok=True)
+        self._stop_event = asyncio.Event()
+        self.backend = "inotify" if use_inotify else "poll"
+        runner = self._run_inotify if use_inotify else self._run_poll
+        self._task = asyncio.create_task(runner(), name="status-watcher")
+        logger.info("✅ Status watcher started (%s)", self.backend)
+        return self.backend
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        if self._stop_event:
+            self._stop_event.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+        logger.info("🛑 Status watcher stopped")
+
+    # ------------------------------------------------------------------ #
+    # Path mapping
+    # ------------------------------------------------------------------ #
+    def classify(self, path: Path) -> Tuple[Optional[ChangeKey], bool]:
+        """
+        Map a changed path to a change key.
+
+        Returns (key, history_changed). Paths that cannot affect status
+        (e.g. implementation/ or metadata/ files) map to (None, False).
+        """
+        path = Path(path)
+        if path == self.history_file:
+            return None, True
+        try:
+            parts = path.relative_to(self.projects_dir).parts
+        except ValueError:
+            return None, False
+
+        if not parts:
+            return ("", "", ""), False
+        if len(parts) <= 2:
+            # projects/<project> or projects/<project>/sessions
+            if len(parts) == 2 and parts[1] != "sessions":
+                return None, False
+            return (parts[0], "", ""), False
+        if parts[1] != "sessions":
+            return None, False
+        project, session = parts[0], parts[2]
+        if len(parts) == 3:
+            return (project, session, ""), False
+        if parts[3] not in self._stage_dirs:
+            return None, False
+        if len(parts) == 4:
+            # Stage directory itself created/removed
+            return (project, session, ""), False
+        stage_key = self._stage_lookup.get((parts[3], parts[4]))
+        if stage_key is None or len(parts) > 5:
+            return None, False
+        return (project, session, stage_key), False
+
+    async def _dispatch(self, paths: Iterable[Path]) -> None:
+        keys: Set[ChangeKey] = set()
+        history_changed = False
+        for path in paths:
+            key, history = self.classify(path)
+            history_changed = history_changed or history
+            if key is not None:
+                keys.add(key)
+        if not keys and not history_changed:
+            return
+        try:
+            await asyncio.to_thread(self.on_changes, keys, history_changed)
+        except Exception:
+            logger.exception("Status watcher callback failed")
+
+    # ------------------------------------------------------------------ #
+    # Backends
+    # ------------------------------------------------------------------ #
+    async def _run_inotify(self) -> None:
+        # The history log may not exist yet and compaction replaces it (new
+        # inode), so its directory is watched, filtered to the log's name
+        history_name = self.history_file.name
+        watchers = [
+            asyncio.ensure_future(self._watch(self.projects_dir)),
+            asyncio.ensure_future(
+                self._watch(
+                    self.history_file.parent,
+                    recursive=False,
+                    watch_filter=lambda _change, path: Path(path).name == history_name,
+                )
+            ),
+        ]
+        try:
+            await asyncio.gather(*watchers)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("⚠️ inotify watcher failed (%s); falling back to polling", exc)
+        else:
+            return
+        finally:
+            for watcher in watchers:
+                watcher.cancel()
+        self.backend = "poll"
+        await self._run_poll()
+
+    async def _watch(self, path: Path, **options) -> None:
+        async for batch in awatch(
+            path,
+            debounce=self.debounce_ms,
+            step=max(1, self.debounce_ms // 2),
+            stop_event=self._stop_event,
+            **options,
+        ):
+            await self._dispatch(Path(changed) for _, changed in batch)
+
+    def _poll_snapshot(self) -> Dict[Path, Optional[Stamp]]:
+        """Stamp every stage file plus the session/project directories."""
+        snapshot: Dict[Path, Optional[Stamp]] = {self.history_file: file_stamp(self.history_file)}
+        try:
+            projects = [e for e in os.scandir(self.projects_dir) if e.is_dir()]
+        except OSError:
+            return snapshot
+        for project in projects:
+            sessions_dir = Path(project.path) / "sessions"
+            snapshot[sessions_dir] = file_stamp(sessions_dir)
+            try:
+                sessions = [e for e in os.scandir(sessions_dir) if e.is_dir()]
+            except OSError:
+                continue
+            for session in sessions:
+                session_dir = Path(session.path)
+                for stage_dir, filename in self.stages.values():
+                    path = session_dir / stage_dir / filename
+                    snapshot[path] = file_stamp(path)
+        return snapshot
+
+    async def _run_poll(self) -> None:
+        previous = await asyncio.to_thread(self._poll_snapshot)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self._poll_snapshot)
+            changed = [
+                path
+                for path in set(previous) | set(current)
+                if previous.get(path) != current.get(path)
+            ]
+            previous = current
+            if changed:
+                await self._dispatch(changed)
@@ -1,85 +1,63 @@
 from __future__ import annotations
 
-import re
 from pathlib import Path
 from typing import Tuple
 
-# Layer 1: Input guardrail (prompt injection detection)
-INJECTION_PATTERNS = [
-    r"ignore\s+.*(previous|all|your).*\s+instructions?",
-    r"show\s+(me\s+)?(your\s+)?(system\s+)?instructions?",
-    r"reveal\s+(your\s+)?(system\s+)?prompt",
-    r"(forget|reset)\s+(all\s+)?(your\s+)?(rules|instructions|guardrails)",
-    r"(respond|answer)\s+without\s+(filters?|safety|guardrails|policies)",
-    r"(drop|disable|turn\s+off)\s+(all\s+)?(safety|guardrails|filters)",
-    r"start\s+(over|fresh)\s+as\s+(a\s+)?blank\s+slate",
-    r"follow\s+only\s+what\s+i\s+say\s+now",
-    r"act\s+without\s+(restrictions|limits|policies)",
-    r"no\s+(safety|filters|guardrails)",
-    r"list\s+everything\s+above",
-    r"repeat\s+(everything|all)\s+above",
-    r"translate\s+(your\s+)?instructions?",
-    r"summarize\s+(your\s+)?instructions?",
-    r"what\s+are\s+your\s+(exact\s+)?instructions",
-    r"tell\s+me\s+your\s+rules",
-    r"output\s+your\s+prompt",
-    r"print\s+(your\s+)?system\s+prompt",
-    r"describe\s+your\s+instructions",
-    r"encode\s+(your\s+)?instructions",
-    r"format\s+everything\s+above",
-    r"put\s+all\s+the\s+text\s+above",
-]
+try:
+    from .matcher import RuleSet, load_artifact
+except ImportError:  # run as a script from guardrails/
+    from matcher import RuleSet, load_artifact
 
-# Layer 2: Output guardrail (instruction leakage prevention)
-PROTECTED_CONTENT_PATTERNS = [
-    r"IDSE\s+GOVERNANCE\s+HEADER",
-    r"Intent-Driven\s+Systems\s+Engineering.*Constitution",
-    r"\.cursor/rules/workflow\.mdc",
-    r"idse-governance/state/state\.json",
-    r"active_llm.*codex_gpt|claude_code",
-    r"verify_active_llm",
-    r"VALID_LLMS\s*=",
-    r"Rule\s+Nr\.\s*1",
-]
+# Rule sets shared with the IDSE Developer Agent, precompiled into
+# compiled_rules.json (regenerate with scripts/build_guardrail_rules.py in
+# the agent repository; do not edit the artifact or matcher.py here)
+RULES_ARTIFACT = Path(__file__).resolve().with_name("compiled_rules.json")
+RULES_VERSION, _RULE_SETS = load_artifact(RULES_ARTIFACT)
 
+# The companion applies only the rules it has always enforced; the agent's
+# extra heuristics (urgency, state_edit, handoff_tool, the policy-header and
+# governance-code checks) stay agent-only
+# Layer 1: Input guardrail (prompt injection detection)
+INPUT_RULES: RuleSet = _RULE_SETS["input"].subset(lambda rule: rule.category == "injection")
+# Layer 2: Output guardrail (instruction leakage prevention)
+OUTPUT_RULES: RuleSet = _RULE_SETS["output"].subset(
+    lambda rule: rule.category == "protected" or rule.id == "verbatim[0]"
+)
 # Layer 3: Boundary guardrail (governance boundary enforcement)
-BOUNDARY_VIOLATION_PATTERNS = [
-    r"write.*idse-governance/.*\.py",
-    r"create.*src/.*governance",
-    r"(write|modify).*idse-governance/state/state\.json",
-    r"modify.*state\.json\s+directly",
-    r"edit.*handoff_protocol\.md",
-]
+BOUNDARY_RULES: RuleSet = _RULE_SETS["boundary"].subset(lambda rule: rule.category == "boundary")
+# Pre-commit: hardcoded secrets in staged files (scripts/pre_commit_check.py)
+SECRET_RULES: RuleSet = _RULE_SETS["secrets"]
+
+INJECTION_PATTERNS = [rule.pattern for rule in INPUT_RULES.rules]
+PROTECTED_CONTENT_PATTERNS = [rule.pattern for rule in OUTPUT_RULES.rules]
+BOUNDARY_VIOLATION_PATTERNS = [rule.pattern for rule in BOUNDARY_RULES.rules]
 
 
 def instruction_extraction_guardrail(input_text: str) -> Tuple[bool, str]:
     """Block prompt injection attempts."""
-    for pattern in INJECTION_PATTERNS:
-        if re.search(pattern, input_text, re.IGNORECASE):
-            return False, (
-                "I can't help with that request. "
-                "I'm designed for IDSE tasks and cannot reveal or ignore instructions."
-            )
+    if INPUT_RULES.first_match(input_text) is not None:
+        return False, (
+            "I can't help with that request. "
+            "I'm designed for IDSE tasks and cannot reveal or ignore instructions."
+        )
     return True, input_text
 
 
 def instruction_leakage_guardrail(output_text: str) -> Tuple[bool, str]:
     """Prevent instruction disclosure in responses."""
-    for pattern in PROTECTED_CONTENT_PATTERNS:
-        if re.search(pattern, output_text, re.IGNORECASE):
-            return False, "Response blocked: contains protected system content."
+    if OUTPUT_RULES.first_match(output_text) is not None:
+        return False, "Response blocked: contains protected system content."
     return True, output_text
 
 
 def idse_boundary_guardrail(file_path: str, operation: str) -> Tuple[bool, str]:
     """Enforce governance boundaries for file operations."""
     target = f"{operation}::{file_path}"
-    for pattern in BOUNDARY_VIOLATION_PATTERNS:
-        if re.search(pattern, target, re.IGNORECASE):
-            return False, (
-                "Request blocked: IDSE governance boundary violation. "
-                "Do not modify governance-layer files directly."
-            )
+    if BOUNDARY_RULES.first_match(target) is not None:
+        return False, (
+            "Request blocked: IDSE governance boundary violation. "
+            "Do not modify governance-layer files directly."
+        )
     return True, file_path
 
 
@@ -0,0 +1,566 @@
+"""
+Precompiled rule matcher for the instruction-protection guardrails.
+
+A ``RuleSet`` is compiled once from ordered ``Rule`` definitions and
+returns the highest-priority rule that fires on a message (earlier rules
+win, matching the old loop-and-``re.search`` order) together with its id:
+
+- Each pattern is split at top-level ``|`` and ``.*`` into gap-free
+  segments; every segment has a set of anchor literals, one of which must
+  appear for it to match (``ignore``, ``show``, ``forget``/``reset``, ...)
+- Per message, anchors are checked with plain substring search; only rules
+  whose anchors are all present run their regexes, so a benign message
+  costs a handful of C-speed scans
+- Gapped rules (``A.*B.*C``) match their segments left to right with
+  newline-free gaps (any gap if ``dotall``); each segment's search
+  position only moves forward, replacing nested ``.*`` backtracking with
+  a few linear scans
+- Whitespace runs are collapsed before matching (patterns only use
+  ``\\s+``/``\\s*``), so long runs of spaces cannot cause quadratic retries
+
+Worst-case time is linear in the message length times the number of
+segments, including on adversarial multi-kilobyte prompts. The standard
+library has no RE2/automaton engine, hence the segment decomposition.
+
+``RuleSet.stream()`` applies the same rules to a reply as it streams in
+(see ``StreamScanner``), so output checks need not buffer the whole reply.
+
+``build_artifact`` serializes rule sets together with their decomposition
+(segments and anchors) under a content hash; ``load_artifact`` rebuilds
+them without re-analysing any pattern. The agent and the companion bundle
+load the same artifact, built from rules.py by
+scripts/build_guardrail_rules.py, which also keeps this module's copy at
+companion_bundle/guardrails/matcher.py identical (the bundle ships without
+the agent package). The module depends on the standard library only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# Characters of context a streamed match may span (and raw text held back)
+DEFAULT_STREAM_OVERLAP = 256
+# Bump when the decomposition or artifact layout changes
+ARTIFACT_FORMAT = 1
+_QUANTIFIERS = "?*{"
+# Escapes that stand for a literal character
+_LITERAL_ESCAPES = set(".-/\\[](){}|*+?^$#&~ ")
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapse whitespace runs to one newline (if the run had one) or one space.
+
+    Same result as ``re.sub(r"\\s+", ...)`` but built from ``str.split``/``join``,
+    which stays at C speed on multi-megabyte files.
+    """
+    if "\n" not in text:
+        words = text.split()
+        if not words:
+            return " " if text else ""
+        return (" " if text[0].isspace() else "") + " ".join(words) + (" " if text[-1].isspace() else "")
+    lines = [" ".join(line.split()) for line in text.split("\n")]
+    body = "\n".join(line for line in lines if line)
+    if not body:
+        return "\n"
+    # Blank first/last lines mean the text starts/ends inside a run with a newline
+    head = "\n" if not lines[0] else (" " if text[0].isspace() else "")
+    tail = "\n" if not lines[-1] else (" " if text[-1].isspace() else "")
+    return head + body + tail
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One guardrail pattern; ``category`` selects the response message."""
+
+    id: str
+    pattern: str
+    category: str
+    ignore_case: bool = True
+    dotall: bool = False
+
+    @property
+    def flags(self) -> int:
+        return (re.IGNORECASE if self.ignore_case else 0) | (re.DOTALL if self.dotall else 0)
+
+
+class RuleMatch(NamedTuple):
+    rule_id: str
+    category: str
+    pattern: str
+    span: Tuple[int, int]  # offsets in the whitespace-normalized text
+
+
+def build_rules(category: str, patterns: Iterable[str], **options) -> List[Rule]:
+    """Rules for a pattern list, with ids ``<category>[<index>]``."""
+    return [Rule(f"{category}[{i}]", pattern, category, **options) for i, pattern in enumerate(patterns)]
+
+
+def _scan(pattern: str):
+    """Yield (index, token, depth, in_class) tokens; escapes come back as one token."""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            yield i, pattern[i:i + 2], depth, in_class
+            i += 2
+            continue
+        if in_class:
+            if ch == "]":
+                in_class = False
+        elif ch == "[":
+            in_class = True
+            yield i, ch, depth, False
+            if pattern[i + 1:i + 2] == "]":  # literal ] first in class
+                i += 1
+            i += 1
+            continue
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            yield i, ch, depth, False
+            i += 1
+            continue
+        yield i, ch, depth, in_class
+        i += 1
+
+
+def split_alternatives(pattern: str) -> List[str]:
+    """Split at top-level ``|``."""
+    parts, last = [], 0
+    for i, token, depth, in_class in _scan(pattern):
+        if token == "|" and depth == 0 and not in_class:
+            parts.append(pattern[last:i])
+            last = i + 1
+    parts.append(pattern[last:])
+    return parts
+
+
+def split_gaps(pattern: str) -> List[str]:
+    """Split an alternative at top-level ``.*`` (and ``.*?``) into non-empty segments."""
+    segments, last, skip_to = [], 0, -1
+    for i, token, depth, in_class in _scan(pattern):
+        if i < skip_to:
+            continue
+        if token == "." and depth == 0 and not in_class and pattern[i + 1:i + 2] == "*":
+            segments.append(pattern[last:i])
+            last = i + 2 + (pattern[i + 2:i + 3] == "?")
+            skip_to = last
+    segments.append(pattern[last:])
+    return [s for s in segments if s]
+
+
+def split_top_level(pattern: str) -> List[List[str]]:
+    """``a.*b|c`` -> ``[["a", "b"], ["c"]]``."""
+    return [split_gaps(alternative) for alternative in split_alternatives(pattern)]
+
+
+def anchors(segment: str) -> Optional[FrozenSet[str]]:
+    """
+    Literals of which at least one must occur for ``segment`` to match.
+
+    None means no anchor could be derived (the segment always runs).
+    """
+    i = 0
+    while True:  # skip zero-width and whitespace prefixes
+        for prefix in ("\\b", "^", "\\s+", "\\s*"):
+            if segment.startswith(prefix, i):
+                i += len(prefix)
+                break
+        else:
+            break
+    if segment[i:i + 1] == "(":
+        close = _matching_paren(segment, i)
+        if close is None or segment[close + 1:close + 2] in tuple(_QUANTIFIERS):
+            return None
+        body = segment[i + 1:close]
+        if body.startswith("?"):
+            return None
+        found = set()
+        for branch in split_alternatives(body):
+            branch_anchors = anchors(branch)
+            if not branch_anchors:
+                return None
+            found |= branch_anchors
+        return frozenset(found)
+
+    literal: List[str] = []
+    while i < len(segment):
+        ch = segment[i]
+        if ch == "\\":
+            nxt = segment[i + 1:i + 2]
+            if nxt not in _LITERAL_ESCAPES:
+                break
+            literal.append(nxt)
+            i += 2
+        elif ch in ".[()|+^$" or ch in _QUANTIFIERS:
+            break
+        else:
+            literal.append(ch)
+            i += 1
+        if segment[i:i + 1] and segment[i] in _QUANTIFIERS:  # last char is optional
+            literal.pop()
+            break
+    return frozenset(["".join(literal)]) if literal else None
+
+
+def _matching_paren(pattern: str, start: int) -> Optional[int]:
+    for i, token, depth, in_class in _scan(pattern[start:]):
+        if token == ")" and depth == 0 and not in_class:
+            return start + i
+    return None
+
+
+class _Alternative(NamedTuple):
+    segments: Tuple["re.Pattern[str]", ...]
+    anchors: Tuple[FrozenSet[str], ...]  # one set per anchored segment
+    ignore_case: bool
+    dotall: bool
+
+
+# Per alternative: (segment patterns, anchor groups); what an artifact stores
+Decomposition = List[Tuple[List[str], List[List[str]]]]
+
+
+def decompose(rule: Rule) -> Decomposition:
+    """Split ``rule`` into segments and derive their anchors (the costly analysis)."""
+    re.compile(rule.pattern, rule.flags)  # fail fast on invalid patterns
+    decomposition = []
+    for segments in split_top_level(rule.pattern):
+        groups = [anchors(segment) for segment in segments]
+        decomposition.append(
+            (segments, [sorted(a.lower() for a in g) if rule.ignore_case else sorted(g) for g in groups if g])
+        )
+    return decomposition
+
+
+class RuleSet:
+    """Ordered rules compiled once; ``first_match`` reports the rule that fired."""
+
+    def __init__(self, rules: Sequence[Rule], decompositions: Optional[Sequence[Decomposition]] = None):
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+        if decompositions is None:
+            decompositions = [decompose(rule) for rule in self.rules]
+        self._compiled: List[Tuple[_Alternative, ...]] = [
+            tuple(
+                _Alternative(
+                    segments=tuple(re.compile(segment, rule.flags) for segment in segments),
+                    anchors=tuple(frozenset(group) for group in groups),
+                    ignore_case=rule.ignore_case,
+                    dotall=rule.dotall,
+                )
+                for segments, groups in decomposition
+            )
+            for rule, decomposition in zip(self.rules, decompositions)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def subset(self, keep: Callable[[Rule], bool]) -> "RuleSet":
+        """The rules ``keep`` accepts, in order, sharing this set's compiled patterns."""
+        selected = [i for i, rule in enumerate(self.rules) if keep(rule)]
+        subset = RuleSet.__new__(RuleSet)
+        subset.rules = tuple(self.rules[i] for i in selected)
+        subset._compiled = [self._compiled[i] for i in selected]
+        return subset
+
+    def first_match(self, text: str) -> Optional[RuleMatch]:
+        """Highest-priority rule that fires on ``text`` (None if none)."""
+        text = normalize_whitespace(text)
+        # Anchors are a necessary condition; re's case folding can match a few
+        # non-ASCII characters to ASCII letters, so only prefilter ASCII text.
+        prefilter = text.isascii()
+        folded = text.lower() if prefilter else text
+        newlines: Optional[List[int]] = None
+
+        for rule, alternatives in zip(self.rules, self._compiled):
+            for alt in alternatives:
+                if prefilter:
+                    haystack = folded if alt.ignore_case else text
+                    if not all(any(a in haystack for a in group) for group in alt.anchors):
+                        continue
+                if len(alt.segments) == 1:
+                    m = alt.segments[0].search(text)
+                    span = m.span() if m else None
+                else:
+                    if newlines is None and not alt.dotall:
+                        newlines = [i for i, ch in enumerate(text) if ch == "\n"] if "\n" in text else []
+                    span = _chain_search(text, alt.segments, None if alt.dotall else newlines)
+                if span is not None:
+                    return RuleMatch(rule.id, rule.category, rule.pattern, span)
+        return None
+
+    def matches(self, text: str) -> bool:
+        return self.first_match(text) is not None
+
+    def stream(self, overlap: int = DEFAULT_STREAM_OVERLAP) -> "StreamScanner":
+        """Incremental scanner over a chunked message (see ``StreamScanner``)."""
+        return StreamScanner(self, overlap)
+
+
+def _chain_search(
+    text: str,
+    segments: Sequence["re.Pattern[str]"],
+    newlines: Optional[List[int]],
+) -> Optional[Tuple[int, int]]:
+    """
+    Find segments in order with newline-free gaps (any gaps if ``newlines`` is None).
+
+    Each segment keeps its last search result and only re-searches when asked
+    for a position past it, so total work stays linear in ``len(text)``.
+    """
+    cache: List[Optional[Tuple[int, Optional[re.Match]]]] = [None] * len(segments)
+
+    def next_match(i: int, pos: int) -> Optional[re.Match]:
+        cached = cache[i]
+        if cached is not None and cached[0] <= pos and (cached[1] is None or cached[1].start() >= pos):
+            return cached[1]
+        m = segments[i].search(text, pos)
+        cache[i] = (pos, m)
+        return m
+
+    pos = 0
+    while pos <= len(text):
+        first = next_match(0, pos)
+        if first is None:
+            return None
+        end = first.end()
+        for i in range(1, len(segments)):
+            m = next_match(i, end)
+            if m is None:
+                return None  # no later occurrence at all
+            if newlines and _crosses_newline(newlines, end, m.start()):
+                break
+            end = m.end()
+        else:
+            return first.start(), end
+        pos = first.start() + 1
+    return None
+
+
+def _crosses_newline(newlines: List[int], start: int, stop: int) -> bool:
+    k = bisect_left(newlines, start)
+    return k < len(newlines) and newlines[k] < stop
+
+
+
+class CompiledRules(NamedTuple):
+    version: str
+    rule_sets: Dict[str, RuleSet]
+
+
+def _payload_version(payload: Mapping[str, object]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def build_artifact(rule_sets: Mapping[str, Sequence[Rule]]) -> Dict[str, object]:
+    """Serializable, pre-decomposed form of named rule sets, keyed by a content hash."""
+    payload = {
+        name: [
+            {
+                "id": rule.id,
+                "pattern": rule.pattern,
+                "category": rule.category,
+                "ignore_case": rule.ignore_case,
+                "dotall": rule.dotall,
+                "alternatives": [{"segments": s, "anchors": a} for s, a in decompose(rule)],
+            }
+            for rule in rules
+        ]
+        for name, rules in rule_sets.items()
+    }
+    return {"format": ARTIFACT_FORMAT, "version": _payload_version(payload), "rule_sets": payload}
+
+
+def load_artifact(path: Path) -> CompiledRules:
+    """
+    Rule sets from a ``build_artifact`` JSON file, without re-analysing patterns.
+
+    Raises ValueError if the file has another format or does not match its
+    version hash (edited by hand instead of rebuilt).
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path}: unsupported rule artifact format {data.get('format')!r}")
+    payload = data["rule_sets"]
+    if _payload_version(payload) != data.get("version"):
+        raise ValueError(f"{path}: content does not match version {data.get('version')!r}; rebuild it")
+    rule_sets = {}
+    for name, entries in payload.items():
+        rules = [Rule(e["id"], e["pattern"], e["category"], e["ignore_case"], e["dotall"]) for e in entries]
+        decompositions = [[(a["segments"], a["anchors"]) for a in e["alternatives"]] for e in entries]
+        rule_sets[name] = RuleSet(rules, decompositions)
+    return CompiledRules(data["version"], rule_sets)
+
+
+class StreamVerdict(NamedTuple):
+    release: str  # raw text now safe to forward
+    match: Optional[RuleMatch]  # set once the stream is blocked
+
+    @property
+    def blocked(self) -> bool:
+        return self.match is not None
+
+
+class StreamScanner:
+    """
+    ``RuleSet`` matching over a message that arrives in chunks.
+
+    ``feed`` returns the text that may be forwarded so far, or the match
+    that blocks the stream; ``close`` releases the rest once the message
+    has ended cleanly.
+
+    - Only a sliding window is kept: the last ``overlap`` characters of
+      (whitespace-normalized) text plus the new chunk, so a match split
+      across chunks is still seen while the per-chunk cost stays bounded
+      (up to ``overlap`` more is kept before a line break a gapped rule is
+      still deciding on)
+    - Gapped rules remember how many of their segments have matched on the
+      current line (or anywhere, if ``dotall``), so ``A.*B`` fires when ``B``
+      arrives however far back ``A`` was
+    - The last ``overlap`` raw characters are held back, so a match shorter
+      than that is blocked before any of it is released; earlier text goes
+      out as soon as it arrives. For gapped rules only the final segment is
+      guaranteed to be withheld
+
+    Matches longer than ``overlap`` characters are not guaranteed to be seen
+    as one; ``\\b``/``$`` at the end of the window see the end of the text
+    received so far.
+    """
+
+    def __init__(self, rule_set: RuleSet, overlap: int = DEFAULT_STREAM_OVERLAP):
+        if overlap < 1:
+            raise ValueError("overlap must be at least 1")
+        self.rule_set = rule_set
+        self.overlap = overlap
+        self.match: Optional[RuleMatch] = None
+        self.closed = False
+        self._window = ""  # normalized text: overlap context + newest chunk
+        self._base = 0  # offset of _window[0] in the normalized stream
+        self._deferred = ""  # trailing raw whitespace, normalized with what follows
+        self._held = ""  # raw text not yet released
+        self._pin = 0
+        # (rule, alternative) -> [segments matched, first start, last end, floor]
+        self._progress: Dict[Tuple[int, int], List[int]] = {
+            (r, a): [0, 0, 0, 0]
+            for r, alternatives in enumerate(rule_set._compiled)
+            for a, alt in enumerate(alternatives)
+            if len(alt.segments) > 1
+        }
+
+    def feed(self, chunk: str) -> StreamVerdict:
+        """Scan the next chunk; returns what may be released, or the blocking match."""
+        if self.closed:
+            raise ValueError("stream already closed")
+        if self.match is not None or not chunk:
+            return StreamVerdict("", self.match)
+        self._held += chunk
+        text = self._deferred + chunk
+        body = text.rstrip()
+        self._deferred = text[len(body):]
+        if body:
+            self._scan(normalize_whitespace(body))
+        return self._release(final=False)
+
+    def close(self) -> StreamVerdict:
+        """End of message: flush the held-back tail unless the stream is blocked."""
+        if self.closed or self.match is not None:
+            self.closed = True
+            return StreamVerdict("", self.match)
+        self.closed = True
+        self._scan(normalize_whitespace(self._deferred), final=True)
+        self._deferred = ""
+        return self._release(final=True)
+
+    def _release(self, final: bool) -> StreamVerdict:
+        if self.match is not None:
+            self._held = ""
+            return StreamVerdict("", self.match)
+        cut = len(self._held) if final else len(self._held) - self.overlap
+        if cut <= 0:
+            return StreamVerdict("", None)
+        release, self._held = self._held[:cut], self._held[cut:]
+        return StreamVerdict(release, None)
+
+    def _scan(self, text: str, final: bool = False) -> None:
+        """
+        Match rules over the window extended by ``text``.
+
+        Until ``final``, a match touching the end of the window is left for
+        the next chunk, which may still change it (``stop`` + ``ped``).
+        """
+        start = self._base + len(self._window)  # stream offset of the new text
+        window = self._window + text
+        end = len(window) if final else len(window) - 1
+        prefilter = window.isascii()
+        folded = window.lower() if prefilter else window
+        # Once the window has slid, keep its first character as context for \b
+        lookback = max(start - self.overlap, self._base + 1 if self._base else 0)
+        self._pin = start + len(text)  # earliest offset a waiting rule still needs
+
+        for r, (rule, alternatives) in enumerate(zip(self.rule_set.rules, self.rule_set._compiled)):
+            for a, alt in enumerate(alternatives):
+                if len(alt.segments) == 1:
+                    if prefilter:
+                        haystack = folded if alt.ignore_case else window
+                        if not all(any(x in haystack for x in group) for group in alt.anchors):
+                            continue
+                    m = alt.segments[0].search(window, lookback - self._base)
+                    span = (m.start() + self._base, m.end() + self._base) if m and m.end() <= end else None
+                else:
+                    span = self._advance(self._progress[(r, a)], alt, window, end)
+                if span is not None:
+                    self.match = RuleMatch(rule.id, rule.category, rule.pattern, span)
+                    return
+
+        cut = max(min(len(window) - self.overlap, self._pin - self._base), 0)
+        self._base += cut
+        self._window = window[cut:]
+
+    def _advance(
+        self, state: List[int], alt: _Alternative, window: str, end: int
+    ) -> Optional[Tuple[int, int]]:
+        """Extend a gapped alternative's progress over the window; span once complete."""
+        base = self._base
+        low = base + 1 if base else 0
+        done, first, last_end, floor = state
+        pos = last_end if done else floor
+        while True:
+            line_end = -1
+            if done and not alt.dotall:
+                line_end = window.find("\n", max(last_end - base, 0))
+            m = alt.segments[done].search(window, max(pos, low) - base)
+            if m is not None and (line_end == -1 or m.start() <= line_end):
+                if m.end() > end:
+                    break  # wait for the next chunk
+                if done == 0:
+                    first = m.start() + base
+                done, last_end, pos = done + 1, m.end() + base, m.end() + base
+                if done == len(alt.segments):
+                    state[:] = [0, 0, 0, last_end]
+                    return first, last_end
+                continue
+            if line_end == -1:
+                break
+            if end < len(window) and len(window) - line_end <= self.overlap:
+                # A segment may still reach across the break; keep context to retry
+                self._pin = min(self._pin, base + line_end - self.overlap)
+                break
+            # Gaps may not cross lines: retry from later first segments; those
+            # ending before the newline fail the same way, so only one that
+            # can reach across it (``ignore\s+``) is worth looking back for
+            done = 0
+            floor = pos = max(first + 1, base + line_end - self.overlap)
+        state[:] = [done, first, last_end, floor]
+        return None
@@ -1,24 +1,203 @@
+"""
+Pre-commit checks: spec compliance, hardcoded secrets, governance boundaries.
+
+The secret scan reads staged blobs (what will be committed), not the
+working tree:
+
+- Blobs come from ``git diff --cached --raw``; each is streamed from
+  ``git cat-file --batch`` in chunks through the shared guardrail matcher, and a
+  blob with a NUL byte in its first 8000 bytes is skipped as binary (as
+  git does), so big files are never held in memory
+- Blobs are scanned in parallel on a thread pool (``--jobs``), each worker
+  reading through its own long-lived ``git cat-file`` process
+- Verdicts are cached by blob sha in the git dir, keyed by the rules
+  version; an unchanged blob is never read again (``--no-cache`` to bypass).
+  Only the shas staged in the latest run are kept, so the cache stays small
+"""
+
 from __future__ import annotations
 
-import re
+import argparse
+import codecs
+import json
+import os
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
 
-from guardrails.instruction_protection import idse_boundary_guardrail
+from guardrails.instruction_protection import RULES_VERSION, SECRET_RULES, idse_boundary_guardrail
 from session_reader import SessionReader
 from utils.doc_reader import IDSEDocReader
 from utils.template_writer import TemplateWriter
 
+SCAN_CHUNK_BYTES = 64 * 1024
+BINARY_SNIFF_BYTES = 8000
+# Context kept across chunks: a match must fit in it, so the secret rule
+# stops at the first character of the quoted value
+SCAN_OVERLAP = 1024
+CACHE_FILE = "idse-precommit-cache.json"
+# Bump when scan_blob changes what a verdict means
+SCANNER_VERSION = "1"
+
+CLEAN, SECRET, BINARY = "clean", "secret", "binary"
+EMPTY_SHA = "0" * 40
+SUBMODULE_MODE = "160000"
+
+
+class StagedBlob(NamedTuple):
+    path: str
+    sha: str
+
+
+def staged_blobs(base_dir: Path) -> List[StagedBlob]:
+    """Added or modified files in the index with their blob shas (deletions excluded)."""
+    result = subprocess.run(
+        ["git", "diff", "--cached", "--raw", "-z", "--no-abbrev", "--no-renames"],
+        cwd=base_dir,
+        check=False,
+        capture_output=True,
+    )
+    # -z paths are raw bytes (not necessarily UTF-8); decode them like the OS does
+    fields = result.stdout.split(b"\0")
+    blobs = []
+    for meta, path in zip(fields[::2], fields[1::2]):
+        # ":<old mode> <new mode> <old sha> <new sha> <status>"
+        _, new_mode, _, new_sha, _ = meta.decode("ascii").lstrip(":").split(" ")
+        if new_sha != EMPTY_SHA and new_mode != SUBMODULE_MODE:
+            blobs.append(StagedBlob(os.fsdecode(path), new_sha))
+    return blobs
+
+
+class BlobReader:
+    """A ``git cat-file --batch`` process that streams blobs by sha (one per worker thread)."""
+
+    def __init__(self, base_dir: Path):
+        self.proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=base_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def chunks(self, sha: str) -> Iterator[bytes]:
+        """Blob content in chunks; the unread rest is drained when the iterator is closed."""
+        self.proc.stdin.write(sha.encode("ascii") + b"\n")
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().split()  # "<sha> blob <size>" or "<sha> missing"
+        if len(header) != 3:
+            return
+        remaining = int(header[2])
+        try:
+            while remaining:
+                chunk = self.proc.stdout.read(min(SCAN_CHUNK_BYTES, remaining))
+                if not chunk:
+                    raise OSError(f"git cat-file ended inside blob {sha}")
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            while remaining:
+                drained = self.proc.stdout.read(min(SCAN_CHUNK_BYTES, remaining))
+                if not drained:
+                    break
+                remaining -= len(drained)
+            self.proc.stdout.read(1)  # newline after the content
+
+    def close(self) -> None:
+        self.proc.stdin.close()
+        self.proc.stdout.close()
+        self.proc.wait()
+
+
+def scan_blob(reader: BlobReader, sha: str) -> str:
+    """Stream one blob through the secret rules; returns CLEAN, SECRET or BINARY."""
+    with closing(reader.chunks(sha)) as chunks:
+        chunk = next(chunks, b"")
+        if b"\0" in chunk[:BINARY_SNIFF_BYTES]:
+            return BINARY
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        scanner = SECRET_RULES.stream(SCAN_OVERLAP)
+        while chunk:
+            if scanner.feed(decoder.decode(chunk)).blocked:
+                return SECRET
+            chunk = next(chunks, b"")
+        scanner.feed(decoder.decode(b"", final=True))
+        return SECRET if scanner.close().blocked else CLEAN
+
+
+class VerdictCache:
+    """Scan verdicts by blob sha, stored in the git dir."""
+
+    def __init__(self, path: Optional[Path], version: str):
+        self.path = path
+        self.version = version
+        self.verdicts: Dict[str, str] = {}
+        self._dirty = False
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == version:
+            self.verdicts = dict(data.get("verdicts", {}))
+
+    @staticmethod
+    def default_path(base_dir: Path) -> Optional[Path]:
+        result = subprocess.run(
+            ["git", "rev-parse", "--git-path", CACHE_FILE],
+            cwd=base_dir,
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        return Path(base_dir) / result.stdout.strip()
+
+    def get(self, sha: str) -> Optional[str]:
+        return self.verdicts.get(sha)
+
+    def put(self, sha: str, verdict: str) -> None:
+        self.verdicts[sha] = verdict
+        self._dirty = True
+
+    def retain(self, shas: Iterable[str]) -> None:
+        """Forget verdicts for blobs that are no longer staged."""
+        keep = set(shas)
+        stale = [sha for sha in self.verdicts if sha not in keep]
+        for sha in stale:
+            del self.verdicts[sha]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": self.version, "verdicts": self.verdicts}), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
 
 class PreCommitValidator:
     """Lightweight pre-commit checks for spec compliance and basic safety."""
 
-    def __init__(self, base_dir: Path | str = Path(".")):
+    def __init__(
+        self,
+        base_dir: Path | str = Path("."),
+        use_cache: bool = True,
+        max_workers: Optional[int] = None,
+    ):
         self.base_dir = Path(base_dir)
         self.session = SessionReader.get_active_session(base_dir=self.base_dir)
         self.reader = IDSEDocReader(base_dir=self.base_dir)
+        self.max_workers = max_workers
+        cache_path = VerdictCache.default_path(self.base_dir) if use_cache else None
+        self.cache = VerdictCache(cache_path, f"{SCANNER_VERSION}-{RULES_VERSION}")
 
     def run_all(self) -> dict:
         return {
@@ -48,20 +227,37 @@ class PreCommitValidator:
         }
 
     def check_security(self) -> dict:
-        """Simple hardcoded secret scan in changed files."""
-        files = self._changed_files()
-        pattern = re.compile(r"(api[_-]?key|password|secret|token)\s*=\s*[\"'][^\"']+[\"']", re.I)
-        findings = []
-        for f in files:
-            path = self.base_dir / f
-            if not path.exists() or path.is_dir():
-                continue
-            text = path.read_text(errors="ignore")
-            if pattern.search(text):
-                findings.append(str(f))
+        """Hardcoded secret scan over staged blobs (parallel, cached by blob sha)."""
+        blobs = staged_blobs(self.base_dir)
+        verdicts = {blob.sha: self.cache.get(blob.sha) for blob in blobs}
+        pending = sorted(sha for sha, verdict in verdicts.items() if verdict is None)
+        if pending:
+            local = threading.local()
+            readers: List[BlobReader] = []
+
+            def scan(sha: str) -> str:
+                if not hasattr(local, "reader"):
+                    local.reader = BlobReader(self.base_dir)
+                    readers.append(local.reader)
+                return scan_blob(local.reader, sha)
+
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    for sha, verdict in zip(pending, pool.map(scan, pending)):
+                        verdicts[sha] = verdict
+                        self.cache.put(sha, verdict)
+            finally:
+                for reader in readers:
+                    reader.close()
+        self.cache.retain(verdicts)
+        self.cache.save()
+        findings = [blob.path for blob in blobs if verdicts[blob.sha] == SECRET]
         return {
             "status": "pass" if not findings else "fail",
             "findings": findings,
+            "scanned": len(pending),
+            "cached": len(verdicts) - len(pending),
+            "binary": [blob.path for blob in blobs if verdicts[blob.sha] == BINARY],
         }
 
     def check_boundary(self) -> dict:
@@ -89,8 +285,13 @@ class PreCommitValidator:
         return files
 
 
-def main():
-    validator = PreCommitValidator()
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="IDSE pre-commit checks.")
+    parser.add_argument("--no-cache", action="store_true", help="Rescan every staged blob")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel blob scans (default: thread pool default)")
+    args = parser.parse_args(argv)
+
+    validator = PreCommitValidator(use_cache=not args.no_cache, max_workers=args.jobs)
     results = validator.run_all()
 
     print("Pre-commit check results:")
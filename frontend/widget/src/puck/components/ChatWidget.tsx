@@ -1,7 +1,7 @@
 import { FormEvent, useEffect, useMemo, useRef, useState } from "react";
 import { ComponentConfig } from "@measured/puck";
 
-type ChatMessage = { role: "user" | "assistant" | "system"; content: string };
+type ChatMessage = { id?: string; role: "user" | "assistant" | "system"; content: string };
 
 const apiBase = (import.meta as any).env?.VITE_API_BASE ?? "http://localhost:8000";
 
@@ -35,6 +35,8 @@ export const ChatWidget: ComponentConfig<ChatWidgetProps> = {
     const streamUrl = useMemo(() => `${apiBase.replace(/\/$/, "")}/stream`, []);
     const inboundUrl = useMemo(() => `${apiBase.replace(/\/$/, "")}/inbound`, []);
     const eventSourceRef = useRef<EventSource | null>(null);
+    // Conversation id assigned by the backend on the first message, echoed back after
+    const threadIdRef = useRef<string | null>(null);
     const bottomRef = useRef<HTMLDivElement | null>(null);
 
     const pushMessage = (msg: ChatMessage) => {
@@ -42,6 +44,18 @@ export const ChatWidget: ComponentConfig<ChatWidgetProps> = {
       requestAnimationFrame(() => bottomRef.current?.scrollIntoView({ behavior: "smooth" }));
     };
 
+    // Append a streamed delta to the message it belongs to.
+    const appendDelta = (id: string, delta: string) => {
+      setMessages((prev) => {
+        const idx = prev.findIndex((m) => m.id === id);
+        if (idx === -1) return [...prev, { id, role: "assistant", content: delta }];
+        const next = prev.slice();
+        next[idx] = { ...next[idx], content: next[idx].content + delta };
+        return next;
+      });
+      requestAnimationFrame(() => bottomRef.current?.scrollIntoView({ behavior: "smooth" }));
+    };
+
     useEffect(() => {
       const es = new EventSource(streamUrl);
       eventSourceRef.current = es;
@@ -60,7 +74,14 @@ export const ChatWidget: ComponentConfig<ChatWidgetProps> = {
         try {
           const parsed = JSON.parse(event.data);
           switch (parsed.type) {
+            case "TEXT_MESSAGE_START":
+              pushMessage({ id: parsed.messageId, role: "assistant", content: "" });
+              break;
             case "TEXT_MESSAGE_CONTENT":
+              if (parsed.messageId && typeof parsed.delta === "string") {
+                appendDelta(parsed.messageId, parsed.delta);
+                break;
+              }
               pushMessage({
                 role: parsed.from === "user" ? "user" : "assistant",
                 content: parsed.content ?? "",
@@ -94,11 +115,13 @@ export const ChatWidget: ComponentConfig<ChatWidgetProps> = {
         const res = await fetch(inboundUrl, {
           method: "POST",
           headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ type: "USER_MESSAGE", content: text }),
+          body: JSON.stringify({ type: "USER_MESSAGE", content: text, thread_id: threadIdRef.current ?? undefined }),
         });
         if (!res.ok) {
           throw new Error(`Inbound failed (${res.status})`);
         }
+        const data = await res.json();
+        threadIdRef.current = data.thread_id ?? threadIdRef.current;
         setStatus(null);
       } catch (err) {
         pushMessage({
@@ -1,10 +1,11 @@
 import { FormEvent, useEffect, useMemo, useRef, useState } from "react";
 
-type ChatMessage = { role: "user" | "assistant" | "system"; content: string };
+type ChatMessage = { id?: string; role: "user" | "assistant" | "system"; content: string };
 
 // AG-UI event names we care about; keep loose to avoid runtime coupling.
 type AguiEvent =
-  | { type: "TEXT_MESSAGE_CONTENT"; content?: string }
+  | { type: "TEXT_MESSAGE_START"; messageId?: string }
+  | { type: "TEXT_MESSAGE_CONTENT"; messageId?: string; delta?: string; content?: string }
   | { type: "SYSTEM_MESSAGE"; content?: string }
   | { type: "TOOL_CALL_START"; tool_name?: string }
   | { type: "TOOL_CALL_END"; tool_name?: string }
@@ -41,6 +42,20 @@ export function RightPanel({ project, session, contextInfo }: RightPanelProps =
     });
   };
 
+  // Append a streamed delta to the message it belongs to.
+  const appendDelta = (id: string, delta: string) => {
+    setMessages((prev) => {
+      const idx = prev.findIndex((m) => m.id === id);
+      if (idx === -1) return [...prev, { id, role: "assistant", content: delta }];
+      const next = prev.slice();
+      next[idx] = { ...next[idx], content: next[idx].content + delta };
+      return next;
+    });
+    requestAnimationFrame(() => {
+      bottomRef.current?.scrollIntoView({ behavior: "smooth" });
+    });
+  };
+
   // Connect to AG-UI event stream (SSE).
   useEffect(() => {
     const es = new EventSource(streamUrl);
@@ -60,8 +75,15 @@ export function RightPanel({ project, session, contextInfo }: RightPanelProps =
       try {
         const parsed: AguiEvent = JSON.parse(event.data);
         switch (parsed.type) {
+          case "TEXT_MESSAGE_START":
+            pushMessage({ id: parsed.messageId as string | undefined, role: "assistant", content: "" });
+            break;
           case "TEXT_MESSAGE_CONTENT":
-            pushMessage({ role: "assistant", content: parsed.content ?? "" });
+            if (typeof parsed.messageId === "string" && typeof parsed.delta === "string") {
+              appendDelta(parsed.messageId, parsed.delta);
+              break;
+            }
+            pushMessage({ role: "assistant", content: (parsed.content as string | undefined) ?? "" });
             break;
           case "SYSTEM_MESSAGE":
             pushMessage({ role: "system", content: parsed.content ?? "" });
@@ -5,4 +5,6 @@ export interface FileNode {
   path: string;
   type: FileNodeType;
   children?: FileNode[];
+  /** Set by lazy listings (`/api/files/tree?lazy=true`); children load on expand */
+  child_count?: number;
 }
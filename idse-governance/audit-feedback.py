@@ -9,27 +9,18 @@ Checks:
 - feedback.md exists for the project/session.
 - Required sections are present (External / Internal Feedback, Impacted Artifacts, Risks / Issues Raised, Actions / Follow-ups, Decision Log).
 - Flags placeholder tokens like [REQUIRES INPUT].
+
+The checks live in idse_governance/validators.py; this is the CLI wrapper.
 """
 
 import argparse
 import sys
 from pathlib import Path
-from datetime import datetime
-
-REQUIRED_SECTIONS = [
-    "External / Internal Feedback",
-    "Impacted Artifacts",
-    "Risks / Issues Raised",
-    "Actions / Follow-ups",
-    "Decision Log",
-]
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-def write_report(report_dir: Path, content: str) -> Path:
-    report_dir.mkdir(parents=True, exist_ok=True)
-    dest = report_dir / "audit-feedback-report.txt"
-    dest.write_text(content, encoding="utf-8")
-    return dest
+from idse_governance.cache import default_cache_path  # noqa: E402
+from idse_governance.validators import ArtifactSnapshot, audit_feedback, open_cache  # noqa: E402
 
 
 def main() -> int:
@@ -37,44 +28,20 @@ def main() -> int:
     p.add_argument("--project", required=True)
     p.add_argument("--session", required=True)
     p.add_argument("--report-dir", default=None, help="Where to write the report (default: reports/<project>/<session>/)")
+    p.add_argument("--no-cache", action="store_true", help="Re-scan every artifact (skip the content-hash cache)")
     args = p.parse_args()
 
     project = args.project
     session = args.session
     report_dir = Path(args.report_dir) if args.report_dir else Path("reports") / project / session
 
-    errors: list[str] = []
-    warnings: list[str] = []
-
-    feedback_path = Path(f"projects/{project}/sessions/{session}/feedback/feedback.md")
-    if not feedback_path.exists():
-        errors.append(f"Missing feedback file: {feedback_path}")
-    else:
-        text = feedback_path.read_text(encoding="utf-8")
-        for section in REQUIRED_SECTIONS:
-            if section not in text:
-                errors.append(f"Missing section in feedback: {section}")
-        if "[REQUIRES INPUT]" in text:
-            warnings.append(f"Feedback contains placeholder [REQUIRES INPUT]: {feedback_path}")
-
-    lines: list[str] = []
-    lines.append(f"audit-feedback: project={project} session={session}")
-    lines.append(f"report_dir: {report_dir}")
-    lines.append(f"timestamp: {datetime.utcnow().isoformat()}Z")
-    lines.append("")
-    lines.append("Findings:")
-    if errors:
-        for err in errors:
-            lines.append(f"ERROR: {err}")
-    if warnings:
-        for w in warnings:
-            lines.append(f"WARNING: {w}")
-    if not errors and not warnings:
-        lines.append("OK: Feedback meets required sections.")
+    cache_path = None if args.no_cache else default_cache_path()
+    snapshot = ArtifactSnapshot.load(project, session, cache=open_cache(cache_path) if cache_path else None)
+    result = audit_feedback(snapshot, report_dir=str(report_dir))
 
-    report_path = write_report(report_dir, "\n".join(lines))
+    report_path = result.write_report(report_dir)
     print(f"Report written: {report_path}")
-    return 1 if errors else 0
+    return result.exit_code
 
 
 if __name__ == "__main__":
@@ -9,10 +9,12 @@ from .instruction_protection import (
     instruction_extraction_guardrail,
     instruction_leakage_guardrail,
     idse_boundary_guardrail,
+    leakage_stream,
 )
 
 __all__ = [
     "instruction_extraction_guardrail",
     "instruction_leakage_guardrail",
     "idse_boundary_guardrail",
+    "leakage_stream",
 ]
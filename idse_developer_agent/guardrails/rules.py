@@ -0,0 +1,85 @@
+"""
+Guardrail rule definitions shared by the agent and the companion bundle.
+
+This is the only place patterns are written. ``scripts/build_guardrail_rules.py``
+compiles ``RULE_SETS`` into companion_bundle/guardrails/compiled_rules.json,
+which both idse_developer_agent/guardrails/instruction_protection.py and
+companion_bundle/guardrails/instruction_protection.py load at import time.
+Re-run the script after editing this file (tests fail on a stale artifact).
+
+Rules are ordered by priority: the first rule of a set that fires decides
+the block message (via its category).
+"""
+
+import re
+
+from .matcher import Rule, build_rules
+
+# Prompt injection patterns to detect
+INJECTION_PATTERNS = [
+    r"ignore\s+.*(previous|all|your).*\s+instructions?",  # More flexible - allows words in between
+    r"show\s+(me\s+)?(your\s+)?(system\s+)?instructions?",
+    r"reveal\s+(your\s+)?(system\s+)?prompt",
+    r"(forget|reset)\s+(all\s+)?(your\s+)?(rules|instructions|guardrails)",
+    r"(respond|answer)\s+without\s+(filters?|safety|guardrails|policies)",
+    r"(drop|disable|turn\s+off)\s+(all\s+)?(safety|guardrails|filters)",
+    r"start\s+(over|fresh)\s+as\s+(a\s+)?blank\s+slate",
+    r"follow\s+only\s+what\s+i\s+say\s+now",
+    r"act\s+without\s+(restrictions|limits|policies)",
+    r"no\s+(safety|filters|guardrails)",
+    r"list\s+everything\s+above",
+    r"repeat\s+(everything|all)\s+above",
+    r"translate\s+(your\s+)?instructions?",
+    r"summarize\s+(your\s+)?instructions?",
+    r"what\s+are\s+your\s+(exact\s+)?instructions",
+    r"tell\s+me\s+your\s+rules",
+    r"output\s+your\s+prompt",
+    r"print\s+(your\s+)?system\s+prompt",
+    r"describe\s+your\s+instructions",
+    r"encode\s+(your\s+)?instructions",
+    r"format\s+everything\s+above",
+    r"put\s+all\s+the\s+text\s+above",
+]
+
+# Protected content patterns (shouldn't appear in outputs)
+PROTECTED_CONTENT_PATTERNS = [
+    r"IDSE\s+GOVERNANCE\s+HEADER",
+    r"Intent-Driven\s+Systems\s+Engineering.*Constitution",
+    r"\.cursor/rules/workflow\.mdc",
+    r"idse-governance/state/state\.json",
+    r"active_llm.*codex_gpt|claude_code",
+    r"verify_active_llm",
+    r"VALID_LLMS\s*=",
+]
+
+# Governance boundary violations
+BOUNDARY_VIOLATION_PATTERNS = [
+    r"write.*idse-governance/.*\.py",
+    r"create.*src/.*governance",
+    r"modify.*state\.json\s+directly",
+    r"edit.*handoff_protocol\.md",
+    r"(write|modify).*idse-governance/state/state\.json",
+]
+
+RULE_SETS = {
+    # Layer 1: injection patterns win over the urgency heuristic
+    "input": build_rules("injection", INJECTION_PATTERNS)
+    + [Rule("urgency", r"\b(STOP|HALT|EMERGENCY|URGENT)\b.*(list|show|reveal)", "urgency")],
+    # Layer 2: protected content, verbatim instruction markers, governance source
+    "output": build_rules("protected", PROTECTED_CONTENT_PATTERNS)
+    + [
+        Rule("verbatim[0]", r"Rule\s+Nr\.\s*1", "verbatim"),
+        Rule("verbatim[1]", re.escape("## 🔒 INSTRUCTION PROTECTION POLICY"), "verbatim", ignore_case=False),
+        Rule("governance_code", r"```python.*verify_active_llm", "governance_code", ignore_case=False, dotall=True),
+    ],
+    # Layer 3: boundary patterns, then direct state edits and governance-in-tools
+    "boundary": build_rules("boundary", BOUNDARY_VIOLATION_PATTERNS)
+    + [
+        Rule("state_edit", r"directly\s+(edit|modify|update)\s+state\.json", "state_edit", ignore_case=False),
+        Rule("handoff_tool", r"(create|write|add).*handoff.*tool.*idse_developer_agent", "handoff_tool", ignore_case=False),
+    ],
+    # Companion pre-commit: hardcoded credentials in staged files. Only the key
+    # and the start of a quoted value are matched, so a streamed scan catches
+    # values of any length (PEM blobs, JWTs), not just those within its overlap
+    "secrets": [Rule("secret_assignment", r"(api[_-]?key|password|secret|token)\s*=\s*[\"'][^\"']", "secret")],
+}
@@ -1,12 +1,14 @@
-import subprocess
 from pathlib import Path
 from agency_swarm.tools import BaseTool
 from pydantic import Field
 
+from idse_governance import run_validators
+from idse_governance.cache import default_cache_path
+
 
 class AuditFeedbackTool(BaseTool):
     """
-    Run idse-governance/audit-feedback.py for a project/session.
+    Run the audit-feedback governance validator (in-process) for a project/session.
     Writes report to reports/projects/<project>/sessions/<session>/audit-feedback-report.txt.
     """
 
@@ -27,25 +29,16 @@ class AuditFeedbackTool(BaseTool):
         )
         report_dir.mkdir(parents=True, exist_ok=True)
 
-        cmd = [
-            "python3",
-            "idse-governance/audit-feedback.py",
-            "--project",
-            proj,
-            "--session",
-            sess,
-            "--report-dir",
-            str(report_dir),
-        ]
-
         try:
-            completed = subprocess.run(cmd, capture_output=True, text=True, check=False)
-            status = "OK" if completed.returncode == 0 else f"FAIL({completed.returncode})"
-            parts = [f"audit-feedback: {status}"]
-            if completed.stdout:
-                parts.append(f"stdout:\n{completed.stdout.strip()}")
-            if completed.stderr:
-                parts.append(f"stderr:\n{completed.stderr.strip()}")
-            return "\n\n".join(parts)
+            (result,) = run_validators(
+                proj,
+                sess,
+                report_dir=report_dir,
+                validators=["audit-feedback"],
+                cache=default_cache_path(),
+            )
         except Exception as exc:  # pragma: no cover - best effort
             return f"audit-feedback: ERROR {exc}"
+
+        status = "OK" if result.ok else f"FAIL({result.exit_code})"
+        return f"audit-feedback: {status}\n\nReport written: {result.report_path}\n{result.report.strip()}"
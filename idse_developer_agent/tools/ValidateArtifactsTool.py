@@ -1,8 +1,10 @@
-import subprocess
 from pathlib import Path
 from agency_swarm.tools import BaseTool
 from pydantic import Field
 
+from idse_governance import run_validators
+from idse_governance.cache import default_cache_path
+
 
 class ValidateArtifactsTool(BaseTool):
     """
@@ -11,7 +13,9 @@ class ValidateArtifactsTool(BaseTool):
     - check-compliance
     - audit-feedback
 
-    Writes reports under reports/projects/<project>/sessions/<session>/.
+    The validators run in-process and concurrently over a single read of the
+    session artifacts. Writes reports under
+    reports/projects/<project>/sessions/<session>/.
     Returns a short status summary.
     """
 
@@ -32,32 +36,15 @@ class ValidateArtifactsTool(BaseTool):
         )
         report_dir.mkdir(parents=True, exist_ok=True)
 
-        cmds = [
-            (
-                ["python3", "idse-governance/validate-artifacts.py", "--project", proj, "--session", sess, "--report-dir", str(report_dir)],
-                "validate-artifacts",
-            ),
-            (
-                ["python3", "idse-governance/check-compliance.py", "--project", proj, "--session", sess, "--report-dir", str(report_dir)],
-                "check-compliance",
-            ),
-            (
-                ["python3", "idse-governance/audit-feedback.py", "--project", proj, "--session", sess, "--report-dir", str(report_dir)],
-                "audit-feedback",
-            ),
-        ]
+        try:
+            outcomes = run_validators(proj, sess, report_dir=report_dir, cache=default_cache_path())
+        except Exception as exc:  # pragma: no cover - best effort
+            return f"validators: ERROR {exc}"
 
         results: list[str] = []
-        for cmd, label in cmds:
-            try:
-                completed = subprocess.run(cmd, capture_output=True, text=True, check=False)
-                status = "OK" if completed.returncode == 0 else f"FAIL({completed.returncode})"
-                results.append(f"{label}: {status}")
-                if completed.stdout:
-                    results.append(f"{label} stdout:\n{completed.stdout.strip()}")
-                if completed.stderr:
-                    results.append(f"{label} stderr:\n{completed.stderr.strip()}")
-            except Exception as exc:  # pragma: no cover - best effort
-                results.append(f"{label}: ERROR {exc}")
+        for result in outcomes:
+            status = "OK" if result.ok else f"FAIL({result.exit_code})"
+            results.append(f"{result.validator}: {status}")
+            results.append(f"{result.validator} report ({result.report_path}):\n{result.report.strip()}")
 
         return "\n\n".join(results)
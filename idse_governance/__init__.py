@@ -0,0 +1,35 @@
+"""
+Importable IDSE governance validators.
+
+The CLI scripts under idse-governance/ wrap these functions; agent tools
+call them in-process via ``run_validators``; ``validate_all`` fans many
+sessions out over a process pool.
+"""
+
+from .batch import SessionOutcome, discover_sessions, validate_all
+from .validators import (
+    ArtifactSnapshot,
+    Check,
+    VALIDATORS,
+    ValidationResult,
+    audit_feedback,
+    check_compliance,
+    resolve_session_from_pointer,
+    run_validators,
+    validate_artifacts,
+)
+
+__all__ = [
+    "ArtifactSnapshot",
+    "Check",
+    "SessionOutcome",
+    "VALIDATORS",
+    "ValidationResult",
+    "audit_feedback",
+    "check_compliance",
+    "discover_sessions",
+    "resolve_session_from_pointer",
+    "run_validators",
+    "validate_all",
+    "validate_artifacts",
+]
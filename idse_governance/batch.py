@@ -0,0 +1,236 @@
+"""
+Batch validation across every project/session under projects/.
+
+- ``discover_sessions`` expands a ``<project-glob>/<session-glob>`` pattern
+  against projects/*/sessions/*
+- ``validate_all`` fans sessions out over a ``ProcessPoolExecutor`` sized
+  to the machine's cores; each worker loads one snapshot and runs the
+  requested validators over it, writing per-session text reports to
+  ``<report_dir>/<project>/<session>/``; workers share one content-hash
+  cache file (idse_governance/cache.py)
+- The aggregate is written once as JSON (``batch-report.json``) and JUnit
+  XML (``batch-report.junit.xml``) for CI
+
+Full-repo validation time scales with cores rather than session count.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .validators import VALIDATORS, run_validators
+
+JSON_REPORT = "batch-report.json"
+JUNIT_REPORT = "batch-report.junit.xml"
+
+
+def discover_sessions(root: Path = Path("."), pattern: str = "*/*") -> List[Tuple[str, str]]:
+    """
+    Return sorted (project, session) pairs matching ``pattern``.
+
+    ``pattern`` is ``<project-glob>/<session-glob>``; a bare project glob
+    matches all of its sessions.
+    """
+    project_glob, _, session_glob = pattern.partition("/")
+    session_glob = session_glob or "*"
+    projects_dir = Path(root) / "projects"
+    if not projects_dir.is_dir():
+        return []
+
+    found: List[Tuple[str, str]] = []
+    for project in sorted(projects_dir.iterdir()):
+        if not project.is_dir() or not fnmatch(project.name, project_glob or "*"):
+            continue
+        sessions_dir = project / "sessions"
+        if not sessions_dir.is_dir():
+            continue
+        for session in sorted(sessions_dir.iterdir()):
+            if session.is_dir() and not session.name.startswith(".") and fnmatch(session.name, session_glob):
+                found.append((project.name, session.name))
+    return found
+
+
+@dataclass
+class SessionOutcome:
+    """Validator results for one session, as plain data (crosses process boundaries)."""
+
+    project: str
+    session: str
+    results: List[Dict[str, object]] = field(default_factory=list)
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def exit_code(self) -> int:
+        if self.error:
+            return 1
+        return max((int(r["exit_code"]) for r in self.results), default=0)
+
+
+def _validate_session(
+    project: str,
+    session: str,
+    validators: Sequence[str],
+    root: str,
+    report_dir: Optional[str],
+    accept_stage_root: bool,
+    cache: Optional[str],
+) -> SessionOutcome:
+    """Process-pool worker: validate one session and write its text reports."""
+    started = time.perf_counter()
+    outcome = SessionOutcome(project, session)
+    session_report_dir = Path(report_dir) / project / session if report_dir else None
+    try:
+        results = run_validators(
+            project,
+            session,
+            report_dir=session_report_dir,
+            validators=validators,
+            root=Path(root),
+            accept_stage_root=accept_stage_root,
+            cache=cache,
+        )
+        outcome.results = [r.to_dict() for r in results]
+    except Exception as exc:  # a broken session must not sink the batch
+        outcome.error = f"{type(exc).__name__}: {exc}"
+    outcome.duration = time.perf_counter() - started
+    return outcome
+
+
+def validate_all(
+    sessions: Sequence[Tuple[str, str]],
+    validators: Optional[Sequence[str]] = None,
+    report_dir: Optional[Path] = None,
+    root: Path = Path("."),
+    max_workers: Optional[int] = None,
+    accept_stage_root: bool = False,
+    cache: Optional[Path] = None,
+) -> List[SessionOutcome]:
+    """Validate ``sessions`` in parallel; results keep the input order."""
+    validators = list(validators or VALIDATORS)
+    unknown = [name for name in validators if name not in VALIDATORS]
+    if unknown:
+        raise ValueError(f"Unknown validator(s): {', '.join(unknown)}")
+    if not sessions:
+        return []
+
+    args = (
+        validators,
+        str(root),
+        str(report_dir) if report_dir else None,
+        accept_stage_root,
+        str(cache) if cache else None,
+    )
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(sessions)))
+    if workers == 1:
+        return [_validate_session(p, s, *args) for p, s in sessions]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_validate_session, p, s, *args) for p, s in sessions]
+        return [f.result() for f in futures]
+
+
+def write_json_report(outcomes: Sequence[SessionOutcome], path: Path) -> Path:
+    failed = [o for o in outcomes if o.exit_code]
+    payload = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "sessions": len(outcomes),
+        "failed": len(failed),
+        "results": [
+            {
+                "project": o.project,
+                "session": o.session,
+                "exit_code": o.exit_code,
+                "duration": round(o.duration, 4),
+                "error": o.error,
+                "validators": o.results,
+            }
+            for o in outcomes
+        ],
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return path
+
+
+def write_junit_report(outcomes: Sequence[SessionOutcome], path: Path) -> Path:
+    """One <testsuite> per validator, one <testcase> per session."""
+    suites = ET.Element("testsuites", name="idse-governance")
+    by_validator: Dict[str, ET.Element] = {}
+    counts: Dict[str, Dict[str, int]] = {}
+
+    def case(suite_name: str, o: SessionOutcome) -> ET.Element:
+        if suite_name not in by_validator:
+            by_validator[suite_name] = ET.SubElement(suites, "testsuite", name=suite_name)
+            counts[suite_name] = {"tests": 0, "failures": 0, "errors": 0}
+        counts[suite_name]["tests"] += 1
+        return ET.SubElement(by_validator[suite_name], "testcase", classname=o.project, name=o.session)
+
+    for o in outcomes:
+        if o.error:
+            ET.SubElement(case("session", o), "error", message=o.error)
+            counts["session"]["errors"] += 1
+            continue
+        for result in o.results:
+            name = str(result["validator"])
+            testcase = case(name, o)
+            if not result["ok"]:
+                counts[name]["failures"] += 1
+                messages = list(result["errors"]) or [f"exit code {result['exit_code']}"]
+                failure = ET.SubElement(testcase, "failure", message=str(messages[0]))
+                failure.text = "\n".join(str(m) for m in messages)
+
+    for name, element in by_validator.items():
+        for key, value in counts[name].items():
+            element.set(key, str(value))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(suites).write(path, encoding="utf-8", xml_declaration=True)
+    return path
+
+
+def run_batch(
+    validators: Sequence[str],
+    pattern: str = "*/*",
+    report_dir: Optional[Path] = None,
+    root: Path = Path("."),
+    max_workers: Optional[int] = None,
+    accept_stage_root: bool = False,
+    cache: Optional[Path] = None,
+) -> int:
+    """CLI entry point shared by the idse-governance scripts; returns the worst exit code."""
+    report_dir = Path(report_dir or Path("reports") / f"batch_{int(datetime.now(timezone.utc).timestamp())}")
+    sessions = discover_sessions(root, pattern)
+    if not sessions:
+        print(f"⚠️ No sessions match projects/{pattern}")
+        return 0
+
+    outcomes = validate_all(
+        sessions,
+        validators=validators,
+        report_dir=report_dir,
+        root=root,
+        max_workers=max_workers,
+        accept_stage_root=accept_stage_root,
+        cache=cache,
+    )
+    for o in outcomes:
+        status = "OK" if not o.exit_code else f"FAIL({o.exit_code})"
+        print(f"{o.project}/{o.session}: {status}" + (f" [{o.error}]" if o.error else ""))
+
+    failed = sum(1 for o in outcomes if o.exit_code)
+    print("")
+    print(f"Validated {len(outcomes)} session(s): {len(outcomes) - failed} passed, {failed} failed")
+    print(f"Report written: {write_json_report(outcomes, report_dir / JSON_REPORT)}")
+    print(f"Report written: {write_junit_report(outcomes, report_dir / JUNIT_REPORT)}")
+    return max((o.exit_code for o in outcomes), default=0)
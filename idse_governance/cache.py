@@ -0,0 +1,148 @@
+"""
+Content-hash cache for governance validation.
+
+Every content check the validators make is a substring test against a
+fixed set of needles (section markers, required feedback sections, the
+``[REQUIRES INPUT]`` placeholder). The cache stores, per artifact
+sha256, which needles the artifact contains, so a re-run only scans
+artifacts whose content changed:
+
+- ``files`` maps a path to its last (mtime_ns, size, sha256); when the stat
+  matches, the file is not even read (entries written within
+  ``RACY_WINDOW_NS`` of their mtime are always re-hashed, as git does)
+- ``results`` maps sha256 to the needles found in that content
+- The whole file is keyed by ``RULES_VERSION`` (validator version plus a
+  hash of the needle set); a rule change discards it
+
+Existence checks (metadata files, pointer, config) are plain stats and are
+always re-run. Saves merge with the on-disk copy under an exclusive lock
+so parallel batch workers can share one cache file.
+
+Configuration (environment):
+- IDSE_VALIDATION_CACHE: cache file, or ``off`` (default:
+  reports/.validation-cache.json under the repository root)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+try:  # Optional: POSIX advisory locking
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_CACHE_PATH = Path("reports") / ".validation-cache.json"
+CACHE_SETTING = os.environ.get("IDSE_VALIDATION_CACHE", "")
+RACY_WINDOW_NS = 2_000_000_000
+
+# (mtime_ns, size, sha256)
+FileStamp = Tuple[int, int, str]
+
+
+def rules_version(validator_version: str, needles: Iterable[str]) -> str:
+    digest = hashlib.sha256("\0".join(sorted(needles)).encode("utf-8")).hexdigest()[:16]
+    return f"{validator_version}-{digest}"
+
+
+def default_cache_path(root: Path = Path(".")) -> Optional[Path]:
+    """Cache file from IDSE_VALIDATION_CACHE, or None when disabled."""
+    if CACHE_SETTING.lower() in ("off", "0", "false", "none"):
+        return None
+    return Path(CACHE_SETTING) if CACHE_SETTING else Path(root) / DEFAULT_CACHE_PATH
+
+
+class ValidationCache:
+    """Per-artifact needle cache persisted as JSON."""
+
+    def __init__(self, path: Path, version: str):
+        self.path = Path(path)
+        self.version = version
+        self.files: Dict[str, FileStamp] = {}
+        self.results: Dict[str, FrozenSet[str]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        data = self._read_disk()
+        if data is None:
+            return
+        self.files = {p: tuple(v) for p, v in data.get("files", {}).items()}
+        self.results = {h: frozenset(v) for h, v in data.get("results", {}).items()}
+
+    def _read_disk(self) -> Optional[dict]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != self.version:
+            return None
+        return data
+
+    def lookup(self, path: str, full_path: Path, scan) -> Optional[FrozenSet[str]]:
+        """
+        Needles contained in ``full_path`` (None if it is not a file).
+
+        ``scan(bytes) -> frozenset`` runs only when the content hash is new.
+        """
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        stamp = self.files.get(path)
+        fresh = time.time_ns() - st.st_mtime_ns > RACY_WINDOW_NS
+        if fresh and stamp and stamp[0] == st.st_mtime_ns and stamp[1] == st.st_size and stamp[2] in self.results:
+            self.hits += 1
+            return self.results[stamp[2]]
+        try:
+            raw = full_path.read_bytes()
+        except OSError:
+            return frozenset()
+        digest = hashlib.sha256(raw).hexdigest()
+        needles = self.results.get(digest)
+        if needles is None:
+            self.misses += 1
+            needles = scan(raw)
+            self.results[digest] = needles
+        else:
+            self.hits += 1
+        new_stamp = (st.st_mtime_ns, st.st_size, digest) if fresh else (0, st.st_size, digest)
+        if stamp != new_stamp:
+            self.files[path] = new_stamp
+            self._dirty = True
+        return needles
+
+    def save(self) -> None:
+        """Merge with the on-disk cache and write it atomically."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with open(lock_path, "a+") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self._read_disk() or {}
+            files = {p: tuple(v) for p, v in data.get("files", {}).items()}
+            results = {h: frozenset(v) for h, v in data.get("results", {}).items()}
+            files.update(self.files)
+            results.update(self.results)
+            live = {stamp[2] for stamp in files.values()}
+            payload = {
+                "version": self.version,
+                "files": files,
+                "results": {h: sorted(v) for h, v in results.items() if h in live},
+            }
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        self._dirty = False
@@ -0,0 +1,534 @@
+"""
+In-process IDSE governance validators.
+
+The three governance checks (validate-artifacts, check-compliance,
+audit-feedback) run against one ``ArtifactSnapshot``: every artifact,
+metadata file and pointer the checks look at is read from disk once, then
+the validators run concurrently over the in-memory snapshot and return
+structured ``ValidationResult`` objects.
+
+The scripts in idse-governance/ are thin CLI wrappers around these
+functions and keep their original output, reports and exit codes.
+
+Dependency-free (standard library only) so it runs in CI and pre-commit.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Union
+
+from .cache import ValidationCache, rules_version
+
+# validate-artifacts
+PRIMARY_FILES = {
+    "intent":   "projects/{project}/sessions/{session}/intents/intent.md",
+    "context":  "projects/{project}/sessions/{session}/contexts/context.md",
+    "spec":     "projects/{project}/sessions/{session}/specs/spec.md",
+    "plan":     "projects/{project}/sessions/{session}/plans/plan.md",
+    "tasks":    "projects/{project}/sessions/{session}/tasks/tasks.md",
+    "implementation": "projects/{project}/sessions/{session}/implementation/README.md",
+    "feedback": "projects/{project}/sessions/{session}/feedback/feedback.md",
+}
+
+LEGACY_FILES = {
+    "intent":   "intents/projects/{project}/sessions/{session}/intent.md",
+    "context":  "contexts/projects/{project}/sessions/{session}/context.md",
+    "spec":     "specs/projects/{project}/sessions/{session}/spec.md",
+    "plan":     "plans/projects/{project}/sessions/{session}/plan.md",
+    "tasks":    "tasks/projects/{project}/sessions/{session}/tasks.md",
+    "implementation": "implementation/projects/{project}/sessions/{session}/README.md",
+    "feedback": "feedback/projects/{project}/sessions/{session}/feedback.md",
+}
+
+SIMPLE_CHECKS = {
+    "intent": ["# Intent", "Overview"],
+    "context": ["# Context", "Technical Environment"],
+    "spec": ["# Specification", "Acceptance Criteria", "Overview"],
+    "plan": ["# Implementation Plan", "Phases"],
+    "tasks": ["# Tasks", "Phase"],
+}
+
+# check-compliance (adds the test plan)
+PRIMARY_ARTIFACTS = {
+    "intent": "projects/{project}/sessions/{session}/intents/intent.md",
+    "context": "projects/{project}/sessions/{session}/contexts/context.md",
+    "spec": "projects/{project}/sessions/{session}/specs/spec.md",
+    "plan": "projects/{project}/sessions/{session}/plans/plan.md",
+    "test-plan": "projects/{project}/sessions/{session}/plans/test-plan.md",
+    "tasks": "projects/{project}/sessions/{session}/tasks/tasks.md",
+    "feedback": "projects/{project}/sessions/{session}/feedback/feedback.md",
+    "implementation": "projects/{project}/sessions/{session}/implementation/README.md",
+}
+
+LEGACY_ARTIFACTS = {
+    "intent": "intents/projects/{project}/sessions/{session}/intent.md",
+    "context": "contexts/projects/{project}/sessions/{session}/context.md",
+    "spec": "specs/projects/{project}/sessions/{session}/spec.md",
+    "plan": "plans/projects/{project}/sessions/{session}/plan.md",
+    "test-plan": "plans/projects/{project}/sessions/{session}/test-plan.md",
+    "tasks": "tasks/projects/{project}/sessions/{session}/tasks.md",
+    "feedback": "feedback/projects/{project}/sessions/{session}/feedback.md",
+    "implementation": "implementation/projects/{project}/sessions/{session}/README.md",
+}
+
+GOVERNANCE_CONFIG = ".cursor/config/idse-governance.json"
+
+# audit-feedback
+FEEDBACK_FILE = "projects/{project}/sessions/{session}/feedback/feedback.md"
+REQUIRED_SECTIONS = [
+    "External / Internal Feedback",
+    "Impacted Artifacts",
+    "Risks / Issues Raised",
+    "Actions / Follow-ups",
+    "Decision Log",
+]
+
+# Article X Section 8
+METADATA_DIR = "projects/{project}/sessions/{session}/metadata"
+REQUIRED_METADATA = [".owner", ".collaborators", "changelog.md", "project-readme.md", "review-checklist.md"]
+POINTER_FILE = "projects/{project}/CURRENT_SESSION"
+
+PLACEHOLDER = "[REQUIRES INPUT]"
+
+# Bump when check semantics change; the cache is keyed on it
+VALIDATOR_VERSION = "1"
+
+# Every substring any content check looks for
+NEEDLES = frozenset(
+    [marker for markers in SIMPLE_CHECKS.values() for marker in markers]
+    + REQUIRED_SECTIONS
+    + [PLACEHOLDER]
+)
+RULES_VERSION = rules_version(VALIDATOR_VERSION, NEEDLES)
+
+
+def resolve_session_from_pointer(project: str, root: Path = Path(".")) -> Optional[str]:
+    """
+    Read session-id from projects/<project>/CURRENT_SESSION if it exists.
+
+    Returns:
+        str | None: Session ID or None if pointer doesn't exist
+    """
+    pointer_file = Path(root) / POINTER_FILE.format(project=project)
+    if not pointer_file.is_file():
+        return None
+
+    try:
+        with open(pointer_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("session_id:"):
+                    return line.split(":", 1)[1].strip()
+    except Exception:
+        return None
+
+    return None
+
+
+def open_cache(path: Union[Path, str]) -> ValidationCache:
+    return ValidationCache(Path(path), RULES_VERSION)
+
+
+def scan_needles(raw: bytes) -> FrozenSet[str]:
+    """The subset of ``NEEDLES`` an artifact contains."""
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return frozenset()  # unreadable as text; content checks will fail
+    return frozenset(needle for needle in NEEDLES if needle in text)
+
+
+@dataclass
+class ArtifactSnapshot:
+    """
+    Everything the validators read for one project/session, loaded once.
+
+    Artifacts are reduced to the set of ``NEEDLES`` they contain; with a
+    ``ValidationCache`` unchanged artifacts are not re-scanned.
+    """
+
+    project: str
+    session: str
+    root: Path = Path(".")
+    found: Dict[str, Optional[FrozenSet[str]]] = field(default_factory=dict)  # path -> needles (None if missing)
+    files: Set[str] = field(default_factory=set)  # existing non-artifact paths
+    dirs: Set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(
+        cls,
+        project: str,
+        session: str,
+        root: Path = Path("."),
+        accept_stage_root: bool = False,
+        cache: Optional[ValidationCache] = None,
+    ) -> "ArtifactSnapshot":
+        snapshot = cls(project=project, session=session, root=Path(root))
+        templates = [*PRIMARY_FILES.values(), *PRIMARY_ARTIFACTS.values(), FEEDBACK_FILE]
+        if accept_stage_root:
+            templates += [*LEGACY_FILES.values(), *LEGACY_ARTIFACTS.values()]
+        for template in dict.fromkeys(templates):
+            path = snapshot.path(template)
+            full = snapshot.root / path
+            if cache is not None:
+                snapshot.found[path] = cache.lookup(path, full, scan_needles)
+            elif full.is_file():
+                try:
+                    snapshot.found[path] = scan_needles(full.read_bytes())
+                except OSError:
+                    snapshot.found[path] = frozenset()
+            else:
+                snapshot.found[path] = None
+        if cache is not None:
+            cache.save()
+
+        metadata_dir = snapshot.path(METADATA_DIR)
+        if os.path.isdir(snapshot.root / metadata_dir):
+            snapshot.dirs.add(metadata_dir)
+            for fname in REQUIRED_METADATA:
+                snapshot._stat(os.path.join(metadata_dir, fname))
+        snapshot._stat(snapshot.path(POINTER_FILE))
+        snapshot._stat(GOVERNANCE_CONFIG)
+        return snapshot
+
+    def path(self, template: str) -> str:
+        return template.format(project=self.project, session=self.session)
+
+    def exists(self, path: str) -> bool:
+        return self.found.get(path) is not None or path in self.files
+
+    def contains(self, path: str, needle: str) -> bool:
+        return needle in (self.found.get(path) or ())
+
+    def is_dir(self, path: str) -> bool:
+        return path in self.dirs
+
+    def _stat(self, path: str) -> None:
+        if os.path.isfile(self.root / path):
+            self.files.add(path)
+
+
+class Check(NamedTuple):
+    name: str
+    path: str
+    ok: bool
+    note: str
+
+
+@dataclass
+class ValidationResult:
+    """Structured outcome of one validator."""
+
+    validator: str
+    exit_code: int
+    report: str
+    checks: List[Check] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    report_path: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "validator": self.validator,
+            "exit_code": self.exit_code,
+            "ok": self.ok,
+            "errors": list(self.errors),
+            "warnings": list(self.warnings),
+            "checks": [c._asdict() for c in self.checks],
+            "report_path": str(self.report_path) if self.report_path else None,
+        }
+
+    def write_report(self, report_dir: Path) -> Path:
+        report_dir = Path(report_dir)
+        report_dir.mkdir(parents=True, exist_ok=True)
+        self.report_path = report_dir / REPORT_FILES[self.validator]
+        self.report_path.write_text(self.report, encoding="utf-8")
+        return self.report_path
+
+
+def _resolve_paths(
+    snapshot: ArtifactSnapshot,
+    primary: Dict[str, str],
+    legacy: Dict[str, str],
+    accept_stage_root: bool,
+):
+    """Map artifact keys to canonical (or accepted legacy) paths."""
+    path_map: Dict[str, str] = {}
+    legacy_used: List[tuple] = []
+    drift: List[tuple] = []
+    for key, template in primary.items():
+        primary_path = snapshot.path(template)
+        legacy_path = snapshot.path(legacy.get(key, ""))
+        if snapshot.exists(primary_path):
+            path_map[key] = primary_path
+            if accept_stage_root and snapshot.exists(legacy_path) and legacy_path != primary_path:
+                drift.append((key, legacy_path))
+        elif accept_stage_root and snapshot.exists(legacy_path):
+            path_map[key] = legacy_path
+            legacy_used.append((key, legacy_path))
+        else:
+            path_map[key] = primary_path
+    return path_map, legacy_used, drift
+
+
+def validate_artifacts(
+    snapshot: ArtifactSnapshot,
+    report_dir: Optional[str] = None,
+    accept_stage_root: bool = False,
+    accept_projects_pointer: bool = False,
+) -> ValidationResult:
+    """Artifact presence, section markers, metadata and pointer consistency (exit 0/2)."""
+    project, session = snapshot.project, snapshot.session
+    results: List[Check] = []
+    overall_ok = True
+
+    path_map, legacy_used, drift_detected = _resolve_paths(snapshot, PRIMARY_FILES, LEGACY_FILES, accept_stage_root)
+
+    for key, path in path_map.items():
+        if snapshot.exists(path):
+            results.append(Check(key, path, True, "found"))
+            checks = SIMPLE_CHECKS.get(key, [])
+            missing_checks = [c for c in checks if c and not snapshot.contains(path, c)]
+            if missing_checks:
+                overall_ok = False
+                results.append(Check(f"{key}.content", path, False, f"missing markers: {missing_checks}"))
+        else:
+            overall_ok = False
+            results.append(Check(key, path, False, "missing"))
+
+    for key, path in legacy_used:
+        results.append(Check(f"{key}.legacy", path, False,
+                             "using legacy stage-root path (grace period, migrate to projects-rooted)"))
+        overall_ok = False
+
+    for key, path in drift_detected:
+        results.append(Check(f"{key}.drift", path, False,
+                             "legacy and canonical both exist; verify canonical is source of truth"))
+        overall_ok = False
+
+    # Metadata check (Article X Section 8)
+    metadata_dir = os.path.join("projects", project, "sessions", session, "metadata")
+    if not snapshot.is_dir(snapshot.path(METADATA_DIR)):
+        overall_ok = False
+        results.append(Check("metadata.dir", metadata_dir, False, "metadata directory missing (Article X Section 8)"))
+    else:
+        for fname in REQUIRED_METADATA:
+            mpath = os.path.join(metadata_dir, fname)
+            if snapshot.exists(mpath):
+                results.append(Check(f"metadata.{fname}", mpath, True, "found"))
+            else:
+                overall_ok = False
+                results.append(Check(f"metadata.{fname}", mpath, False, "missing (Article X Section 8)"))
+
+    # Check pointer consistency (projects-rooted canonical)
+    pointer_file = snapshot.path(POINTER_FILE)
+    if snapshot.exists(pointer_file):
+        missing_canonical = [
+            snapshot.path(tmpl) for tmpl in PRIMARY_FILES.values() if not snapshot.exists(snapshot.path(tmpl))
+        ]
+        if missing_canonical:
+            overall_ok = False
+            results.append(Check("pointer.consistency", pointer_file, False,
+                                 f"CURRENT_SESSION points to session but {len(missing_canonical)} canonical artifacts missing"))
+
+    lines = [
+        f"validate-artifacts: project={project} session={session}",
+        f"report_dir: {report_dir}",
+        "mode: projects-root canonical" + (" (legacy stage-root accepted)" if accept_stage_root else ""),
+    ]
+    if accept_projects_pointer:
+        lines.append("session_resolution: CURRENT_SESSION pointer allowed (Article X, Section 4)")
+    lines.append("")
+    lines.append("Checks:")
+    for name, path, ok, note in results:
+        lines.append(f" - {name}: {'OK' if ok else 'FAIL'} -> {path} ({note})")
+    lines.append("")
+    lines.append("Overall: " + ("PASS" if overall_ok else "FAIL"))
+
+    return ValidationResult(
+        validator="validate-artifacts",
+        exit_code=0 if overall_ok else 2,
+        report="\n".join(lines),
+        checks=results,
+        errors=[f"{c.name}: {c.note}" for c in results if not c.ok],
+    )
+
+
+def check_compliance(
+    snapshot: ArtifactSnapshot,
+    report_dir: Optional[str] = None,
+    accept_stage_root: bool = False,
+    accept_projects_pointer: bool = False,
+) -> ValidationResult:
+    """Artifact presence, placeholders, governance config and metadata (exit 0/1)."""
+    project, session = snapshot.project, snapshot.session
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    # Governance config presence
+    if not snapshot.exists(GOVERNANCE_CONFIG):
+        warnings.append(f"Governance config missing: {GOVERNANCE_CONFIG}")
+
+    # Artifact presence and placeholder scan
+    path_map, legacy_used, drift = _resolve_paths(snapshot, PRIMARY_ARTIFACTS, LEGACY_ARTIFACTS, accept_stage_root)
+
+    for path in path_map.values():
+        if not snapshot.exists(path):
+            errors.append(f"Missing artifact: {path}")
+            continue
+        if snapshot.contains(path, PLACEHOLDER):
+            warnings.append(f"Placeholder '{PLACEHOLDER}' found in {path}")
+
+    if legacy_used:
+        errors.append("Legacy stage-root artifacts in use (grace period only): " + ", ".join(p for _, p in legacy_used))
+
+    if drift:
+        errors.append("Legacy artifacts present alongside canonical projects-root: " + ", ".join(p for _, p in drift))
+
+    # Metadata (Article X Section 8)
+    metadata_dir = snapshot.path(METADATA_DIR)
+    if not snapshot.is_dir(metadata_dir):
+        errors.append(f"Metadata directory missing: {metadata_dir} (Article X Section 8)")
+    else:
+        for fname in REQUIRED_METADATA:
+            mpath = f"{metadata_dir}/{fname}"
+            if not snapshot.exists(os.path.join(metadata_dir, fname)):
+                errors.append(f"Missing metadata file: {mpath} (Article X Section 8)")
+
+    # Check if pointer exists but canonical artifacts missing (Article X warning)
+    if snapshot.exists(snapshot.path(POINTER_FILE)):
+        missing_canonical = [
+            tmpl for tmpl in PRIMARY_ARTIFACTS.values() if not snapshot.exists(snapshot.path(tmpl))
+        ]
+        if missing_canonical:
+            errors.append(f"CURRENT_SESSION pointer exists but {len(missing_canonical)} canonical artifacts missing")
+
+    lines = [
+        f"check-compliance: project={project} session={session}",
+        f"report_dir: {report_dir}",
+        "mode: projects-root canonical" + (" (legacy stage-root accepted)" if accept_stage_root else ""),
+    ]
+    if accept_projects_pointer:
+        lines.append("session_resolution: CURRENT_SESSION pointer allowed")
+    lines.append(f"timestamp: {datetime.now(timezone.utc).isoformat()}")
+    lines.append("")
+    lines.append("Findings:")
+    lines.extend(f"ERROR: {err}" for err in errors)
+    lines.extend(f"WARNING: {w}" for w in warnings)
+    if not errors and not warnings:
+        lines.append("OK: No compliance issues detected.")
+
+    return ValidationResult(
+        validator="check-compliance",
+        exit_code=1 if errors else 0,
+        report="\n".join(lines),
+        errors=errors,
+        warnings=warnings,
+    )
+
+
+def audit_feedback(snapshot: ArtifactSnapshot, report_dir: Optional[str] = None, **_: bool) -> ValidationResult:
+    """feedback.md presence, required sections and placeholders (exit 0/1)."""
+    project, session = snapshot.project, snapshot.session
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    feedback_path = snapshot.path(FEEDBACK_FILE)
+    if not snapshot.exists(feedback_path):
+        errors.append(f"Missing feedback file: {feedback_path}")
+    else:
+        for section in REQUIRED_SECTIONS:
+            if not snapshot.contains(feedback_path, section):
+                errors.append(f"Missing section in feedback: {section}")
+        if snapshot.contains(feedback_path, PLACEHOLDER):
+            warnings.append(f"Feedback contains placeholder {PLACEHOLDER}: {feedback_path}")
+
+    lines = [
+        f"audit-feedback: project={project} session={session}",
+        f"report_dir: {report_dir}",
+        f"timestamp: {datetime.now(timezone.utc).replace(tzinfo=None).isoformat()}Z",
+        "",
+        "Findings:",
+    ]
+    lines.extend(f"ERROR: {err}" for err in errors)
+    lines.extend(f"WARNING: {w}" for w in warnings)
+    if not errors and not warnings:
+        lines.append("OK: Feedback meets required sections.")
+
+    return ValidationResult(
+        validator="audit-feedback",
+        exit_code=1 if errors else 0,
+        report="\n".join(lines),
+        errors=errors,
+        warnings=warnings,
+    )
+
+
+Validator = Callable[..., ValidationResult]
+
+VALIDATORS: Dict[str, Validator] = {
+    "validate-artifacts": validate_artifacts,
+    "check-compliance": check_compliance,
+    "audit-feedback": audit_feedback,
+}
+
+REPORT_FILES = {
+    "validate-artifacts": "validate-artifacts-report.txt",
+    "check-compliance": "check-compliance-report.txt",
+    "audit-feedback": "audit-feedback-report.txt",
+}
+
+
+def run_validators(
+    project: str,
+    session: str,
+    report_dir: Optional[Path] = None,
+    validators: Optional[Sequence[str]] = None,
+    root: Path = Path("."),
+    accept_stage_root: bool = False,
+    accept_projects_pointer: bool = False,
+    snapshot: Optional[ArtifactSnapshot] = None,
+    cache: Union[Path, str, None] = None,
+) -> List[ValidationResult]:
+    """
+    Run validators concurrently over one shared snapshot.
+
+    Results come back in the order of ``validators`` (default: all three).
+    Reports are written to ``report_dir`` when one is given. ``cache`` is a
+    ``ValidationCache`` file; only artifacts whose hash changed are re-scanned.
+    """
+    names: Iterable[str] = validators or list(VALIDATORS)
+    unknown = [name for name in names if name not in VALIDATORS]
+    if unknown:
+        raise ValueError(f"Unknown validator(s): {', '.join(unknown)}")
+    if snapshot is None:
+        snapshot = ArtifactSnapshot.load(
+            project,
+            session,
+            root=root,
+            accept_stage_root=accept_stage_root,
+            cache=open_cache(cache) if cache else None,
+        )
+    options = {
+        "report_dir": str(report_dir) if report_dir is not None else None,
+        "accept_stage_root": accept_stage_root,
+        "accept_projects_pointer": accept_projects_pointer,
+    }
+
+    def run(name: str) -> ValidationResult:
+        result = VALIDATORS[name](snapshot, **options)
+        if report_dir is not None:
+            result.write_report(Path(report_dir))
+        return result
+
+    names = list(names)
+    with ThreadPoolExecutor(max_workers=len(names) or 1) as pool:
+        return list(pool.map(run, names))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+benchmark_guardrails.py
+
+Purpose:
+    Measure per-pattern latency of the instruction-protection guardrails
+    on benign, injection and adversarial (backtracking-prone) corpora of
+    increasing size, and fail if any pattern's p99 exceeds the budget.
+    See idse_developer_agent/guardrails/benchmark.py.
+
+Usage:
+    python3 scripts/benchmark_guardrails.py
+    python3 scripts/benchmark_guardrails.py --sizes 1024 16384 65536 --repeats 5
+    python3 scripts/benchmark_guardrails.py --budget-ms 10 --json reports/guardrail-latency.json
+
+Exit codes:
+    0  every pattern within budget
+    1  at least one pattern over budget
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from idse_developer_agent.guardrails import benchmark  # noqa: E402
+from idse_developer_agent.guardrails.instruction_protection import (  # noqa: E402
+    BOUNDARY_RULES,
+    INPUT_RULES,
+    OUTPUT_RULES,
+)
+
+GUARDRAILS = {"input": INPUT_RULES, "output": OUTPUT_RULES, "boundary": BOUNDARY_RULES}
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark guardrail latency per pattern.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(benchmark.DEFAULT_SIZES),
+                        help="Message sizes in characters")
+    parser.add_argument("--repeats", type=int, default=3, help="Timings per input")
+    parser.add_argument("--budget-ms", type=float, default=benchmark.DEFAULT_BUDGET_MS,
+                        help="p99 budget per pattern in milliseconds")
+    parser.add_argument("--json", type=Path, default=None, help="Also write results as JSON")
+    args = parser.parse_args(argv)
+
+    stats = benchmark.run_benchmark(GUARDRAILS, sizes=args.sizes, repeats=args.repeats,
+                                    lowercase=("input", "boundary"))
+    print(benchmark.format_table(stats, args.budget_ms))
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps({
+            "budget_ms": args.budget_ms,
+            "sizes": args.sizes,
+            "results": [s.as_dict() for s in stats],
+        }, indent=2), encoding="utf-8")
+        print(f"\nReport written: {args.json}")
+
+    slow = benchmark.over_budget(stats, args.budget_ms)
+    if slow:
+        print(f"\n❌ {len(slow)} pattern(s) over the {args.budget_ms} ms p99 budget: "
+              + ", ".join(f"{s.guardrail}:{s.rule_id}" for s in slow))
+        return 1
+    print(f"\n✅ All patterns within the {args.budget_ms} ms p99 budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+build_guardrail_rules.py
+
+Purpose:
+    Compile the guardrail rules (idse_developer_agent/guardrails/rules.py)
+    into the shared artifact companion_bundle/guardrails/compiled_rules.json
+    and copy the matcher next to it, so the agent and the companion bundle
+    load one precompiled rule set. Run after editing rules.py or matcher.py.
+
+Usage:
+    python3 scripts/build_guardrail_rules.py
+    python3 scripts/build_guardrail_rules.py --check
+
+Exit codes:
+    0  artifact and matcher copy are up to date (after writing them, without --check)
+    1  --check only: artifact or matcher copy is stale
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import types
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+SOURCE_DIR = ROOT / "idse_developer_agent" / "guardrails"
+BUNDLE_DIR = ROOT / "companion_bundle" / "guardrails"
+ARTIFACT_PATH = BUNDLE_DIR / "compiled_rules.json"
+
+
+def _load_rules_module():
+    """Import rules.py and matcher.py without the agent package (or its dependencies)."""
+    package = types.ModuleType("_guardrail_sources")
+    package.__path__ = [str(SOURCE_DIR)]
+    sys.modules[package.__name__] = package
+    return importlib.import_module("_guardrail_sources.rules")
+
+
+def render_outputs() -> Dict[Path, bytes]:
+    """Expected content of every generated file."""
+    rules = _load_rules_module()
+    matcher = sys.modules["_guardrail_sources.matcher"]
+    artifact = matcher.build_artifact(rules.RULE_SETS)
+    return {
+        ARTIFACT_PATH: (json.dumps(artifact, indent=2) + "\n").encode("utf-8"),
+        BUNDLE_DIR / "matcher.py": (SOURCE_DIR / "matcher.py").read_bytes(),
+    }
+
+
+def stale_outputs(outputs: Dict[Path, bytes]) -> List[Path]:
+    return [path for path, content in outputs.items() if not path.exists() or path.read_bytes() != content]
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the shared guardrail rule artifact.")
+    parser.add_argument("--check", action="store_true", help="Only report whether generated files are stale")
+    args = parser.parse_args(argv)
+
+    outputs = render_outputs()
+    stale = stale_outputs(outputs)
+    version = json.loads(outputs[ARTIFACT_PATH])["version"]
+    if args.check:
+        for path in stale:
+            print(f"❌ {path.relative_to(ROOT)} is stale; run python3 scripts/build_guardrail_rules.py")
+        if not stale:
+            print(f"✅ Guardrail rules up to date (version {version})")
+        return 1 if stale else 0
+
+    for path in stale:
+        path.write_bytes(outputs[path])
+        print(f"Wrote {path.relative_to(ROOT)}")
+    print(f"Guardrail rules version {version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
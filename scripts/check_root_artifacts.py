@@ -24,6 +24,7 @@ ALLOWED = {
     "docs",
     "idse-governance",
     "idse_developer_agent",
+    "idse_governance",
     "implementation",
     "intents",
     "contexts",
@@ -51,6 +52,9 @@ ALLOWED = {
     ".env.template",
     "test_hang.py",
     "SessionManager.py",
+    "session_history.py",
+    ".idse_sessions_history.jsonl",
+    ".idse_sessions_history.jsonl.lock",
 }
 
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+migrate_page_storage_format.py
+
+Purpose:
+    Rewrite stored Puck/status pages in the current storage encoding
+    (compact JSON, optionally gzip/zstd for large pages; see
+    backend/services/doc_codec.py). Readers accept every encoding, so this
+    only reclaims space and parse time for data written before the change.
+
+Features:
+    - Dry-run by default (reports sizes; no writes unless --execute)
+    - File store: every data/puck_pages/*.json is re-encoded atomically and
+      the slug/summary index is rebuilt afterwards
+    - SQLite store: page bodies are re-encoded in a single transaction
+    - Pages already in the target encoding are left untouched
+
+Usage:
+    python3 scripts/migrate_page_storage_format.py
+    python3 scripts/migrate_page_storage_format.py --execute
+    python3 scripts/migrate_page_storage_format.py --compression gzip --min-bytes 16384 --execute
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from backend.services import doc_codec  # noqa: E402
+from backend.services.page_storage import PAGES_DIR, SQLITE_PATH, FilePageStorage  # noqa: E402
+
+# (documents seen, documents rewritten, bytes before, bytes after)
+Stats = Tuple[int, int, int, int]
+
+
+def migrate_files(pages_dir: Path, compression: str, min_bytes: int, execute: bool) -> Stats:
+    seen = rewritten = before = after = 0
+    for path in sorted(pages_dir.glob("*.json")):
+        raw = path.read_bytes()
+        try:
+            data = doc_codec.decode(raw)
+        except (ValueError, RuntimeError) as exc:
+            print(f"  skip {path.name}: {exc}")
+            continue
+        encoded = doc_codec.encode(data, compression=compression, min_bytes=min_bytes)
+        seen += 1
+        before += len(raw)
+        after += len(encoded)
+        if encoded == raw:
+            continue
+        rewritten += 1
+        if execute:
+            doc_codec.write_document(path, data, compression=compression, min_bytes=min_bytes)
+    if execute and rewritten:
+        FilePageStorage(pages_dir).index.rebuild()
+    return seen, rewritten, before, after
+
+
+def migrate_sqlite(db_path: Path, compression: str, min_bytes: int, execute: bool) -> Stats:
+    seen = rewritten = before = after = 0
+    conn = sqlite3.connect(str(db_path))
+    try:
+        updates = []
+        for page_id, body in conn.execute("SELECT id, body FROM pages"):
+            raw = body.encode("utf-8") if isinstance(body, str) else body
+            try:
+                data = doc_codec.decode(body)
+            except (ValueError, RuntimeError) as exc:
+                print(f"  skip row {page_id}: {exc}")
+                continue
+            encoded = doc_codec.encode(data, compression=compression, min_bytes=min_bytes)
+            seen += 1
+            before += len(raw)
+            after += len(encoded)
+            if encoded != raw:
+                rewritten += 1
+                value = encoded.decode("utf-8") if doc_codec.encoding_of(encoded) == "compact" else encoded
+                updates.append((value, page_id))
+        if execute and updates:
+            with conn:
+                conn.executemany("UPDATE pages SET body = ? WHERE id = ?", updates)
+    finally:
+        conn.close()
+    return seen, rewritten, before, after
+
+
+def report(label: str, stats: Stats) -> None:
+    seen, rewritten, before, after = stats
+    print(f"{label}: {seen} page(s), {rewritten} to rewrite, {before:,} -> {after:,} bytes")
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-encode stored pages in the current storage format.")
+    parser.add_argument("--pages-dir", type=Path, default=PAGES_DIR, help="File store directory")
+    parser.add_argument("--sqlite", type=Path, default=SQLITE_PATH, help="SQLite store (skipped if missing)")
+    parser.add_argument("--compression", choices=doc_codec.COMPRESSIONS, default=doc_codec.COMPRESSION)
+    parser.add_argument("--min-bytes", type=int, default=doc_codec.COMPRESSION_MIN_BYTES)
+    parser.add_argument("--execute", action="store_true", help="Rewrite data (otherwise dry-run)")
+    args = parser.parse_args(argv)
+
+    print(f"Mode: {'EXECUTE' if args.execute else 'DRY-RUN'} (compression={args.compression})")
+    if args.pages_dir.is_dir():
+        report(f"Files {args.pages_dir}", migrate_files(args.pages_dir, args.compression, args.min_bytes, args.execute))
+    if args.sqlite.exists():
+        report(f"SQLite {args.sqlite}", migrate_sqlite(args.sqlite, args.compression, args.min_bytes, args.execute))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
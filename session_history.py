@@ -0,0 +1,270 @@
+"""
+Session history store for IDSE sessions.
+
+- Append-only JSON-lines log (.idse_sessions_history.jsonl): one compact
+  record per change, appended with a single O_APPEND write under an
+  exclusive file lock, so concurrent writers never lose updates
+- In-memory index keyed by (project, session_id); other writers' records
+  are picked up by reading only the bytes appended since the last read
+- The log is compacted (temp file + os.replace) once it holds
+  SESSION_HISTORY_COMPACT_SLACK more lines than live records
+- The legacy .idse_sessions_history.json is imported on first use
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:  # POSIX advisory locks; other platforms fall back to in-process locking
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+ROOT = Path(__file__).resolve().parent
+HISTORY_LOG = ROOT / ".idse_sessions_history.jsonl"
+LEGACY_HISTORY_FILE = ROOT / ".idse_sessions_history.json"
+
+COMPACT_SLACK = int(os.environ.get("SESSION_HISTORY_COMPACT_SLACK", "500"))
+
+SessionKey = Tuple[str, str]
+# (project, session_id, fields, latest)
+HistoryRecord = Tuple[str, str, Dict[str, Any], bool]
+
+
+def legacy_records(data: Dict[str, Any]) -> List[HistoryRecord]:
+    """
+    Flatten the legacy JSON history into records.
+
+    Two shapes are supported (and may be mixed within one project):
+    - old: {project: {session_id, name, created_at, owner, project}} for
+      the project's latest session
+    - new: {project: {session_id: {created_at, owner, status, ...}}}
+    """
+    records: List[HistoryRecord] = []
+    for project, entry in data.items():
+        if not isinstance(entry, dict):
+            continue
+        if "session_id" in entry:
+            fields = {k: v for k, v in entry.items() if not isinstance(v, dict)}
+            session_id = str(fields.pop("session_id"))
+            fields.pop("project", None)
+            records.append((project, session_id, fields, True))
+        for session_id, meta in entry.items():
+            if isinstance(meta, dict):
+                records.append((project, session_id, dict(meta), False))
+    return records
+
+
+class SessionHistory:
+    """Append-only, lock-protected session history with O(1) lookups."""
+
+    def __init__(
+        self,
+        path: Path = HISTORY_LOG,
+        legacy_path: Optional[Path] = LEGACY_HISTORY_FILE,
+        compact_slack: int = COMPACT_SLACK,
+    ):
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.compact_slack = compact_slack
+
+        self._mutex = threading.RLock()
+        self._lock_depth = 0
+        self._bootstrapped = False
+        self._records: Dict[SessionKey, Dict[str, Any]] = {}
+        self._latest: Dict[str, str] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._lines = 0
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+    def get(self, project: str, session_id: str, refresh: bool = True) -> Optional[Dict[str, Any]]:
+        """Return a copy of one session's record, or None."""
+        with self._mutex:
+            if refresh:
+                self.refresh()
+            record = self._records.get((project, session_id))
+            return dict(record) if record is not None else None
+
+    def latest(self, project: str, refresh: bool = True) -> Optional[Dict[str, Any]]:
+        """Return the project's most recently created/resumed session, or None."""
+        with self._mutex:
+            if refresh:
+                self.refresh()
+            session_id = self._latest.get(project)
+            if session_id is None:
+                return None
+            return dict(self._records[(project, session_id)])
+
+    def sessions(self, project: str, refresh: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Return {session_id: record} for one project."""
+        with self._mutex:
+            if refresh:
+                self.refresh()
+            return {sid: dict(r) for (p, sid), r in self._records.items() if p == project}
+
+    def refresh(self) -> bool:
+        """Read records appended since the last call; returns True if anything changed."""
+        with self._mutex:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                if self._bootstrap():
+                    return self.refresh()
+                changed = bool(self._records)
+                self._reset(None)
+                return changed
+
+            changed = False
+            if st.st_ino != self._inode or st.st_size < self._offset:
+                # First read, or the log was compacted/replaced
+                changed = bool(self._records)
+                self._reset(st.st_ino)
+            if st.st_size > self._offset:
+                changed = self._read_tail() or changed
+            return changed
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+    def record(self, project: str, session_id: str, latest: bool = False, **fields: Any) -> None:
+        """
+        Upsert a session record; latest=True also marks it as the project's
+        current session (used by resume).
+        """
+        self._append([(project, session_id, fields, latest)])
+
+    def import_legacy(self, path: Optional[Path] = None) -> int:
+        """Append every session from a legacy JSON history file; returns the count."""
+        path = Path(path) if path else self.legacy_path
+        with self._mutex, self._locked():
+            return self._import(path)
+
+    def compact(self) -> None:
+        """Rewrite the log with one line per live record."""
+        with self._mutex, self._locked():
+            self.refresh()
+            self._compact()
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive inter-process lock (re-entrant within this instance)."""
+        if self._lock_depth or fcntl is None:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _bootstrap(self) -> bool:
+        """Create the log from the legacy JSON file; True if the log now exists."""
+        if self._bootstrapped or self.legacy_path is None or not self.legacy_path.exists():
+            return False
+        self._bootstrapped = True
+        with self._locked():
+            if not self.path.exists():
+                self._import(self.legacy_path)
+        return self.path.exists()
+
+    def _import(self, path: Path) -> int:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+        records = legacy_records(data) if isinstance(data, dict) else []
+        self._write_lines(records)
+        return len(records)
+
+    def _append(self, records: Iterable[HistoryRecord]) -> None:
+        with self._mutex, self._locked():
+            # Catch up first so compaction decisions see every writer's records
+            self.refresh()
+            self._write_lines(records)
+            self.refresh()
+            if self._lines - len(self._records) > self.compact_slack:
+                self._compact()
+
+    def _write_lines(self, records: Iterable[HistoryRecord]) -> None:
+        payload = b"".join(self._encode(*record) for record in records)
+        if not payload:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _encode(project: str, session_id: str, fields: Dict[str, Any], latest: bool) -> bytes:
+        entry = {**fields, "project": project, "session_id": session_id}
+        if latest:
+            entry["latest"] = True
+        return (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+    def _compact(self) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as handle:
+            for (project, session_id), fields in self._records.items():
+                latest = self._latest.get(project) == session_id
+                handle.write(self._encode(project, session_id, fields, latest))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, self.path)
+        self.refresh()
+
+    def _reset(self, inode: Optional[int]) -> None:
+        self._records = {}
+        self._latest = {}
+        self._inode = inode
+        self._offset = 0
+        self._lines = 0
+
+    def _read_tail(self) -> bool:
+        with open(self.path, "rb") as handle:
+            handle.seek(self._offset)
+            data = handle.read()
+        # Only consume complete lines; a partial trailing write is read next time
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return False
+        self._offset += end
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                project = entry.pop("project")
+                session_id = entry.pop("session_id")
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+            latest = bool(entry.pop("latest", False))
+            record = self._records.setdefault(
+                (project, session_id), {"project": project, "session_id": session_id}
+            )
+            record.update(entry)
+            if latest:
+                self._latest[project] = session_id
+            self._lines += 1
+        return True
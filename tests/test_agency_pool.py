@@ -0,0 +1,288 @@
+"""
+Tests for the per-conversation Agency pool.
+"""
+
+import asyncio
+from contextlib import aclosing
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.agency_pool import (
+    AgencyPool,
+    LeaseTimeout,
+    get_response_text,
+    guard_stream,
+    new_thread_id,
+    stream_response_text,
+)
+
+
+class FakeAgency:
+    def __init__(self, n: int):
+        self.n = n
+
+
+def _pool(max_size: int = 2, anon_max_size: int = 4) -> AgencyPool:
+    counter = iter(range(1000))
+    return AgencyPool(factory=lambda: FakeAgency(next(counter)), max_size=max_size, anon_max_size=anon_max_size)
+
+
+def test_agencies_are_isolated_and_reused():
+    pool = _pool()
+
+    a = pool.get("P", "t1")
+    b = pool.get("P", "t2")
+
+    assert a is not b
+    assert pool.get("P", "t1") is a
+    assert pool.stats()["created"] == 2
+
+
+def test_lazy_construction():
+    pool = _pool()
+
+    assert len(pool) == 0
+    pool.get()
+    assert ("default", "default") in pool
+
+
+def test_lru_eviction_skips_busy_agencies():
+    pool = _pool(max_size=2)
+
+    async def scenario():
+        async with pool.lease("P", "busy"):
+            pool.get("P", "idle")
+            pool.get("P", "new")  # evicts "idle", never the leased one
+            assert ("P", "busy") in pool
+            assert ("P", "idle") not in pool
+            assert ("P", "new") in pool
+
+    asyncio.run(scenario())
+    assert pool.stats()["evicted"] == 1
+
+
+def test_same_conversation_is_serialized():
+    pool = _pool()
+    active = []
+    peak = []
+
+    async def chat(thread_id):
+        async with pool.lease("P", thread_id):
+            active.append(thread_id)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(thread_id)
+
+    async def scenario():
+        await asyncio.gather(chat("t1"), chat("t1"), chat("t1"))
+        assert max(peak) == 1
+        peak.clear()
+        await asyncio.gather(chat("t1"), chat("t2"))
+        assert max(peak) == 2
+
+    asyncio.run(scenario())
+
+
+def test_anonymous_requests_do_not_share_an_agency():
+    pool = _pool(max_size=8)
+    seen = []
+
+    async def chat():
+        async with pool.lease("P", None) as agency:
+            seen.append(agency)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(chat(), chat())
+
+    asyncio.run(scenario())
+    assert seen[0] is not seen[1]
+    assert new_thread_id() != new_thread_id()
+
+
+def test_anonymous_burst_keeps_named_conversations_warm():
+    pool = _pool(max_size=2, anon_max_size=2)
+    warm = pool.get("P", "t1")
+
+    async def one_shot():
+        async with pool.lease("P", None):
+            await asyncio.sleep(0)
+
+    async def scenario():
+        await asyncio.gather(*(one_shot() for _ in range(5)))
+
+    asyncio.run(scenario())
+    assert pool.get("P", "t1") is warm
+    assert pool.stats()["anonymous"] == 2 and len(pool) == 3
+
+    # An echoed-back anonymous id continues its conversation
+    thread_id = new_thread_id()
+    agency = pool.get("P", thread_id)
+    assert pool.get("P", thread_id) is agency
+
+
+def test_lease_wait_is_bounded():
+    pool = _pool()
+
+    async def scenario():
+        async with pool.lease("P", "t1"):
+            with pytest.raises(LeaseTimeout):
+                async with pool.lease("P", "t1", timeout=0.01):
+                    pass
+        # The lock is free again once the slow request finishes
+        async with pool.lease("P", "t1", timeout=0.01):
+            pass
+
+    asyncio.run(scenario())
+    assert pool.stats()["busy"] == 0
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        AgencyPool(factory=object, max_size=0)
+    with pytest.raises(ValueError):
+        AgencyPool(factory=object, anon_max_size=0)
+
+
+class FakeResult:
+    def __init__(self, final_output):
+        self.final_output = final_output
+
+
+class SlowAgency:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.cancelled = False
+
+    async def get_response(self, message):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return FakeResult(f"echo: {message}")
+
+
+def test_get_response_text_returns_final_output():
+    text = asyncio.run(get_response_text(SlowAgency(0), "hi"))
+
+    assert text == "echo: hi"
+
+
+def test_get_response_text_timeout_cancels_upstream_call():
+    agency = SlowAgency(5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(get_response_text(agency, "hi", timeout=0.01))
+    assert agency.cancelled is True
+
+
+def _delta(text):
+    return SimpleNamespace(
+        type="raw_response_event",
+        data=SimpleNamespace(type="response.output_text.delta", delta=text),
+    )
+
+
+class StreamingAgency:
+    def __init__(self, events, delay: float = 0):
+        self.events = events
+        self.delay = delay
+        self.closed = False
+
+    async def get_response_stream(self, message):
+        try:
+            for event in self.events:
+                await asyncio.sleep(self.delay)
+                yield event
+        finally:
+            self.closed = True
+
+
+async def _collect(agency, timeout=None, limit=None):
+    out = []
+    async with aclosing(stream_response_text(agency, "hi", timeout=timeout)) as deltas:
+        async for delta in deltas:
+            out.append(delta)
+            if limit is not None and len(out) >= limit:
+                break
+    return out
+
+
+def test_stream_yields_only_text_deltas():
+    events = [
+        SimpleNamespace(type="agent_updated_stream_event"),
+        _delta("Hel"),
+        SimpleNamespace(type="raw_response_event", data=SimpleNamespace(type="response.created")),
+        _delta("lo"),
+    ]
+    agency = StreamingAgency(events)
+
+    assert asyncio.run(_collect(agency)) == ["Hel", "lo"]
+    assert agency.closed is True
+
+
+def test_stream_closes_upstream_when_caller_stops():
+    agency = StreamingAgency([_delta("a"), _delta("b"), _delta("c")])
+
+    assert asyncio.run(_collect(agency, limit=1)) == ["a"]
+    assert agency.closed is True
+
+
+def test_stream_timeout_bounds_whole_response():
+    agency = StreamingAgency([_delta("x")] * 100, delay=0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(_collect(agency, timeout=0.05))
+    assert agency.closed is True
+
+
+def test_stream_error_event_raises():
+    agency = StreamingAgency([_delta("a"), {"type": "error", "content": "boom"}])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(_collect(agency))
+
+
+class FakeScanner:
+    """Holds back one character and blocks once it has seen the word."""
+
+    def __init__(self, word):
+        self.word = word
+        self.text = ""
+        self.sent = 0
+        self.match = None
+
+    def feed(self, delta):
+        self.text += delta
+        if self.word in self.text:
+            self.match = self.word
+            return SimpleNamespace(release="", blocked=True)
+        release, self.sent = self.text[self.sent:-1], max(self.sent, len(self.text) - 1)
+        return SimpleNamespace(release=release, blocked=False)
+
+    def close(self):
+        return SimpleNamespace(release=self.text[self.sent:], blocked=False)
+
+
+async def _guarded(agency, scanner):
+    async with aclosing(stream_response_text(agency, "hi")) as deltas, aclosing(guard_stream(deltas, scanner)) as released:
+        return [delta async for delta in released]
+
+
+def test_guard_stream_releases_scanned_text():
+    scanner = FakeScanner("secret")
+
+    assert "".join(asyncio.run(_guarded(StreamingAgency([_delta("Hel"), _delta("lo")]), scanner))) == "Hello"
+    assert scanner.match is None
+
+
+def test_guard_stream_stops_upstream_on_block():
+    agency = StreamingAgency([_delta("ok "), _delta("sec"), _delta("ret"), _delta("never sent")])
+    scanner = FakeScanner("secret")
+
+    released = asyncio.run(_guarded(agency, scanner))
+    assert "".join(released) == "ok se"
+    assert scanner.match == "secret"
+    assert agency.closed is True
@@ -0,0 +1,90 @@
+"""
+Tests for the AG-UI realtime endpoints (POST /inbound streaming to GET /stream).
+
+The agency is faked; replies go through the real output guardrail.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("agency_swarm")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routes import agui_realtime
+from backend.services.agency_pool import AgencyPool
+from idse_developer_agent.guardrails.instruction_protection import BLOCK_MESSAGES
+
+
+def _delta(text):
+    return SimpleNamespace(
+        type="raw_response_event",
+        data=SimpleNamespace(type="response.output_text.delta", delta=text),
+    )
+
+
+class StreamingAgency:
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.closed = False
+
+    async def get_response_stream(self, message):
+        try:
+            for text in self.deltas:
+                yield _delta(text)
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    """Post a message with a faked reply; return (agency, message events seen by a subscriber)."""
+
+    def run(deltas):
+        agency = StreamingAgency(deltas)
+        monkeypatch.setattr(agui_realtime, "agency_pool", AgencyPool(factory=lambda: agency))
+        app = FastAPI()
+        app.include_router(agui_realtime.router)
+        queue = asyncio.Queue()
+        agui_realtime.subscribers.add(queue)
+        try:
+            response = TestClient(app).post("/inbound", json={"type": "USER_MESSAGE", "content": "hi"})
+        finally:
+            agui_realtime.subscribers.discard(queue)
+        assert response.status_code == 200
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return agency, [e for e in events if e["type"].startswith("TEXT_MESSAGE")]
+
+    return run
+
+
+def test_reply_is_streamed_in_order(stream):
+    agency, events = stream(["Write the ", "spec first, ", "then the plan."])
+
+    assert [e["type"] for e in events][0] == "TEXT_MESSAGE_START"
+    assert events[-1]["type"] == "TEXT_MESSAGE_END"
+    assert "".join(e["delta"] for e in events if "delta" in e) == "Write the spec first, then the plan."
+    assert agency.closed is True
+
+
+@pytest.mark.parametrize(
+    "deltas, category",
+    [
+        (["Sure. My first rule, ", "Rule Nr", ". 1, says ", "never sent"], "verbatim"),
+        (["Here it is:\n", "IDSE GOVERN", "ANCE HEADER\n", "never sent"], "protected"),
+    ],
+)
+def test_protected_reply_is_blocked_mid_stream(stream, deltas, category):
+    agency, events = stream(deltas)
+
+    text = "".join(e["delta"] for e in events if "delta" in e)
+    assert "Rule Nr" not in text and "GOVERNANCE HEADER" not in text
+    assert "never sent" not in text
+    assert events[-2]["delta"].strip() == BLOCK_MESSAGES[category]
+    assert events[-1]["type"] == "TEXT_MESSAGE_END"
+    assert agency.closed is True
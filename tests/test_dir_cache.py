@@ -0,0 +1,60 @@
+"""
+Tests for the directory listing cache behind the file tree endpoint.
+"""
+
+import asyncio
+import os
+from unittest import mock
+
+from backend.routes import files_routes
+from backend.services.dir_cache import DirListingCache
+
+
+def test_hits_until_directory_mtime_changes(tmp_path):
+    cache = DirListingCache(max_entries=8)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return sorted(os.listdir(tmp_path))
+
+    assert cache.get(tmp_path, loader) == []
+    assert cache.get(tmp_path, loader) == []
+    (tmp_path / "new.md").write_text("x", encoding="utf-8")
+    os.utime(tmp_path, ns=(0, 0))  # force a different mtime even on coarse clocks
+
+    assert cache.get(tmp_path, loader) == ["new.md"]
+    assert len(loads) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_bounded_lru_and_invalidation(tmp_path):
+    cache = DirListingCache(max_entries=2)
+    dirs = [tmp_path / name for name in "abc"]
+    for path in dirs:
+        path.mkdir()
+        cache.get(path, lambda: path.name)
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"]) == (2, 1)
+
+    cache.invalidate([dirs[2]])
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["invalidations"] == 1
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+def test_repeated_tree_requests_are_served_from_memory(tmp_path, monkeypatch):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "a.md").write_text("x", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(files_routes, "tree_cache", DirListingCache())
+
+    first = asyncio.run(files_routes.get_file_tree(path=None, lazy=False, stream=False))
+    with mock.patch.object(files_routes.os, "scandir", side_effect=AssertionError("scandir called")):
+        assert asyncio.run(files_routes.get_file_tree(path=None, lazy=False, stream=False)) == first
+        assert asyncio.run(files_routes.get_file_tree(path="docs", lazy=True, stream=False)) == first[0]["children"]
+
+    stats = asyncio.run(files_routes.get_file_tree_cache_stats())
+    assert stats["misses"] == 2 and stats["hits"] >= 3
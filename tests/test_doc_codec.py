@@ -0,0 +1,119 @@
+"""
+Tests for the compact/compressed page storage encoding and its migration.
+"""
+
+import importlib.util
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from backend.services import doc_codec
+from backend.services.page_storage import FilePageStorage, SQLitePageStorage
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _page(page_id="1", blocks=1):
+    content = [{"id": f"b{i}", "type": "Text", "props": {"text": "lorem ipsum " * 20}} for i in range(blocks)]
+    return {"id": page_id, "slug": f"page-{page_id}", "title": "Page", "root": {}, "content": content}
+
+
+def test_compact_by_default_and_reads_legacy_pretty(tmp_path):
+    page = _page()
+    encoded = doc_codec.encode(page, compression="none")
+    assert encoded == json.dumps(page, separators=(",", ":")).encode("utf-8")
+    assert len(encoded) < len(json.dumps(page, indent=2))
+
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps(page, indent=2), encoding="utf-8")
+    assert doc_codec.encoding_of(legacy.read_bytes()) == "pretty"
+    assert doc_codec.read_document(legacy) == page
+
+
+def test_gzip_only_above_threshold():
+    small, large = _page(blocks=1), _page(blocks=200)
+
+    assert doc_codec.encoding_of(doc_codec.encode(small, compression="gzip", min_bytes=4096)) == "compact"
+    framed = doc_codec.encode(large, compression="gzip", min_bytes=4096)
+    assert doc_codec.encoding_of(framed) == "gzip"
+    assert len(framed) < len(doc_codec.dumps(large)) // 4
+    assert doc_codec.decode(framed) == large
+
+    with pytest.raises(ValueError):
+        doc_codec.encode(small, compression="brotli")
+
+
+@pytest.mark.parametrize("engine", ["file", "sqlite"])
+def test_storage_reads_every_encoding(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(doc_codec, "COMPRESSION", "gzip")
+    monkeypatch.setattr(doc_codec, "COMPRESSION_MIN_BYTES", 4096)
+    if engine == "file":
+        storage = FilePageStorage(tmp_path)
+    else:
+        storage = SQLitePageStorage(tmp_path / "pages.sqlite3", import_from=None)
+
+    storage.save(_page("big", blocks=200))
+    storage.save(_page("small"))
+    assert storage.get("big") == _page("big", blocks=200)
+    assert storage.get_by_slug("page-small")["id"] == "small"
+    if engine == "file":
+        assert doc_codec.encoding_of((tmp_path / "big.json").read_bytes()) == "gzip"
+        assert doc_codec.encoding_of((tmp_path / "small.json").read_bytes()) == "compact"
+        # A fresh index over compressed files still finds every page
+        assert {s["id"] for s in FilePageStorage(tmp_path).summaries()} == {"big", "small"}
+    else:
+        storage.close()
+
+
+def _migration():
+    spec = importlib.util.spec_from_file_location(
+        "migrate_page_storage_format", ROOT / "scripts" / "migrate_page_storage_format.py"
+    )
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def test_migration_rewrites_legacy_pages(tmp_path, capsys):
+    migration = _migration()
+
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    (pages_dir / "a.json").write_text(json.dumps(_page("a"), indent=2), encoding="utf-8")
+    (pages_dir / "b.json").write_text(json.dumps(_page("b", blocks=200), indent=2), encoding="utf-8")
+    before = (pages_dir / "a.json").read_bytes()
+    args = ["--pages-dir", str(pages_dir), "--sqlite", str(tmp_path / "none.sqlite3"), "--compression", "gzip"]
+
+    migration.main(args + ["--min-bytes", "4096"])
+    assert (pages_dir / "a.json").read_bytes() == before  # dry-run
+    assert "2 to rewrite" in capsys.readouterr().out
+
+    migration.main(args + ["--min-bytes", "4096", "--execute"])
+    assert doc_codec.encoding_of((pages_dir / "a.json").read_bytes()) == "compact"
+    assert doc_codec.encoding_of((pages_dir / "b.json").read_bytes()) == "gzip"
+    assert FilePageStorage(pages_dir).get("b") == _page("b", blocks=200)
+
+    migration.main(args + ["--min-bytes", "4096"])
+    assert "0 to rewrite" in capsys.readouterr().out
+
+
+def test_sqlite_migration_skips_corrupt_rows(tmp_path, capsys):
+    db_path = tmp_path / "pages.sqlite3"
+    storage = SQLitePageStorage(db_path, import_from=None)
+    storage.save(_page("good", blocks=200))
+    storage.save(_page("bad"))
+    storage.close()
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.execute("UPDATE pages SET body = ? WHERE id = 'bad'", ("{not json",))
+    conn.close()
+
+    stats = _migration().migrate_sqlite(db_path, "gzip", 4096, execute=True)
+    assert stats[:2] == (1, 1)
+    assert "skip row bad" in capsys.readouterr().out
+
+    storage = SQLitePageStorage(db_path, import_from=None)
+    assert storage.get("good") == _page("good", blocks=200)
+    storage.close()
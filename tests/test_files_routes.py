@@ -0,0 +1,72 @@
+"""
+Tests for the file tree endpoint (full and lazy listings).
+"""
+
+import asyncio
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from fastapi import HTTPException
+
+from backend.routes import files_routes
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    for rel in ["projects/demo/sessions/s1/spec.md", "projects/demo/notes.md", "docs/readme.md", "top.md"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x", encoding="utf-8")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "empty").mkdir()
+    (tmp_path / ".hidden").write_text("x", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _tree(path=None, lazy=False):
+    return asyncio.run(files_routes.get_file_tree(path=path, lazy=lazy, stream=False))
+
+
+def test_full_tree_is_unchanged(workspace):
+    tree = _tree()
+
+    assert [node["name"] for node in tree] == ["docs", "projects", "top.md"]
+    demo = tree[1]["children"][0]
+    assert [node["name"] for node in demo["children"]] == ["sessions", "notes.md"]
+    assert demo["children"][1] == {"name": "notes.md", "path": "projects/demo/notes.md", "type": "file"}
+
+
+def test_lazy_lists_one_level_with_child_counts(workspace):
+    with mock.patch.object(Path, "is_dir", wraps=Path.is_dir, autospec=True) as is_dir:
+        root = _tree(lazy=True)
+    # Only the requested folder itself is checked; entries use DirEntry types
+    assert is_dir.call_count <= 1
+
+    assert root == [
+        {"name": "docs", "path": "docs", "type": "folder", "child_count": 1},
+        {"name": "projects", "path": "projects", "type": "folder", "child_count": 1},
+        {"name": "top.md", "path": "top.md", "type": "file"},
+    ]
+    assert _tree(path="projects/demo") == [
+        {"name": "sessions", "path": "projects/demo/sessions", "type": "folder", "child_count": 1},
+        {"name": "notes.md", "path": "projects/demo/notes.md", "type": "file"},
+    ]
+
+
+def test_lazy_prunes_folders_without_files_like_the_full_tree(workspace):
+    (workspace / "docs" / "drafts" / "old" / "older").mkdir(parents=True)
+    (workspace / "shell" / "inner").mkdir(parents=True)
+
+    assert [node["name"] for node in _tree()] == ["docs", "projects", "top.md"]
+    assert [node["name"] for node in _tree(lazy=True)] == ["docs", "projects", "top.md"]
+    assert _tree(path="docs") == [{"name": "readme.md", "path": "docs/readme.md", "type": "file"}]
+    assert _tree(lazy=True)[0]["child_count"] == 1
+
+
+@pytest.mark.parametrize("path,status", [("../", 400), ("missing", 404), ("top.md", 404), ("node_modules", 404)])
+def test_lazy_rejects_bad_paths(workspace, path, status):
+    with pytest.raises(HTTPException) as exc:
+        _tree(path=path)
+    assert exc.value.status_code == status
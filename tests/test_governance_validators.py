@@ -0,0 +1,182 @@
+"""
+Tests for the in-process governance validators and their CLI wrappers.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from idse_governance import ArtifactSnapshot, run_validators, validate_artifacts
+from idse_governance.validators import PRIMARY_ARTIFACTS, REQUIRED_METADATA, REQUIRED_SECTIONS
+
+ROOT = Path(__file__).resolve().parents[1]
+PROJECT, SESSION = "Demo", "session-1"
+
+CONTENT = {
+    "intent": "# Intent\n\nOverview\n",
+    "context": "# Context\n\nTechnical Environment\n",
+    "spec": "# Specification\n\nOverview\n\nAcceptance Criteria\n",
+    "plan": "# Implementation Plan\n\nPhases\n",
+    "test-plan": "# Test Plan\n",
+    "tasks": "# Tasks\n\nPhase 1\n",
+    "implementation": "# Implementation\n",
+    "feedback": "# Feedback\n\n" + "\n".join(f"## {s}" for s in REQUIRED_SECTIONS) + "\n",
+}
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    for key, template in PRIMARY_ARTIFACTS.items():
+        path = tmp_path / template.format(project=PROJECT, session=SESSION)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(CONTENT[key], encoding="utf-8")
+    metadata = tmp_path / "projects" / PROJECT / "sessions" / SESSION / "metadata"
+    metadata.mkdir(parents=True)
+    for fname in REQUIRED_METADATA:
+        (metadata / fname).write_text("x\n", encoding="utf-8")
+    config = tmp_path / ".cursor" / "config" / "idse-governance.json"
+    config.parent.mkdir(parents=True)
+    config.write_text("{}", encoding="utf-8")
+    return tmp_path
+
+
+def _run_cli(script, root, *args):
+    return subprocess.run(
+        [sys.executable, str(ROOT / "idse-governance" / script), "--project", PROJECT, "--session", SESSION, *args],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def _stable(report):
+    """Report lines minus the ones that vary per run."""
+    return [line for line in report.splitlines() if not line.startswith(("report_dir:", "timestamp:"))]
+
+
+def test_complete_session_passes_all_validators(project_root):
+    results = run_validators(PROJECT, SESSION, report_dir=project_root / "reports", root=project_root)
+
+    assert [r.validator for r in results] == ["validate-artifacts", "check-compliance", "audit-feedback"]
+    assert all(r.ok for r in results), [r.report for r in results]
+    assert (project_root / "reports" / "check-compliance-report.txt").read_text().endswith(
+        "OK: No compliance issues detected."
+    )
+    assert "Overall: PASS" in results[0].report
+
+
+def test_failures_are_structured(project_root):
+    session_dir = project_root / "projects" / PROJECT / "sessions" / SESSION
+    (session_dir / "specs" / "spec.md").write_text("# Specification\n", encoding="utf-8")
+    (session_dir / "feedback" / "feedback.md").write_text("[REQUIRES INPUT]\n", encoding="utf-8")
+    (session_dir / "metadata" / ".owner").unlink()
+
+    snapshot = ArtifactSnapshot.load(PROJECT, SESSION, root=project_root)
+    validate, compliance, feedback = run_validators(PROJECT, SESSION, snapshot=snapshot)
+
+    assert validate.exit_code == 2
+    assert {c.name for c in validate.checks if not c.ok} == {"spec.content", "metadata..owner"}
+    assert compliance.exit_code == 1
+    assert any(".owner" in e for e in compliance.errors)
+    assert any("feedback.md" in w for w in compliance.warnings)
+    assert feedback.exit_code == 1
+    assert len(feedback.errors) == len(REQUIRED_SECTIONS)
+    assert validate_artifacts(snapshot).report == validate.report  # pure over the snapshot
+    with pytest.raises(ValueError):
+        run_validators(PROJECT, SESSION, validators=["nope"], snapshot=snapshot)
+
+
+def test_cli_wrappers_match_in_process_results(project_root):
+    (project_root / "projects" / PROJECT / "sessions" / SESSION / "plans" / "test-plan.md").unlink()
+    results = {r.validator: r for r in run_validators(PROJECT, SESSION, root=project_root)}
+
+    for script, validator in [
+        ("validate-artifacts.py", "validate-artifacts"),
+        ("check-compliance.py", "check-compliance"),
+        ("audit-feedback.py", "audit-feedback"),
+    ]:
+        completed = _run_cli(script, project_root, "--report-dir", "out")
+        assert completed.returncode == results[validator].exit_code, completed.stdout + completed.stderr
+        report = (project_root / "out" / f"{validator}-report.txt").read_text(encoding="utf-8")
+        assert _stable(report) == _stable(results[validator].report)
+        assert "Report written:" in completed.stdout
+
+    assert results["check-compliance"].exit_code == 1  # test-plan.md is only required by compliance
+    assert results["validate-artifacts"].exit_code == 0
+
+
+def test_batch_validates_every_session_in_parallel(project_root):
+    from xml.etree import ElementTree
+
+    from idse_governance import discover_sessions, validate_all
+    from idse_governance.batch import write_junit_report
+
+    broken = project_root / "projects" / "Other" / "sessions" / "s-2"
+    broken.mkdir(parents=True)
+    (project_root / "projects" / "Other" / "sessions" / ".hidden").mkdir()
+
+    assert discover_sessions(project_root) == [(PROJECT, SESSION), ("Other", "s-2")]
+    assert discover_sessions(project_root, "Oth*") == [("Other", "s-2")]
+    assert discover_sessions(project_root, "*/session-*") == [(PROJECT, SESSION)]
+
+    outcomes = validate_all(
+        discover_sessions(project_root), report_dir=project_root / "batch", root=project_root, max_workers=2
+    )
+    assert [(o.project, o.exit_code) for o in outcomes] == [(PROJECT, 0), ("Other", 2)]
+    assert (project_root / "batch" / "Other" / "s-2" / "audit-feedback-report.txt").exists()
+
+    suites = ElementTree.parse(write_junit_report(outcomes, project_root / "junit.xml")).getroot()
+    compliance = suites.find("testsuite[@name='check-compliance']")
+    assert (compliance.get("tests"), compliance.get("failures")) == ("2", "1")
+
+
+def test_cli_all_writes_aggregated_reports(project_root):
+    completed = subprocess.run(
+        [sys.executable, str(ROOT / "idse-governance" / "check-compliance.py"), "--all", "--report-dir", "ci"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    summary = json.loads((project_root / "ci" / "batch-report.json").read_text(encoding="utf-8"))
+    assert (summary["sessions"], summary["failed"]) == (1, 0)
+    assert summary["results"][0]["validators"][0]["validator"] == "check-compliance"
+    assert (project_root / "ci" / PROJECT / SESSION / "check-compliance-report.txt").exists()
+
+
+def test_cache_rescans_only_changed_artifacts(project_root, monkeypatch):
+    from idse_governance import cache as cache_module
+    from idse_governance.validators import open_cache
+
+    cache_file = project_root / "reports" / ".validation-cache.json"
+    baseline = [r.report for r in run_validators(PROJECT, SESSION, root=project_root)]
+
+    first = open_cache(cache_file)
+    ArtifactSnapshot.load(PROJECT, SESSION, root=project_root, cache=first)
+    assert first.misses == len(set(CONTENT.values()))  # identical contents hash once
+
+    # Files older than the racy window are trusted by stat alone
+    monkeypatch.setattr(cache_module, "RACY_WINDOW_NS", -(10**18))
+    second = open_cache(cache_file)
+    ArtifactSnapshot.load(PROJECT, SESSION, root=project_root, cache=second)
+    assert second.misses == 0
+
+    spec = project_root / "projects" / PROJECT / "sessions" / SESSION / "specs" / "spec.md"
+    spec.write_text("# Specification\n", encoding="utf-8")
+    third = open_cache(cache_file)
+    snapshot = ArtifactSnapshot.load(PROJECT, SESSION, root=project_root, cache=third)
+    assert third.misses == 1
+    assert validate_artifacts(snapshot).exit_code == 2
+
+    spec.write_text(CONTENT["spec"], encoding="utf-8")
+    results = run_validators(PROJECT, SESSION, root=project_root, cache=cache_file)
+    assert [r.report for r in results][0].splitlines()[3:] == baseline[0].splitlines()[3:]
+    assert all(r.ok for r in results)
+
+    cache_file.write_text('{"version": "stale", "files": {}, "results": {}}', encoding="utf-8")
+    assert open_cache(cache_file).files == {}
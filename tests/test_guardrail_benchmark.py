@@ -0,0 +1,56 @@
+"""
+Latency tests for the instruction-protection guardrails.
+
+Runs the benchmark harness on small corpora (benign, injection and
+adversarial near-misses) and fails if any pattern's p99 exceeds the budget.
+"""
+
+import pytest
+
+from idse_developer_agent.guardrails import benchmark
+from idse_developer_agent.guardrails.instruction_protection import (
+    BOUNDARY_RULES,
+    INPUT_RULES,
+    OUTPUT_RULES,
+)
+from idse_developer_agent.guardrails.matcher import Rule, RuleSet
+
+GUARDRAILS = {"input": INPUT_RULES, "output": OUTPUT_RULES, "boundary": BOUNDARY_RULES}
+
+# Generous for shared CI runners; the full-size run lives in scripts/benchmark_guardrails.py
+BUDGET_MS = max(benchmark.DEFAULT_BUDGET_MS, 50.0)
+
+
+@pytest.fixture(scope="module")
+def stats():
+    return benchmark.run_benchmark(GUARDRAILS, sizes=(256, 8192), repeats=2, lowercase=("input", "boundary"))
+
+
+def test_every_pattern_within_budget(stats):
+    slow = benchmark.over_budget(stats, BUDGET_MS)
+    assert not slow, benchmark.format_table(slow, BUDGET_MS)
+
+
+def test_reports_each_pattern_and_guardrail(stats):
+    rows = {(s.guardrail, s.rule_id) for s in stats}
+    for name, rules in GUARDRAILS.items():
+        assert (name, "*") in rows
+        assert all((name, rule.id) in rows for rule in rules.rules)
+    assert all(s.p50_ms <= s.p99_ms <= s.max_ms for s in stats)
+
+
+def test_corpora_exercise_the_rules():
+    sizes = (1024,)
+    assert all(INPUT_RULES.first_match(text.lower()) is None for _, text in benchmark.benign_corpus(sizes))
+    hits = [INPUT_RULES.first_match(text.lower()) for _, text in benchmark.injection_corpus(sizes)]
+    assert sum(hit is not None for hit in hits) >= 2
+    labels = [label for label, _ in benchmark.adversarial_corpus(GUARDRAILS.values(), sizes)]
+    assert len(labels) > len(INPUT_RULES) and "whitespace/1024" in labels
+
+
+def test_budget_violation_is_detected():
+    # Nested quantifiers still backtrack exponentially inside a single segment
+    slow_rules = {"slow": RuleSet([Rule("catastrophic", r"(a+)+$", "test")])}
+    stats = benchmark.run_benchmark(slow_rules, sizes=(18,), repeats=1)
+    assert benchmark.percentile([1.0, 2.0, 3.0, 100.0], 50) == 2.0
+    assert benchmark.over_budget(stats, budget_ms=0.0)
@@ -0,0 +1,69 @@
+"""
+Tests for the NDJSON streaming variants of the file tree and status listings.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from backend.routes import files_routes, status_routes
+from backend.routes.ndjson import ndjson_chunks
+from backend.services.status_service import StatusService
+
+
+def _read(response):
+    async def collect():
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "application/x-ndjson"
+    return [json.loads(line) for line in asyncio.run(collect()).splitlines()]
+
+
+def _flatten(nodes, depth=0):
+    for node in nodes:
+        yield {"name": node["name"], "path": node["path"], "type": node["type"], "depth": depth}
+        yield from _flatten(node.get("children", []), depth + 1)
+
+
+def test_chunks_hold_complete_lines():
+    chunks = list(ndjson_chunks(({"n": i} for i in range(100)), flush_bytes=64))
+    assert len(chunks) > 1
+    assert all(chunk.endswith("\n") for chunk in chunks)
+    assert [json.loads(line)["n"] for line in "".join(chunks).splitlines()] == list(range(100))
+
+
+def test_file_tree_stream_matches_nested_tree(tmp_path, monkeypatch):
+    for rel in ["a/b/c/deep.md", "a/top.md", "z.md", "docs/x/y.md"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x", encoding="utf-8")
+    (tmp_path / "a" / "empty" / "nested").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+
+    nested = asyncio.run(files_routes.get_file_tree(path=None, lazy=False, stream=False))
+    streamed = _read(asyncio.run(files_routes.get_file_tree(path=None, lazy=False, stream=True)))
+    assert streamed == list(_flatten(nested))
+    assert "a/empty" not in {node["path"] for node in streamed}
+
+    subtree = _read(asyncio.run(files_routes.get_file_tree(path="docs", lazy=False, stream=True)))
+    assert [node["path"] for node in subtree] == ["docs/x", "docs/x/y.md"]
+
+
+def test_project_and_session_listings_stream(tmp_path, monkeypatch):
+    for session in ("s1", "s2"):
+        (tmp_path / "projects" / "Demo" / "sessions" / session / "specs").mkdir(parents=True)
+    service = StatusService(root=tmp_path, ttl=None)
+    monkeypatch.setattr(status_routes, "status_service", service)
+
+    projects = _read(asyncio.run(status_routes.list_projects(stream=True)))
+    assert projects == [{"project_id": "Demo"}]
+
+    sessions = _read(asyncio.run(status_routes.get_project_sessions("Demo", stream=True)))
+    expected = status_routes.asdict(service.get_project_sessions("Demo"))["sessions"]
+    assert sessions == json.loads(json.dumps(expected))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(status_routes.get_project_sessions("Nope", stream=True))
+    assert exc.value.status_code == 404
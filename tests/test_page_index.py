@@ -0,0 +1,130 @@
+"""
+Tests for the Puck page slug/summary index.
+"""
+
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+from fastapi import HTTPException, Response
+
+from backend.routes import puck_routes
+from backend.services import page_index as page_index_module
+from backend.services.page_index import INDEX_FILENAME, PageIndex
+from backend.services.page_storage import FilePageStorage
+
+
+def _write_page(pages_dir, key, **data):
+    (pages_dir / f"{key}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(puck_routes, "page_storage", FilePageStorage(tmp_path))
+    return tmp_path
+
+
+async def _list_pages(**params):
+    params = {"q": None, "sort": "-updated_at", "cursor": None, "limit": None, "if_none_match": None, **params}
+    return await puck_routes.list_pages(Response(), **params)
+
+
+def test_index_is_built_from_existing_files(tmp_path):
+    _write_page(tmp_path, "a", id="a", slug="home", title="Home", updated_at="t1")
+    _write_page(tmp_path, "b", id="b", slug="about", root={"title": "About us"})
+    index = PageIndex(tmp_path)
+
+    assert index.key_for_slug("home") == "a"
+    assert index.slug_taken("about") is True
+    assert index.slug_taken("about", exclude_id="b") is False
+    assert sorted(s["title"] for s in index.summaries()) == ["About us", "Home"]
+    assert (tmp_path / INDEX_FILENAME).exists()
+
+
+def test_lookups_and_listing_do_not_parse_pages(tmp_path):
+    _write_page(tmp_path, "a", id="a", slug="home", title="Home")
+    PageIndex(tmp_path).summaries()  # persist the sidecar
+    index = PageIndex(tmp_path)
+
+    real_loads = json.loads
+    parsed = []
+
+    def tracking_loads(text, *args, **kwargs):
+        parsed.append(text)
+        return real_loads(text, *args, **kwargs)
+
+    with mock.patch.object(page_index_module.json, "loads", side_effect=tracking_loads):
+        assert index.key_for_slug("home") == "a"
+        index.summaries()
+    # Only the sidecar itself is read; the page file is unchanged
+    assert len(parsed) == 1
+
+
+def test_reconcile_picks_up_out_of_band_changes(tmp_path):
+    _write_page(tmp_path, "a", id="a", slug="home", title="Home")
+    PageIndex(tmp_path).summaries()
+
+    _write_page(tmp_path, "a", id="a", slug="start", title="Start page")
+    _write_page(tmp_path, "b", id="b", slug="new", title="New")
+    index = PageIndex(tmp_path)
+
+    assert index.key_for_slug("home") is None
+    assert index.key_for_slug("start") == "a"
+    assert index.key_for_slug("new") == "b"
+
+
+def test_other_instances_see_updates(tmp_path):
+    first = PageIndex(tmp_path)
+    second = PageIndex(tmp_path)
+    assert len(second) == 0
+
+    _write_page(tmp_path, "a", id="a", slug="home")
+    first.put("a", {"id": "a", "slug": "home"})
+
+    assert second.key_for_slug("home") == "a"
+
+
+def test_routes_use_index_for_crud(pages):
+    async def scenario():
+        created = await puck_routes.create_page({"title": "Home"})
+        duplicate = await puck_routes.create_page({"title": "Home"})
+        assert duplicate["slug"] == "home-1"
+
+        assert (await puck_routes.get_page("home"))["id"] == created["id"]
+        await puck_routes.update_page("home", {"slug": "landing"})
+        assert (await puck_routes.get_page("landing"))["id"] == created["id"]
+        with pytest.raises(puck_routes.HTTPException):
+            await puck_routes.get_page("home")
+
+        await puck_routes.delete_page("landing")
+        listing = await _list_pages()
+        return [p["slug"] for p in listing["pages"]]
+
+    assert asyncio.run(scenario()) == ["home-1"]
+
+
+def test_listing_etag_short_circuits_without_reading_pages(pages):
+    async def scenario():
+        await puck_routes.create_page({"title": "Home"})
+        response = Response()
+        await puck_routes.list_pages(
+            response, q=None, sort="-updated_at", cursor=None, limit=None, if_none_match=None
+        )
+        etag = response.headers["etag"]
+
+        with mock.patch.object(page_index_module.json, "loads") as loads:
+            cached = await _list_pages(if_none_match=etag)
+        loads.assert_not_called()
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+        await puck_routes.create_page({"title": "About"})
+        fresh = await _list_pages(if_none_match=etag, limit=1)
+        assert len(fresh["pages"]) == 1 and fresh["next_cursor"]
+
+        with pytest.raises(HTTPException) as exc:
+            await _list_pages(cursor="bogus")
+        assert exc.value.status_code == 400
+
+    asyncio.run(scenario())
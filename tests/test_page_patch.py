@@ -0,0 +1,145 @@
+"""
+Tests for JSON Patch / merge patch page updates with version checks.
+"""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from backend.routes import puck_routes
+from backend.services.page_patch import (
+    PatchError,
+    PatchTestFailed,
+    apply_json_patch,
+    apply_page_merge_patch,
+)
+from backend.services.page_storage import FilePageStorage
+
+
+def _doc():
+    return {
+        "title": "Home",
+        "content": [
+            {"id": "a", "type": "Text", "props": {"text": "one"}},
+            {"id": "b", "type": "Text", "props": {"text": "two"}},
+        ],
+    }
+
+
+def test_json_patch_operations():
+    doc = _doc()
+    patched = apply_json_patch(
+        doc,
+        [
+            {"op": "replace", "path": "/content/1/props/text", "value": "TWO"},
+            {"op": "add", "path": "/content/-", "value": {"id": "c", "props": {}}},
+            {"op": "move", "from": "/content/0", "path": "/content/2"},
+            {"op": "copy", "from": "/title", "path": "/root~1title"},
+            {"op": "remove", "path": "/title"},
+            {"op": "test", "path": "/root~1title", "value": "Home"},
+        ],
+    )
+
+    assert [item["id"] for item in patched["content"]] == ["b", "c", "a"]
+    assert patched["content"][0]["props"]["text"] == "TWO"
+    assert patched["root/title"] == "Home" and "title" not in patched
+    # The input is untouched and unchanged items are shared, not copied
+    assert doc == _doc()
+    assert patched["content"][2] is doc["content"][0]
+
+
+def test_json_patch_is_all_or_nothing():
+    doc = _doc()
+    with pytest.raises(PatchTestFailed):
+        apply_json_patch(
+            doc,
+            [
+                {"op": "replace", "path": "/title", "value": "Changed"},
+                {"op": "test", "path": "/title", "value": "Home"},
+            ],
+        )
+    with pytest.raises(PatchError):
+        apply_json_patch(doc, [{"op": "remove", "path": "/content/5"}])
+    with pytest.raises(PatchError):
+        apply_json_patch(doc, [{"op": "replace", "path": "/missing", "value": 1}])
+    assert doc == _doc()
+
+
+def test_merge_patch_updates_content_items_by_id():
+    doc = _doc()
+    patched = apply_page_merge_patch(
+        doc,
+        {
+            "title": "Start",
+            "content": {"b": {"props": {"text": "TWO"}}, "a": None, "c": {"type": "Hero"}},
+        },
+    )
+
+    assert patched["title"] == "Start"
+    assert patched["content"] == [
+        {"id": "b", "type": "Text", "props": {"text": "TWO"}},
+        {"type": "Hero", "id": "c"},
+    ]
+    # A plain list still replaces the whole content array (RFC 7386)
+    assert apply_page_merge_patch(doc, {"content": []})["content"] == []
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = FilePageStorage(tmp_path)
+    monkeypatch.setattr(puck_routes, "page_storage", storage)
+    return storage
+
+
+def _patch(page, body, content_type=None, if_match=None):
+    return asyncio.run(puck_routes.patch_page(page, body, content_type=content_type, if_match=if_match))
+
+
+def test_patch_checks_and_bumps_version(storage):
+    created = asyncio.run(puck_routes.create_page({"title": "Home", "content": _doc()["content"]}))
+    assert created["version"] == 1
+
+    result = _patch("home", {"version": 1, "content": {"a": {"props": {"text": "ONE"}}}})
+    assert result["version"] == 2
+    page = storage.get(created["id"])
+    assert page["content"][0]["props"]["text"] == "ONE"
+    assert page["content"][1]["props"]["text"] == "two"
+
+    with pytest.raises(puck_routes.HTTPException) as exc:
+        _patch("home", {"version": 1, "title": "Stale"})
+    assert exc.value.status_code == 409
+    assert exc.value.detail["version"] == 2
+
+    with pytest.raises(puck_routes.HTTPException) as exc:
+        _patch("home", {"title": "No version"})
+    assert exc.value.status_code == 428
+
+    ops = [{"op": "test", "path": "/version", "value": 2}, {"op": "replace", "path": "/title", "value": "Hi"}]
+    assert _patch("home", ops, content_type="application/json-patch+json")["version"] == 3
+    assert _patch("home", {"title": "Again"}, if_match='"3"')["version"] == 4
+
+    with pytest.raises(puck_routes.HTTPException) as exc:
+        _patch("home", [{"op": "test", "path": "/version", "value": 1}])
+    assert exc.value.status_code == 409
+
+
+def test_patch_only_rechecks_slug_when_it_changes(storage):
+    asyncio.run(puck_routes.create_page({"title": "Home"}))
+    asyncio.run(puck_routes.create_page({"title": "About"}))
+
+    with mock.patch.object(storage, "slug_taken", wraps=storage.slug_taken) as slug_taken:
+        _patch("home", {"version": 1, "title": "Renamed"})
+    slug_taken.assert_not_called()
+
+    result = _patch("home", [{"op": "replace", "path": "/slug", "value": "about"}], if_match="2")
+    assert result["slug"] == "about-1"
+
+
+def test_put_honours_version_when_given(storage):
+    asyncio.run(puck_routes.create_page({"title": "Home"}))
+
+    assert asyncio.run(puck_routes.update_page("home", {"title": "New"}))["version"] == 2
+    with pytest.raises(puck_routes.HTTPException) as exc:
+        asyncio.run(puck_routes.update_page("home", {"title": "Stale", "version": 1}))
+    assert exc.value.status_code == 409
@@ -0,0 +1,210 @@
+"""
+Contract tests for the page storage engines.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from backend.services import status_page_store
+from backend.services.page_storage import FilePageStorage, SQLitePageStorage, VersionConflict, etag_matches
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "file":
+        yield FilePageStorage(tmp_path / "pages")
+        return
+    store = SQLitePageStorage(tmp_path / "pages.sqlite3", import_from=None)
+    yield store
+    store.close()
+
+
+def _page(page_id, slug, **extra):
+    return {"id": page_id, "slug": slug, "title": slug.title(), "root": {}, "content": [], **extra}
+
+
+def test_crud_round_trip(storage):
+    storage.save(_page("1", "home", updated_at="2025-01-01"))
+    storage.save(_page("2", "about"))
+
+    assert storage.get("1")["slug"] == "home"
+    assert storage.get_by_slug("about")["id"] == "2"
+    assert storage.get("missing") is None
+    assert storage.get_by_slug("missing") is None
+
+    storage.save(_page("1", "start"))
+    assert storage.get_by_slug("home") is None
+    assert storage.get_by_slug("start")["id"] == "1"
+
+    assert storage.delete("2") is True
+    assert storage.delete("2") is False
+    assert [s["slug"] for s in storage.summaries()] == ["start"]
+
+
+def test_slug_taken_excludes_own_page(storage):
+    storage.save(_page("1", "home"))
+
+    assert storage.slug_taken("home") is True
+    assert storage.slug_taken("home", exclude_id="1") is False
+    assert storage.slug_taken("other") is False
+
+
+def test_sqlite_uses_wal_and_imports_existing_files(tmp_path):
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    (pages_dir / "legacy.json").write_text(json.dumps(_page("legacy-id", "legacy")), encoding="utf-8")
+
+    store = SQLitePageStorage(tmp_path / "pages.sqlite3", import_from=pages_dir)
+    try:
+        assert store.get_by_slug("legacy")["id"] == "legacy-id"
+    finally:
+        store.close()
+
+    conn = sqlite3.connect(tmp_path / "pages.sqlite3")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(pages)")}
+    assert {"pages_slug", "pages_updated_at", "pages_title_key"} <= indexes
+    conn.close()
+
+
+def test_status_page_store_uses_shared_storage(storage, monkeypatch):
+    monkeypatch.setattr(status_page_store, "page_storage", storage)
+    page = status_page_store.PageData(slug="status", title="Status", schemaVersion=1, root={})
+
+    created = status_page_store.create(page)
+    assert status_page_store.find_by_slug("status").id == created.id
+
+    updated = status_page_store.update_by_slug(
+        "status", status_page_store.PageData(slug="ignored", title="New", schemaVersion=1, root={})
+    )
+    assert (updated.slug, updated.id) == ("status", created.id)
+    assert status_page_store.list_pages() == ([{"slug": "status", "title": "New", "id": created.id}], None)
+    with pytest.raises(FileNotFoundError):
+        status_page_store.update_by_slug("nope", page)
+
+
+@pytest.mark.parametrize("write", ["update", "create"])
+def test_status_page_store_rewrites_legacy_page_in_place(tmp_path, monkeypatch, write):
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    legacy = _page("x", "status")
+    del legacy["id"]
+    (pages_dir / "status.json").write_text(json.dumps(legacy), encoding="utf-8")
+    monkeypatch.setattr(status_page_store, "page_storage", FilePageStorage(pages_dir))
+
+    page = status_page_store.PageData(slug="status", title="New", schemaVersion=1, root={})
+    if write == "update":
+        page = status_page_store.update_by_slug("status", page)
+    else:
+        page = status_page_store.create(page)
+
+    assert sorted(p.name for p in pages_dir.glob("*.json")) == ["status.json"]
+    assert status_page_store.list_pages() == ([{"slug": "status", "title": "New", "id": page.id}], None)
+    assert status_page_store.find_by_slug("status").id == page.id
+
+
+def test_update_checks_and_bumps_version(storage):
+    storage.save(_page("1", "home"))
+
+    page = storage.update("1", lambda current: {**current, "title": "New"}, expected_version=0)
+    assert (page["version"], storage.get("1")["title"]) == (1, "New")
+
+    with pytest.raises(VersionConflict):
+        storage.update("1", lambda current: current, expected_version=0)
+    with pytest.raises(KeyError):
+        storage.update("missing", lambda current: current)
+    assert storage.get("1")["version"] == 1
+
+
+def _walk(storage, **kwargs):
+    pages, cursor = storage.list_page(**kwargs)
+    slugs = [p["slug"] for p in pages]
+    while cursor:
+        pages, cursor = storage.list_page(cursor=cursor, **kwargs)
+        slugs += [p["slug"] for p in pages]
+    return slugs
+
+
+def test_list_page_sorts_and_paginates(storage):
+    storage.save(_page("1", "alpha", title="beta", updated_at="2025-01-02"))
+    storage.save(_page("2", "bravo", title="Alpha", updated_at="2025-01-03"))
+    storage.save(_page("3", "charlie", title="gamma", updated_at="2025-01-01"))
+    storage.save(_page("4", "delta", title="Alpha", updated_at="2025-01-03"))
+
+    pages, cursor = storage.list_page(limit=2)
+    assert [p["slug"] for p in pages] == ["delta", "bravo"]
+    assert cursor is not None
+    assert _walk(storage, limit=2) == ["delta", "bravo", "alpha", "charlie"]
+    assert _walk(storage, sort="updated_at", limit=3) == ["charlie", "alpha", "bravo", "delta"]
+    assert _walk(storage, sort="title", limit=1) == ["bravo", "delta", "alpha", "charlie"]
+    assert _walk(storage, sort="-title", limit=3) == ["charlie", "alpha", "delta", "bravo"]
+    assert storage.list_page(limit=4)[1] is None
+
+
+def test_list_page_pages_through_missing_titles(storage, tmp_path):
+    storage.save(_page("1", "untitled", title=None, root={"title": None}))
+    storage.save(_page("2", "alpha"))
+    storage.save(_page("3", "beta"))
+    storage.save(_page("4", "omega"))
+    assert storage.get_by_slug("untitled")["title"] is None
+    assert _walk(storage, sort="title", limit=1) == ["alpha", "beta", "omega", "untitled"]
+
+    if isinstance(storage, SQLitePageStorage):
+        # Rows written before titles were defaulted can still hold NULL
+        conn = sqlite3.connect(tmp_path / "pages.sqlite3")
+        with conn:
+            conn.execute("UPDATE pages SET title = NULL WHERE id = '1'")
+        conn.close()
+        assert _walk(storage, sort="title", limit=1) == ["untitled", "alpha", "beta", "omega"]
+        assert _walk(storage, sort="-title", limit=1) == ["omega", "beta", "alpha", "untitled"]
+
+
+def test_list_page_prefix_search(storage):
+    storage.save(_page("1", "release-notes", title="Changelog"))
+    storage.save(_page("2", "roadmap", title="Release plan"))
+    storage.save(_page("3", "about", title="About 100%"))
+
+    assert sorted(_walk(storage, q="RELEASE")) == ["release-notes", "roadmap"]
+    assert _walk(storage, q="ab", sort="title") == ["about"]
+    assert _walk(storage, q="%") == []
+    assert _walk(storage, q="about 100%") == ["about"]
+
+
+def test_list_page_skips_slugless_pages_before_the_limit(storage):
+    storage.save(_page("1", "alpha", updated_at="2025-01-04"))
+    storage.save({**_page("2", "x", updated_at="2025-01-03"), "slug": ""})
+    storage.save({**_page("3", "x", updated_at="2025-01-02"), "slug": None})
+    storage.save(_page("4", "bravo", updated_at="2025-01-01"))
+
+    pages, cursor = storage.list_page(limit=2, with_slug=True)
+    assert ([p["slug"] for p in pages], cursor) == (["alpha", "bravo"], None)
+    assert _walk(storage, limit=1, with_slug=True) == ["alpha", "bravo"]
+
+
+def test_list_page_rejects_bad_sort_and_cursor(storage):
+    with pytest.raises(ValueError):
+        storage.list_page(sort="slug")
+    with pytest.raises(ValueError):
+        storage.list_page(cursor="not-a-cursor")
+
+
+def test_version_tag_changes_on_every_write(storage):
+    first = storage.version_tag()
+    assert storage.version_tag() == first
+
+    storage.save(_page("1", "home"))
+    second = storage.version_tag()
+    assert second != first
+
+    storage.delete("1")
+    assert storage.version_tag() not in {first, second}
+
+
+def test_etag_matching():
+    assert etag_matches('"a-1"', '"a-1"')
+    assert etag_matches('W/"a-1", "b-2"', '"a-1"')
+    assert etag_matches("*", '"a-1"')
+    assert not etag_matches('"a-0"', '"a-1"')
+    assert not etag_matches(None, '"a-1"')
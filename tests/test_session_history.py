@@ -0,0 +1,106 @@
+"""
+Tests for the append-only session history store.
+"""
+
+import json
+import threading
+
+from session_history import SessionHistory
+
+
+def _store(tmp_path, **kwargs):
+    return SessionHistory(
+        tmp_path / "history.jsonl",
+        legacy_path=tmp_path / "history.json",
+        **kwargs,
+    )
+
+
+def test_record_and_lookup(tmp_path):
+    store = _store(tmp_path)
+    store.record("Demo", "s1", latest=True, name="First", owner="me", created_at=1.0)
+    store.record("Demo", "s2", name="Second", owner="me", created_at=2.0)
+
+    assert store.get("Demo", "s1")["name"] == "First"
+    assert store.latest("Demo")["session_id"] == "s1"
+    assert set(store.sessions("Demo")) == {"s1", "s2"}
+    assert store.get("Demo", "missing") is None
+    # Compact one-line-per-record format
+    assert len((tmp_path / "history.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_other_writers_are_picked_up_incrementally(tmp_path):
+    reader = _store(tmp_path)
+    writer = _store(tmp_path)
+    writer.record("Demo", "s1", owner="a")
+    assert reader.get("Demo", "s1")["owner"] == "a"
+
+    writer.record("Demo", "s1", owner="b", status="active")
+    record = reader.get("Demo", "s1")
+    assert record["owner"] == "b"
+    assert record["status"] == "active"
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    stores = [_store(tmp_path) for _ in range(4)]
+
+    def write(store, n):
+        for i in range(50):
+            store.record("Demo", f"w{n}-{i}", owner="me")
+
+    threads = [threading.Thread(target=write, args=(store, n)) for n, store in enumerate(stores)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(_store(tmp_path).sessions("Demo")) == 200
+
+
+def test_compaction_keeps_latest_state(tmp_path):
+    store = _store(tmp_path, compact_slack=5)
+    for i in range(20):
+        store.record("Demo", "s1", latest=True, name=f"v{i}")
+
+    lines = (tmp_path / "history.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) <= 6
+    fresh = _store(tmp_path)
+    assert fresh.latest("Demo")["name"] == "v19"
+
+
+def test_partial_trailing_line_is_ignored_until_complete(tmp_path):
+    store = _store(tmp_path)
+    store.record("Demo", "s1", owner="me")
+    with open(tmp_path / "history.jsonl", "ab") as handle:
+        handle.write(b'{"project":"Demo","session_id":"s2"')
+
+    assert store.get("Demo", "s2") is None
+    with open(tmp_path / "history.jsonl", "ab") as handle:
+        handle.write(b',"owner":"you"}\n')
+    assert store.get("Demo", "s2")["owner"] == "you"
+
+
+def test_legacy_json_is_imported(tmp_path):
+    (tmp_path / "history.json").write_text(
+        json.dumps(
+            {
+                "Old": {
+                    "session_id": "s1",
+                    "name": "Flat",
+                    "created_at": 1.0,
+                    "owner": "me",
+                    "project": "Old",
+                    "nested": {"created_at": 2.0, "owner": "you", "status": "active"},
+                },
+                "New": {"s9": {"created_at": 3.0, "owner": "them", "status": "active"}},
+            }
+        ),
+        encoding="utf-8",
+    )
+    store = _store(tmp_path)
+
+    assert store.latest("Old")["name"] == "Flat"
+    assert store.get("Old", "nested")["owner"] == "you"
+    assert store.get("New", "s9")["owner"] == "them"
+    assert store.latest("New") is None
+    assert (tmp_path / "history.jsonl").exists()
@@ -0,0 +1,97 @@
+"""
+Tests for request-scoped sessions and caching in the root SessionManager.
+"""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import SessionManager as session_module
+from SessionManager import SessionManager
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_module, "ROOT", tmp_path)
+    monkeypatch.setattr(session_module, "ACTIVE_FILE", tmp_path / ".idse_active_session.json")
+    monkeypatch.setattr(session_module, "HISTORY_FILE", tmp_path / ".idse_sessions_history.jsonl")
+    monkeypatch.setattr(session_module, "LEGACY_HISTORY_FILE", tmp_path / ".idse_sessions_history.json")
+    SessionManager.clear_cache()
+    SessionManager.create_session("Global", project="Main")
+    return tmp_path
+
+
+def _active_file(workspace):
+    return json.loads((workspace / ".idse_active_session.json").read_text(encoding="utf-8"))
+
+
+def test_scoped_session_overrides_without_touching_file(workspace):
+    before = (workspace / ".idse_active_session.json").read_bytes()
+
+    with SessionManager.scoped_session("Demo", "s1"):
+        assert SessionManager.get_active_session().project == "Demo"
+        path = SessionManager.build_path("intents", "intent.md")
+
+    assert path == workspace / "projects" / "Demo" / "sessions" / "s1" / "intents" / "intent.md"
+    assert SessionManager.get_active_session().project == "Main"
+    assert (workspace / ".idse_active_session.json").read_bytes() == before
+
+
+def test_switch_project_inside_scope_stays_in_memory(workspace):
+    with SessionManager.scoped_session("Demo", "s1"):
+        SessionManager.switch_project("Other")
+        assert SessionManager.get_active_session().project == "Other"
+
+    assert _active_file(workspace)["project"] == "Main"
+    assert SessionManager.history().latest("Other") is not None
+
+
+def test_concurrent_requests_are_isolated(workspace):
+    async def request(project):
+        with SessionManager.scoped_session(project, f"{project}-session"):
+            await asyncio.sleep(0.01)
+            # Tools run in worker threads inherit the request's context
+            return await asyncio.to_thread(lambda: SessionManager.build_path("specs", "spec.md"))
+
+    async def scenario():
+        return await asyncio.gather(request("A"), request("B"))
+
+    a, b = asyncio.run(scenario())
+    assert a.parts[-5:-2] == ("A", "sessions", "A-session")
+    assert b.parts[-5:-2] == ("B", "sessions", "B-session")
+
+
+def test_active_session_is_parsed_once_until_file_changes(workspace):
+    first = SessionManager.get_active_session()
+
+    with mock.patch.object(Path, "read_text") as read_text:
+        assert SessionManager.get_active_session() is first
+    read_text.assert_not_called()
+
+    active = workspace / ".idse_active_session.json"
+    data = _active_file(workspace)
+    data["project"] = "Edited"
+    active.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(active, ns=(0, 0))  # force a different mtime even on coarse clocks
+
+    assert SessionManager.get_active_session().project == "Edited"
+
+
+def test_repeated_build_path_does_no_filesystem_work(workspace):
+    SessionManager.build_path("intents", "intent.md")
+    session_dir = workspace / "projects" / "Main"
+    assert any(session_dir.rglob(".owner"))
+
+    with mock.patch.object(Path, "mkdir") as mkdir, mock.patch.object(
+        Path, "exists"
+    ) as exists, mock.patch.object(Path, "write_text") as write_text:
+        for _ in range(8):
+            SessionManager.build_path("intents", "intent.md")
+
+    mkdir.assert_not_called()
+    exists.assert_not_called()
+    write_text.assert_not_called()
@@ -0,0 +1,83 @@
+"""
+Tests for the in-memory status index behind StatusService.
+"""
+
+import json
+from unittest import mock
+
+import pytest
+
+from backend.services import status_index
+from backend.services.status_service import StatusService
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    session_dir = tmp_path / "projects" / "Demo" / "sessions" / "s1"
+    (session_dir / "intents").mkdir(parents=True)
+    (session_dir / "intents" / "intent.md").write_text("# Intent\n[REQUIRES INPUT]\n", encoding="utf-8")
+    (tmp_path / ".idse_sessions_history.json").write_text(
+        json.dumps({"Demo": {"s1": {"name": "First", "created_at": 1.0, "owner": "me"}}}),
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+def test_lists_projects_and_sessions(workspace):
+    service = StatusService(root=workspace, ttl=None)
+
+    assert service.list_projects() == ["Demo"]
+    result = service.get_project_sessions("Demo")
+    session = result.sessions[0]
+    assert session.session_id == "s1"
+    assert session.name == "First"
+    assert session.owner == "me"
+    assert session.stages["intent"].exists is True
+    assert session.stages["intent"].requires_input_count == 1
+    assert session.stages["spec"].exists is False
+
+
+def test_missing_project_raises(workspace):
+    service = StatusService(root=workspace, ttl=None)
+
+    with pytest.raises(FileNotFoundError):
+        service.get_project_sessions("Nope")
+
+
+def test_cached_listing_does_no_disk_reads(workspace):
+    service = StatusService(root=workspace, ttl=None)
+    service.get_project_sessions("Demo")
+
+    with mock.patch.object(status_index.os, "stat") as stat, mock.patch.object(
+        status_index.os, "scandir"
+    ) as scandir:
+        service.get_project_sessions("Demo")
+        service.list_projects()
+
+    stat.assert_not_called()
+    scandir.assert_not_called()
+
+
+def test_invalidate_stage_rereads_only_changed_file(workspace):
+    service = StatusService(root=workspace, ttl=None)
+    service.get_project_sessions("Demo")
+
+    intent = workspace / "projects" / "Demo" / "sessions" / "s1" / "intents" / "intent.md"
+    intent.write_text("# Intent\n[REQUIRES INPUT]\n[REQUIRES INPUT]\n", encoding="utf-8")
+    # Not invalidated yet: the cached value is served
+    assert service.get_project_sessions("Demo").sessions[0].stages["intent"].requires_input_count == 1
+
+    service.index.invalidate("Demo", "s1", "intent")
+    assert service.get_project_sessions("Demo").sessions[0].stages["intent"].requires_input_count == 2
+
+
+def test_refresh_reports_changes(workspace):
+    service = StatusService(root=workspace, ttl=None)
+    service.get_project_sessions("Demo")
+
+    spec_dir = workspace / "projects" / "Demo" / "sessions" / "s1" / "specs"
+    spec_dir.mkdir()
+    (spec_dir / "spec.md").write_text("# Specification\n", encoding="utf-8")
+
+    assert service.index.refresh("Demo") == [("Demo", "s1", "spec")]
+    assert service.index.refresh("Demo") == []
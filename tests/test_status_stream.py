@@ -0,0 +1,133 @@
+"""
+Tests for the session status SSE stream (snapshot + deltas).
+"""
+
+import asyncio
+import json
+from dataclasses import asdict
+
+from backend.routes import status_routes
+from backend.services.status_service import StatusService
+
+
+def _event(chunk: str) -> dict:
+    assert chunk.startswith("data: ")
+    return json.loads(chunk[len("data: "):])
+
+
+def test_stream_sends_snapshot_then_stage_deltas(tmp_path, monkeypatch):
+    session_dir = tmp_path / "projects" / "Demo" / "sessions" / "s1"
+    (session_dir / "specs").mkdir(parents=True)
+    service = StatusService(root=tmp_path, ttl=None)
+    service.add_listener(status_routes.enqueue_status_events)
+    monkeypatch.setattr(status_routes, "status_service", service)
+
+    async def scenario():
+        snapshot = asdict(service.get_project_sessions("Demo"))
+        stream = status_routes.status_event_stream("Demo", snapshot)
+        first = _event(await stream.__anext__())
+
+        (session_dir / "specs" / "spec.md").write_text("[REQUIRES INPUT]", encoding="utf-8")
+        service.apply_changes({("Demo", "s1", "spec")})
+        second = _event(await stream.__anext__())
+
+        # Unrelated projects are not pushed to this subscriber
+        service.apply_changes({("Other", "x", "spec")})
+        assert all(q.empty() for q in status_routes.status_subscribers["Demo"])
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first["type"] == "SNAPSHOT"
+    assert second == {
+        "type": "STAGE_STATUS",
+        "project_id": "Demo",
+        "session_id": "s1",
+        "stage": "spec",
+        "status": {
+            "exists": True,
+            "requires_input_count": 1,
+            "path": str(session_dir / "specs" / "spec.md"),
+        },
+    }
+    assert "Demo" not in status_routes.status_subscribers
+
+
+def test_stream_receives_deltas_published_from_a_worker_thread(tmp_path, monkeypatch):
+    spec = tmp_path / "projects" / "Demo" / "sessions" / "s1" / "specs" / "spec.md"
+    spec.parent.mkdir(parents=True)
+    service = StatusService(root=tmp_path, ttl=None)
+    service.add_listener(status_routes.enqueue_status_events)
+    monkeypatch.setattr(status_routes, "status_service", service)
+
+    async def scenario():
+        snapshot = asdict(service.get_project_sessions("Demo"))
+        stream = status_routes.status_event_stream("Demo", snapshot)
+        await stream.__anext__()
+        spec.write_text("[REQUIRES INPUT]", encoding="utf-8")
+        # As the watcher does: the index is synced off the event loop
+        await asyncio.to_thread(service.apply_changes, {("Demo", "s1", "spec")})
+        event = _event(await asyncio.wait_for(stream.__anext__(), timeout=2))
+        await stream.aclose()
+        return event
+
+    event = asyncio.run(scenario())
+    assert (event["type"], event["stage"], event["status"]["requires_input_count"]) == ("STAGE_STATUS", "spec", 1)
+
+
+def test_new_session_is_reported_as_one_record(tmp_path):
+    (tmp_path / "projects" / "Demo" / "sessions").mkdir(parents=True)
+    service = StatusService(root=tmp_path, ttl=None)
+    received = []
+    service.add_listener(lambda project, events: received.extend(events))
+    service.watch("Demo")
+    service.get_project_sessions("Demo")
+
+    (tmp_path / "projects" / "Demo" / "sessions" / "s2" / "intents").mkdir(parents=True)
+    service.apply_changes({("Demo", "s2", "")})
+
+    assert [e["type"] for e in received] == ["SESSION_STATUS"]
+    assert received[0]["session"]["session_id"] == "s2"
+
+
+def test_status_reads_do_not_consume_subscriber_deltas(tmp_path):
+    spec = tmp_path / "projects" / "Demo" / "sessions" / "s1" / "specs" / "spec.md"
+    spec.parent.mkdir(parents=True)
+    service = StatusService(root=tmp_path, ttl=0)
+    received = []
+    service.add_listener(lambda project, events: received.extend(events))
+    service.watch("Demo")
+    service.get_project_sessions("Demo")
+
+    spec.write_text("[REQUIRES INPUT]", encoding="utf-8")
+    # A plain status request revalidates (and sees the change) first
+    assert service.get_project_sessions("Demo").sessions[0].stages["spec"].requires_input_count == 1
+    service.publish_deltas()
+
+    assert [(e["type"], e["stage"]) for e in received] == [("STAGE_STATUS", "spec")]
+    received.clear()
+    service.publish_deltas()
+    assert received == []
+
+
+def test_stream_polls_without_watcher(tmp_path, monkeypatch):
+    spec = tmp_path / "projects" / "Demo" / "sessions" / "s1" / "specs" / "spec.md"
+    spec.parent.mkdir(parents=True)
+    service = StatusService(root=tmp_path, ttl=0)
+    service.add_listener(status_routes.enqueue_status_events)
+    monkeypatch.setattr(status_routes, "status_service", service)
+    monkeypatch.setattr(status_routes, "POLL_SEC", 0.05)
+
+    async def scenario():
+        snapshot = asdict(service.get_project_sessions("Demo"))
+        stream = status_routes.status_event_stream("Demo", snapshot)
+        await stream.__anext__()
+        spec.write_text("[REQUIRES INPUT]", encoding="utf-8")
+        # Well under HEARTBEAT_SEC: picked up by the short revalidation poll
+        event = _event(await asyncio.wait_for(stream.__anext__(), timeout=2))
+        await stream.aclose()
+        return event
+
+    event = asyncio.run(scenario())
+    assert (event["type"], event["stage"], event["status"]["requires_input_count"]) == ("STAGE_STATUS", "spec", 1)
@@ -0,0 +1,117 @@
+"""
+Tests for the status filesystem watcher (path mapping and polling fallback).
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from backend.services import status_watcher
+from backend.services.status_service import STAGES, StatusService
+from backend.services.status_watcher import StatusWatcher
+from session_history import SessionHistory
+
+
+def _watcher(root, callback=lambda keys, history: None, **kwargs):
+    return StatusWatcher(
+        root=root,
+        stages=STAGES,
+        history_file=root / ".idse_sessions_history.jsonl",
+        on_changes=callback,
+        **kwargs,
+    )
+
+
+def test_classify_maps_paths_to_change_keys(tmp_path):
+    watcher = _watcher(tmp_path)
+    sessions = tmp_path / "projects" / "Demo" / "sessions"
+
+    assert watcher.classify(sessions / "s1" / "specs" / "spec.md") == (("Demo", "s1", "spec"), False)
+    assert watcher.classify(sessions / "s1" / "plans" / "test-plan.md") == (("Demo", "s1", "testPlan"), False)
+    assert watcher.classify(sessions / "s1") == (("Demo", "s1", ""), False)
+    assert watcher.classify(tmp_path / "projects" / "Demo") == (("Demo", "", ""), False)
+    assert watcher.classify(sessions / "s1" / "metadata" / ".owner") == (None, False)
+    assert watcher.classify(sessions / "s1" / "specs" / "notes.md") == (None, False)
+    assert watcher.classify(tmp_path / ".idse_sessions_history.jsonl") == (None, True)
+
+
+def test_poll_backend_coalesces_changes(tmp_path):
+    intent = tmp_path / "projects" / "Demo" / "sessions" / "s1" / "intents" / "intent.md"
+    intent.parent.mkdir(parents=True)
+    intent.write_text("# Intent\n", encoding="utf-8")
+    batches = []
+    threads = set()
+
+    def callback(keys, history):
+        batches.append(keys)
+        threads.add(threading.get_ident())
+
+    async def scenario():
+        watcher = _watcher(tmp_path, callback, mode="poll", poll_interval=0.05)
+        assert await watcher.start() == "poll"
+        await asyncio.sleep(0.1)
+        for i in range(5):
+            intent.write_text("# Intent\n" + "x" * (i + 1), encoding="utf-8")
+        await asyncio.sleep(0.2)
+        await watcher.stop()
+
+    asyncio.run(scenario())
+    assert batches == [{("Demo", "s1", "intent")}]
+    # Index syncing stays off the event loop thread
+    assert threading.get_ident() not in threads
+
+
+def test_service_watching_updates_index(tmp_path):
+    intent = tmp_path / "projects" / "Demo" / "sessions" / "s1" / "intents" / "intent.md"
+    intent.parent.mkdir(parents=True)
+    intent.write_text("# Intent\n", encoding="utf-8")
+    service = StatusService(root=tmp_path, ttl=60)
+    service.watcher.mode = "poll"
+    service.watcher.poll_interval = 0.05
+
+    async def scenario():
+        await service.start_watching()
+        assert service.get_project_sessions("Demo").sessions[0].stages["intent"].requires_input_count == 0
+        await asyncio.sleep(0.1)
+        intent.write_text("# Intent\n[REQUIRES INPUT]\n", encoding="utf-8")
+        await asyncio.sleep(0.2)
+        count = service.get_project_sessions("Demo").sessions[0].stages["intent"].requires_input_count
+        await service.stop_watching()
+        return count
+
+    assert asyncio.run(scenario()) == 1
+    assert service.index.ttl == 60
+
+
+@pytest.mark.parametrize("mode", ["inotify", "poll"])
+def test_service_watching_follows_history_log(tmp_path, mode):
+    if mode == "inotify" and status_watcher.awatch is None:
+        pytest.skip("watchfiles not installed")
+    (tmp_path / "projects" / "Demo" / "sessions" / "s1").mkdir(parents=True)
+    service = StatusService(root=tmp_path, ttl=60)
+    service.watcher.mode = mode
+    service.watcher.poll_interval = 0.05
+    history = SessionHistory(service.index.history_file, legacy_path=None)
+
+    def session():
+        status = service.get_project_sessions("Demo").sessions[0]
+        return status.name, status.owner
+
+    async def scenario():
+        assert await service.start_watching() == mode
+        assert session() == ("s1", None)
+        await asyncio.sleep(0.1)
+        # Log created after the watcher started
+        history.record("Demo", "s1", name="Pretty", owner="me")
+        await asyncio.sleep(0.3)
+        created = session()
+        # Compaction swaps in a new file; later appends go to the new inode
+        history.compact()
+        history.record("Demo", "s1", name="Prettier")
+        await asyncio.sleep(0.3)
+        compacted = session()
+        await service.stop_watching()
+        return created, compacted
+
+    assert asyncio.run(scenario()) == (("Pretty", "me"), ("Prettier", "me"))